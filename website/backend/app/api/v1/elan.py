@@ -0,0 +1,270 @@
+from decimal import Decimal
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import API_MAX_PAGE_SIZE, API_PAGE_SIZE, CONCORDANCE_MAX_CONTEXT
+from app.crud import elan_file
+from app.crud.annotation import IntervalRelation
+from app.crud.annotation_value import SearchMode
+from app.db.database import get_session_maker
+from app.dependency.database import get_db_dep
+from app.dependency.user import get_admin_dep, get_user_dep
+from app.model.user import User
+from app.service.annotation_search import AnnotationSearchService
+from app.service.concordance import ConcordanceService
+from app.service.elan import ElanService
+
+router = APIRouter()
+
+PageLimit = Annotated[int, Query(ge=1, le=API_MAX_PAGE_SIZE)]
+
+
+@router.get("/files")
+async def list_my_files(
+    limit: PageLimit = API_PAGE_SIZE,
+    cursor: str | None = None,
+    db: AsyncSession = get_db_dep,
+    user: User = get_user_dep,
+):
+    """Return one page of the ELAN files uploaded by the current user.
+
+    Args:
+        limit: Maximum number of files in the page.
+        cursor: next_cursor of the previous page, omitted for the first one.
+        db: Database session.
+        user: Authenticated user.
+
+    Returns:
+        dict: The files and the cursor of the next page, null on the last one.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+
+    """
+    try:
+        return await ElanService(db).get_user_files_page(user.user_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/files/{elan_id}/structure")
+async def get_file_structure(
+    elan_id: int,
+    tier_id: Annotated[list[str] | None, Query()] = None,
+    db: AsyncSession = get_db_dep,
+    user: User = get_admin_dep,
+):
+    """Return the tiers of an ELAN file with their annotations.
+
+    Args:
+        elan_id: ID of the ELAN file.
+        tier_id: Only include these tiers, may be repeated. Defaults to all.
+        db: Database session.
+        user: Authenticated admin user.
+
+    Returns:
+        dict: File metadata and its tiers, each with annotations ordered by time.
+
+    Raises:
+        HTTPException: 404 if the file does not exist.
+
+    """
+    structure = await ElanService(db).get_file_structure_by_id(elan_id, tier_id)
+    if structure is None:
+        raise HTTPException(status_code=404, detail=f"ELAN file {elan_id} not found")
+    return structure
+
+
+@router.get("/files/{elan_id}/annotations/interval")
+async def get_annotations_in_interval(
+    elan_id: int,
+    start: Decimal,
+    end: Decimal | None = None,
+    relation: IntervalRelation = "overlaps",
+    tier_id: Annotated[list[str] | None, Query()] = None,
+    db: AsyncSession = get_db_dep,
+    user: User = get_admin_dep,
+):
+    """Return the annotations of a file relative to a time interval.
+
+    Args:
+        elan_id: ID of the ELAN file.
+        start: Interval start, in seconds.
+        end: Interval end, in seconds. Omit it for the annotations at start.
+        relation: "overlaps", "within" or "contains" the interval.
+        tier_id: Only search these tiers, may be repeated. Defaults to all.
+        db: Database session.
+        user: Authenticated admin user.
+
+    Returns:
+        dict: Matching annotations with their tier, ordered by tier and time.
+
+    Raises:
+        HTTPException: 400 if the interval ends before it starts.
+
+    """
+    if end is None:
+        end, relation = start, "contains"
+    try:
+        annotations = await ElanService(db).get_annotations_in_interval(
+            elan_id, start, end, relation, tier_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    return {"annotations": annotations}
+
+
+@router.get("/files/{elan_id}/annotations")
+async def get_annotation_page(
+    elan_id: int,
+    limit: PageLimit = API_PAGE_SIZE,
+    cursor: str | None = None,
+    tier_id: Annotated[list[str] | None, Query()] = None,
+    db: AsyncSession = get_db_dep,
+    user: User = get_admin_dep,
+):
+    """Return one page of the annotations of a file, ordered by time.
+
+    Args:
+        elan_id: ID of the ELAN file.
+        limit: Maximum number of annotations in the page.
+        cursor: next_cursor of the previous page, omitted for the first one.
+        tier_id: Only include these tiers, may be repeated. Defaults to all.
+        db: Database session.
+        user: Authenticated admin user.
+
+    Returns:
+        dict: The annotations and the cursor of the next page, null on the last one.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+
+    """
+    try:
+        return await ElanService(db).get_annotation_page(
+            elan_id, limit, cursor, tier_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/files/{elan_id}/annotations.ndjson")
+async def stream_annotations(
+    elan_id: int,
+    tier_id: Annotated[list[str] | None, Query()] = None,
+    db: AsyncSession = get_db_dep,
+    user: User = get_admin_dep,
+) -> StreamingResponse:
+    """Stream every annotation of a file as newline-delimited JSON.
+
+    Args:
+        elan_id: ID of the ELAN file.
+        tier_id: Only include these tiers, may be repeated. Defaults to all.
+        db: Database session.
+        user: Authenticated admin user.
+
+    Returns:
+        StreamingResponse: One JSON object per line, ordered by time.
+
+    Raises:
+        HTTPException: 404 if the file does not exist.
+
+    """
+    if await elan_file.get_elan_file_by_id(db, elan_id) is None:
+        raise HTTPException(status_code=404, detail=f"ELAN file {elan_id} not found")
+
+    async def lines():
+        # The request session may be closed before the body is sent
+        async with get_session_maker()() as stream_db:
+            async for chunk in ElanService(stream_db).stream_annotations_ndjson(
+                elan_id, tier_id
+            ):
+                yield chunk
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.get("/search")
+async def search_annotations(
+    q: Annotated[str, Query(min_length=1)],
+    mode: SearchMode = "contains",
+    limit: PageLimit = API_PAGE_SIZE,
+    cursor: str | None = None,
+    elan_id: Annotated[list[int] | None, Query()] = None,
+    tier_id: Annotated[list[str] | None, Query()] = None,
+    db: AsyncSession = get_db_dep,
+    user: User = get_admin_dep,
+):
+    """Search annotation values across files.
+
+    Args:
+        q: Search text, or a regular expression with mode=regex.
+        mode: "exact", "contains", "prefix" or "regex".
+        limit: Maximum number of hits in the page.
+        cursor: next_cursor of the previous page, omitted for the first one.
+        elan_id: Only search these files, may be repeated. Defaults to all.
+        tier_id: Only search these tiers, may be repeated. Defaults to all.
+        db: Database session.
+        user: Authenticated admin user.
+
+    Returns:
+        dict: Hits with file, tier and time, and the cursor of the next page.
+
+    Raises:
+        HTTPException: 400 if the query is too short for the index, or the
+            regular expression or cursor is malformed.
+
+    """
+    try:
+        return await AnnotationSearchService(db).search(
+            q, mode, limit, cursor, elan_id, tier_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
+@router.get("/concordance")
+async def get_concordance(
+    q: Annotated[str, Query(min_length=1)],
+    mode: SearchMode = "contains",
+    context: Annotated[int, Query(ge=0, le=CONCORDANCE_MAX_CONTEXT)] = 5,
+    dependents: bool = True,
+    limit: PageLimit = API_PAGE_SIZE,
+    cursor: str | None = None,
+    elan_id: Annotated[list[int] | None, Query()] = None,
+    tier_id: Annotated[list[str] | None, Query()] = None,
+    db: AsyncSession = get_db_dep,
+    user: User = get_admin_dep,
+):
+    """Return keyword-in-context lines for the annotations matching a query.
+
+    Args:
+        q: Search text, or a regular expression with mode=regex.
+        mode: "exact", "contains", "prefix" or "regex".
+        context: Annotations shown before and after each hit on its tier.
+        dependents: Include time-aligned annotations of dependent tiers.
+        limit: Maximum number of lines in the page.
+        cursor: next_cursor of the previous page, omitted for the first one.
+        elan_id: Only search these files, may be repeated. Defaults to all.
+        tier_id: Only search these tiers, may be repeated. Defaults to all.
+        db: Database session.
+        user: Authenticated admin user.
+
+    Returns:
+        dict: Lines with the hit, its neighbours and aligned dependent
+            annotations, and the cursor of the next page.
+
+    Raises:
+        HTTPException: 400 if the query is too short for the index, or the
+            regular expression or cursor is malformed.
+
+    """
+    try:
+        return await ConcordanceService(db).build(
+            q, mode, context, dependents, limit, cursor, elan_id, tier_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
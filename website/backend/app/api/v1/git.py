@@ -20,6 +20,7 @@ from app.schema.responses.git import (
     ProjectStatusResponse,
 )
 from app.service.git import GitService
+from app.service.project_scheduler import project_scheduler
 
 router = APIRouter()
 
@@ -44,7 +45,7 @@ async def check_git(user: User = get_admin_dep) -> GitStatusResponse:
 
     """
     try:
-        result = git_service.check_git_availability()
+        result = await git_service.check_git_availability()
         return GitStatusResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -98,7 +99,7 @@ async def get_project_status(project_name: str) -> ProjectStatusResponse:
 
     """
     try:
-        result = git_service.get_project_status(project_name)
+        result = await git_service.get_project_status(project_name)
         return ProjectStatusResponse(**result)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -124,7 +125,7 @@ async def commit_changes(
 
     """
     try:
-        result = git_service.commit_changes(
+        result = await git_service.commit_changes(
             project_name, commit_data.commit_message, commit_data.user_name
         )
         return CommitResponse(**result)
@@ -177,7 +178,7 @@ async def upload_elan_files(
 async def get_project_branches(project_name: str):
     """Get all branches for a project."""
     try:
-        result = git_service.get_branches(project_name)
+        result = await git_service.get_branches(project_name)
         return result
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -215,7 +216,9 @@ async def checkout_project_branch(
 ):
     """Switch to a different branch in the given project."""
     try:
-        result = git_service.checkout_branch(project_name, checkout_data.branch_name)
+        result = await git_service.checkout_branch(
+            project_name, checkout_data.branch_name
+        )
         return ProjectCheckoutResponse(**result)
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
@@ -223,6 +226,20 @@ async def checkout_project_branch(
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+@router.get("/operations/metrics")
+async def get_operation_metrics(user: User = get_admin_dep):
+    """Return per-project queueing metrics of git working-tree operations.
+
+    Args:
+        user: Authenticated admin user.
+
+    Returns:
+        dict: Completed, waiting and running operations plus wait times, by project.
+
+    """
+    return project_scheduler.get_metrics()
+
+
 @router.get("/projects", response_model=ProjectListResponse)
 async def list_projects(
     db: AsyncSession = get_db_dep,
@@ -287,14 +304,44 @@ async def synchronize_project(
 @router.delete("/projects/{project_name}")
 async def delete_project(
     project_name: str,
+    background: bool = False,
     db: AsyncSession = get_db_dep,
     user: User = get_admin_dep,
 ):
     """
     Delete a project, its files, and all associated database artifacts.
+
+    With background=true the project is hidden immediately and deleted by a
+    background task; poll GET /projects/{project_name}/deletion for progress.
     """
     try:
-        await git_service.delete_project(project_name, db, user.user_id)
-        return {"status": "success", "detail": f"Project '{project_name}' deleted."}
+        job = await git_service.delete_project(
+            project_name, db, user.user_id, background=background
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e)) from e
+    if job["status"] == "running":
+        detail = f"Deletion of project '{project_name}' started."
+    else:
+        detail = f"Project '{project_name}' deleted."
+    return {"status": "success", "detail": detail, "job": job}
+
+
+@router.get("/projects/{project_name}/deletion")
+async def get_project_deletion(project_name: str, user: User = get_admin_dep):
+    """Return the progress of the latest deletion of a project.
+
+    Args:
+        project_name: Name of the project.
+        user: Authenticated admin user.
+
+    Returns:
+        dict: Status, current step and deleted row counts per step.
+
+    """
+    job = git_service.get_project_deletion(project_name)
+    if job is None:
+        raise HTTPException(
+            status_code=404, detail=f"No deletion found for project '{project_name}'"
+        )
+    return job
@@ -44,6 +44,66 @@ CSRF_TOKEN_NAME = "elanora_csrf"  # noqa: S105
 ELAN_PROJECTS_BASE_PATH = os.getenv("ELAN_PROJECTS_BASE_PATH", "elanora_projects")
 ELAN_MAX_FILE_SIZE_MB = int(os.getenv("ELAN_MAX_FILE_SIZE_MB", "50"))
 ELAN_MAX_BATCH_SIZE_MB = int(os.getenv("ELAN_MAX_BATCH_SIZE_MB", "500"))
+# Uploads are copied, hashed and validated in chunks of this many bytes
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+# Uploads up to this many MB per batch keep their parse result for ingest
+UPLOAD_PARSE_REUSE_MAX_MB = int(os.getenv("UPLOAD_PARSE_REUSE_MAX_MB", "200"))
+# Files above this size are parsed with the streaming (iterparse) parser
+ELAN_STREAMING_PARSE_THRESHOLD_MB = int(
+    os.getenv("ELAN_STREAMING_PARSE_THRESHOLD_MB", "10")
+)
+# Worker processes used to parse ELAN files (0 = one per CPU core)
+ELAN_PARSE_WORKERS = int(os.getenv("ELAN_PARSE_WORKERS", "0"))
+# Rows per multi-row INSERT when ingesting tiers, values and annotations
+ELAN_INGEST_CHUNK_SIZE = int(os.getenv("ELAN_INGEST_CHUNK_SIZE", "1000"))
+# Annotation value -> value_id entries kept in the process-local LRU cache
+ANNOTATION_VALUE_CACHE_SIZE = int(os.getenv("ANNOTATION_VALUE_CACHE_SIZE", "100000"))
+# Annotation rows removed per DELETE statement when deleting a project
+PROJECT_DELETE_BATCH_SIZE = int(os.getenv("PROJECT_DELETE_BATCH_SIZE", "5000"))
+# Default and largest page of the keyset-paginated annotation and file lists
+API_PAGE_SIZE = int(os.getenv("API_PAGE_SIZE", "1000"))
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "10000"))
+# Rows fetched per server-side cursor round trip when streaming NDJSON
+API_STREAM_BATCH_SIZE = int(os.getenv("API_STREAM_BATCH_SIZE", "2000"))
+# Shortest searchable text, must not be below the MySQL ngram_token_size
+ANNOTATION_SEARCH_MIN_CHARS = int(os.getenv("ANNOTATION_SEARCH_MIN_CHARS", "2"))
+# Most neighbouring annotations a concordance line shows on each side
+CONCORDANCE_MAX_CONTEXT = int(os.getenv("CONCORDANCE_MAX_CONTEXT", "50"))
+# Seconds between sweeps of orphaned annotation values (0 disables the sweeper)
+ANNOTATION_VALUE_SWEEP_INTERVAL = int(
+    os.getenv("ANNOTATION_VALUE_SWEEP_INTERVAL", "300")
+)
+# Orphan candidates checked per DELETE, and batches per sweep at most
+ANNOTATION_VALUE_SWEEP_BATCH_SIZE = int(
+    os.getenv("ANNOTATION_VALUE_SWEEP_BATCH_SIZE", "5000")
+)
+ANNOTATION_VALUE_SWEEP_MAX_BATCHES = int(
+    os.getenv("ANNOTATION_VALUE_SWEEP_MAX_BATCHES", "20")
+)
+
+# Git subprocess execution
+# Threads dedicated to running git commands off the event loop
+GIT_MAX_WORKERS = int(os.getenv("GIT_MAX_WORKERS", "4"))
+# Git commands running longer than this are killed
+GIT_COMMAND_TIMEOUT_SECONDS = int(os.getenv("GIT_COMMAND_TIMEOUT_SECONDS", "120"))
+# Long-lived git cat-file processes per project and their shared blob cache
+GIT_BLOB_READERS_PER_PROJECT = int(os.getenv("GIT_BLOB_READERS_PER_PROJECT", "2"))
+GIT_BLOB_CACHE_MB = int(os.getenv("GIT_BLOB_CACHE_MB", "64"))
+# Per-file caps on the line diff shown for conflicting uploads (0 = no cap)
+ELAN_DIFF_MAX_HUNKS_PER_FILE = int(os.getenv("ELAN_DIFF_MAX_HUNKS_PER_FILE", "200"))
+ELAN_DIFF_MAX_BYTES_PER_FILE = int(
+    os.getenv("ELAN_DIFF_MAX_BYTES_PER_FILE", str(1024 * 1024))
+)
+# Per-tier cap on each kind of annotation change listed in a semantic diff
+ELAN_DIFF_MAX_CHANGES_PER_TIER = int(os.getenv("ELAN_DIFF_MAX_CHANGES_PER_TIER", "500"))
+
+# Database engine and connection pool configuration
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Log every SQL statement, for debugging only
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
 
 # Vite configuration
 VITE_API_URL = os.getenv("VITE_API_URL", "http://localhost:8010/api/v1")
@@ -1,27 +1,55 @@
 """Annotation CRUD operations - Pure database access layer."""
 
+from collections.abc import AsyncIterator, Collection, Mapping, Sequence
 from decimal import Decimal
-
-from sqlalchemy import and_, select
+from typing import Literal
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Row,
+    Select,
+    and_,
+    cast,
+    delete,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, delete, select
 from sqlalchemy.orm import selectinload
 
 from typing import Optional
 from app.model.annotation import Annotation
 from app.model.annotation_value import AnnotationValue
+from app.model.elan_file import ElanFile
+from app.crud.annotation_value import (
+    clear_annotation_value_cache,
+    mark_orphan_candidates,
+)
+from app.utils.database import DatabaseUtils
+from app.utils.parsed_eaf import ParsedEaf
 from app.core.centralized_logging import get_logger
 
 logger = get_logger()
 
+# How annotations relate to a queried [start, end] interval
+IntervalRelation = Literal["overlaps", "within", "contains"]
+
 
 async def delete_unused_annotation_values(db: AsyncSession) -> int:
-    """Delete annotation values not referenced by any annotation."""
+    """Delete annotation values not referenced by any annotation.
+
+    Full anti-join of both tables, kept for maintenance only. Deletes record
+    orphan candidates instead, which the annotation value sweeper drains.
+    """
     try:
         subq = select(Annotation.value_id).distinct()
         stmt = delete(AnnotationValue).where(~AnnotationValue.value_id.in_(subq))
         result = await db.execute(stmt)
         await db.commit()
+        clear_annotation_value_cache()
         return result.rowcount if hasattr(result, "rowcount") else -1
     except Exception:
         await db.rollback()
@@ -88,6 +116,295 @@ async def get_annotations_with_value_by_tier(db: AsyncSession, tier_id: str):
     return annotations
 
 
+def _file_annotation_rows(
+    elan_id: int, tier_ids: Collection[str] | None = None
+) -> Select:
+    """Select the annotations of a file, optionally only of some tiers.
+
+    Columns are tier_id, annotation_id, annotation_value, start_time, end_time.
+    """
+    stmt = (
+        select(
+            Annotation.tier_id,
+            Annotation.annotation_id,
+            AnnotationValue.annotation_value,
+            Annotation.start_time,
+            Annotation.end_time,
+        )
+        .join(AnnotationValue, Annotation.value_id == AnnotationValue.value_id)
+        .where(Annotation.elan_id == elan_id)
+    )
+    if tier_ids is not None:
+        stmt = stmt.where(Annotation.tier_id.in_(tier_ids))
+    return stmt
+
+
+async def get_annotation_rows_for_file(
+    db: AsyncSession, elan_id: int, tier_ids: Collection[str] | None = None
+) -> Sequence[Row]:
+    """Get the annotations of a file with their values in one joined query.
+
+    Args:
+        db: Database session.
+        elan_id: ID of the ELAN file.
+        tier_ids: Only return annotations of these tiers. Defaults to all.
+
+    Returns:
+        (tier_id, annotation_id, annotation_value, start_time, end_time) rows,
+        ordered by tier, then time.
+
+    """
+    result = await db.execute(
+        _file_annotation_rows(elan_id, tier_ids).order_by(
+            Annotation.tier_id, Annotation.start_time, Annotation.annotation_id
+        )
+    )
+    return result.all()
+
+
+async def get_annotation_rows_for_file_tiers(
+    db: AsyncSession,
+    file_tiers: Collection[tuple[int, str]],
+    chunk_size: int = 1000,
+) -> list[Row]:
+    """Get the annotations of (elan_id, tier_id) pairs across files.
+
+    Each chunk of pairs is one ``(elan_id, tier_id) IN (...)`` query, read
+    as ranges of the (elan_id, tier_id, start_time) index. Times come back
+    as integer milliseconds, converted by the server.
+
+    Returns:
+        (elan_id, tier_id, annotation_id, annotation_value, start_ms, end_ms)
+        rows, ordered by file, tier, then time.
+
+    """
+    pairs = sorted(file_tiers)
+    rows: list[Row] = []
+    for start in range(0, len(pairs), chunk_size):
+        result = await db.execute(
+            select(
+                Annotation.elan_id,
+                Annotation.tier_id,
+                Annotation.annotation_id,
+                AnnotationValue.annotation_value,
+                cast(Annotation.start_time * 1000, Integer),
+                cast(Annotation.end_time * 1000, Integer),
+            )
+            .join(AnnotationValue, Annotation.value_id == AnnotationValue.value_id)
+            .where(
+                tuple_(Annotation.elan_id, Annotation.tier_id).in_(
+                    pairs[start : start + chunk_size]
+                )
+            )
+            .order_by(
+                Annotation.elan_id,
+                Annotation.tier_id,
+                Annotation.start_time,
+                Annotation.annotation_id,
+            )
+        )
+        rows.extend(result.all())
+    return rows
+
+
+async def get_annotation_page(
+    db: AsyncSession,
+    elan_id: int,
+    limit: int,
+    after: tuple[Decimal, str] | None = None,
+    tier_ids: Collection[str] | None = None,
+) -> Sequence[Row]:
+    """Get one page of the annotations of a file by (start_time, annotation_id).
+
+    Keyset pagination: the page starts right after the given key, read from
+    the (elan_id, start_time) index, so every page costs the same whatever
+    its position.
+
+    Args:
+        db: Database session.
+        elan_id: ID of the ELAN file.
+        limit: Maximum number of rows.
+        after: (start_time, annotation_id) of the last row of the previous page.
+        tier_ids: Only return annotations of these tiers. Defaults to all.
+
+    Returns:
+        (tier_id, annotation_id, annotation_value, start_time, end_time) rows.
+
+    """
+    stmt = (
+        _file_annotation_rows(elan_id, tier_ids)
+        .order_by(Annotation.start_time, Annotation.annotation_id)
+        .limit(limit)
+    )
+    if after is not None:
+        start_time, annotation_id = after
+        stmt = stmt.where(
+            Annotation.start_time >= start_time,
+            or_(
+                Annotation.start_time > start_time,
+                Annotation.annotation_id > annotation_id,
+            ),
+        )
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def stream_annotation_rows(
+    db: AsyncSession,
+    elan_id: int,
+    batch_size: int,
+    tier_ids: Collection[str] | None = None,
+) -> AsyncIterator[Sequence[Row]]:
+    """Yield the annotations of a file in batches from a server-side cursor.
+
+    Rows come in (start_time, annotation_id) order like get_annotation_page,
+    and only one batch is held in memory at a time.
+
+    Args:
+        db: Database session, whose connection stays busy until exhausted.
+        elan_id: ID of the ELAN file.
+        batch_size: Rows fetched per round trip.
+        tier_ids: Only return annotations of these tiers. Defaults to all.
+
+    """
+    result = await db.stream(
+        _file_annotation_rows(elan_id, tier_ids)
+        .order_by(Annotation.start_time, Annotation.annotation_id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in result.partitions():
+        yield rows
+
+
+async def search_annotation_rows(
+    db: AsyncSession,
+    value_condition: ColumnElement[bool],
+    limit: int,
+    after: tuple[int, Decimal, str] | None = None,
+    elan_ids: Collection[int] | None = None,
+    tier_ids: Collection[str] | None = None,
+) -> Sequence[Row]:
+    """Get one page of the annotations whose value matches a condition.
+
+    Args:
+        db: Database session.
+        value_condition: WHERE clause on AnnotationValue.
+        limit: Maximum number of rows.
+        after: (elan_id, start_time, annotation_id) of the last row of the
+            previous page.
+        elan_ids: Only search these files. Defaults to all.
+        tier_ids: Only search these tiers. Defaults to all.
+
+    Returns:
+        (elan_id, filename, tier_id, annotation_id, annotation_value,
+        start_time, end_time) rows, ordered by file, then time.
+
+    """
+    sort_key = (Annotation.elan_id, Annotation.start_time, Annotation.annotation_id)
+    stmt = (
+        select(
+            Annotation.elan_id,
+            ElanFile.filename,
+            Annotation.tier_id,
+            Annotation.annotation_id,
+            AnnotationValue.annotation_value,
+            Annotation.start_time,
+            Annotation.end_time,
+        )
+        .join(AnnotationValue, Annotation.value_id == AnnotationValue.value_id)
+        .join(ElanFile, ElanFile.elan_id == Annotation.elan_id)
+        .where(value_condition)
+        .order_by(*sort_key)
+        .limit(limit)
+    )
+    if elan_ids is not None:
+        stmt = stmt.where(Annotation.elan_id.in_(elan_ids))
+    if tier_ids is not None:
+        stmt = stmt.where(Annotation.tier_id.in_(tier_ids))
+    if after is not None:
+        stmt = stmt.where(tuple_(*sort_key) > tuple_(*after))
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_annotation_rows_in_interval(
+    db: AsyncSession,
+    elan_id: int,
+    max_durations: Mapping[str, Decimal | None],
+    start_time: Decimal,
+    end_time: Decimal,
+    relation: IntervalRelation = "overlaps",
+) -> Sequence[Row]:
+    """Get the annotations of some tiers of a file relative to a time interval.
+
+    Relations are "overlaps" (shares some time with the interval, open
+    bounds), "within" (lies inside it) and "contains" (covers all of it, so
+    a point lookup is "contains" with start_time == end_time).
+
+    Every condition becomes a start_time range on the (elan_id, tier_id,
+    start_time) index. An annotation that ends after a time t started at
+    most max_duration before t, which gives overlaps and contains the lower
+    bound an index range needs. Tiers without a known bound are scanned from
+    their first annotation, which is still correct, only slower.
+
+    Args:
+        db: Database session.
+        elan_id: ID of the ELAN file.
+        max_durations: Tiers to search, mapped to their longest annotation.
+        start_time: Interval start, in seconds.
+        end_time: Interval end, in seconds.
+        relation: How annotations must relate to the interval.
+
+    Returns:
+        (tier_id, annotation_id, annotation_value, start_time, end_time) rows,
+        ordered by tier, then time.
+
+    """
+    if not max_durations:
+        return []
+
+    if relation == "overlaps":
+        end_condition = Annotation.end_time > start_time
+    elif relation == "within":
+        end_condition = Annotation.end_time <= end_time
+    else:
+        end_condition = Annotation.end_time >= end_time
+
+    tier_ranges = [
+        and_(
+            Annotation.tier_id == tier_id,
+            *_start_time_range(relation, start_time, end_time, max_duration),
+        )
+        for tier_id, max_duration in max_durations.items()
+    ]
+    result = await db.execute(
+        _file_annotation_rows(elan_id)
+        .where(or_(*tier_ranges), end_condition)
+        .order_by(Annotation.tier_id, Annotation.start_time, Annotation.annotation_id)
+    )
+    return result.all()
+
+
+def _start_time_range(
+    relation: IntervalRelation,
+    start_time: Decimal,
+    end_time: Decimal,
+    max_duration: Decimal | None,
+) -> list[ColumnElement[bool]]:
+    """Bound start_time so that a relation only reads an index range."""
+    if relation == "within":
+        return [Annotation.start_time >= start_time, Annotation.start_time <= end_time]
+    if relation == "overlaps":
+        conditions = [Annotation.start_time < end_time]
+        if max_duration is not None:
+            conditions.append(Annotation.start_time >= start_time - max_duration)
+        return conditions
+    conditions = [Annotation.start_time <= start_time]
+    if max_duration is not None:
+        conditions.append(Annotation.start_time >= end_time - max_duration)
+    return conditions
+
+
 async def get_annotations_by_time_range(
     db: AsyncSession, tier_id: str, start_time: Decimal, end_time: Decimal
 ) -> list[Annotation]:
@@ -185,42 +502,138 @@ async def delete_annotations_by_tier(db: AsyncSession, tier_id: str) -> int:
 
     """
     try:
-        result = await db.execute(
-            select(Annotation).filter(Annotation.tier_id == tier_id)
+        await mark_orphan_candidates(db, Annotation.tier_id == tier_id)
+        deleted = await DatabaseUtils.execute_rowcount(
+            db, Annotation.__table__.delete().where(Annotation.tier_id == tier_id)
         )
-        annotations = list(result.scalars().all())
-        count = len(annotations)
-
-        for annotation in annotations:
-            await db.delete(annotation)
-
         await db.commit()
-        await delete_unused_annotation_values(db)
-        return count
+        return deleted
     except Exception:
         await db.rollback()
         raise
 
 
-async def bulk_create_annotations(
-    db: AsyncSession, tiers_data: list[dict], elan_id: int, value_map: dict[str, int]
-) -> None:
-    from app.model.annotation import Annotation
-
-    all_annotations = []
-    for tier_data in tiers_data:
-        tier_id = tier_data["tier_id"]
-        for ann in tier_data["annotations"]:
-            all_annotations.append(
-                Annotation(
-                    annotation_id=ann["annotation_id"],
-                    elan_id=elan_id,
-                    value_id=value_map[ann["annotation_value"]],
-                    start_time=ann["start_time"],
-                    end_time=ann["end_time"],
-                    tier_id=tier_id,
-                )
+async def bulk_upsert_annotations(
+    db: AsyncSession,
+    eaf: ParsedEaf,
+    elan_id: int,
+    value_map: dict[str, int],
+    chunk_size: int = 1000,
+    rows: Sequence[int] | None = None,
+) -> int:
+    """Insert or update annotations of a file in chunked multi-row statements.
+
+    Uses ``INSERT ... ON DUPLICATE KEY UPDATE`` on (annotation_id, elan_id) so
+    re-ingesting a file overwrites value, times and tier in place. Nothing is
+    committed, the caller owns the transaction.
+
+    Args:
+        db: Database session.
+        eaf: Parsed file whose annotation columns are written.
+        elan_id: ID of the ELAN file the annotations belong to.
+        value_map: Mapping of annotation value string to value_id.
+        chunk_size: Maximum number of rows per INSERT statement.
+        rows: Indices of the annotation rows of eaf to write. Defaults to all.
+
+    Returns:
+        Number of annotation rows written.
+
+    """
+    tier_ids = [
+        parsed_tier.tier_id
+        for parsed_tier in eaf.tiers
+        for _ in range(parsed_tier.start, parsed_tier.stop)
+    ]
+
+    if rows is None:
+        rows = range(eaf.annotation_count)
+
+    # Row dicts only exist one chunk at a time
+    for start in range(0, len(rows), chunk_size):
+        values = [
+            {
+                "annotation_id": eaf.annotation_ids[i],
+                "elan_id": elan_id,
+                "value_id": value_map[eaf.values[i]],
+                "start_time": Decimal(eaf.start_ms[i]) / 1000,
+                "end_time": Decimal(eaf.end_ms[i]) / 1000,
+                "tier_id": tier_ids[i],
+            }
+            for i in rows[start : start + chunk_size]
+        ]
+        stmt = mysql_insert(Annotation).values(values)
+        await db.execute(
+            stmt.on_duplicate_key_update(
+                value_id=stmt.inserted.value_id,
+                start_time=stmt.inserted.start_time,
+                end_time=stmt.inserted.end_time,
+                tier_id=stmt.inserted.tier_id,
             )
-    if all_annotations:
-        db.add_all(all_annotations)
-        await db.flush()
+        )
+    return len(rows)
+
+
+async def get_annotation_state_for_file(
+    db: AsyncSession, elan_id: int
+) -> dict[str, tuple[str, int, int, str]]:
+    """Map annotation_id to (value, start_ms, end_ms, tier_id) for a file."""
+    result = await db.execute(
+        select(
+            Annotation.annotation_id,
+            AnnotationValue.annotation_value,
+            Annotation.start_time,
+            Annotation.end_time,
+            Annotation.tier_id,
+        )
+        .join(AnnotationValue, Annotation.value_id == AnnotationValue.value_id)
+        .where(Annotation.elan_id == elan_id)
+    )
+    return {
+        annotation_id: (value, int(start * 1000), int(end * 1000), tier_id)
+        for annotation_id, value, start, end, tier_id in result
+    }
+
+
+async def mark_annotation_values_of(
+    db: AsyncSession,
+    elan_id: int,
+    annotation_ids: Sequence[str],
+    chunk_size: int = 1000,
+) -> None:
+    """Record the current values of annotations of a file as orphan candidates.
+
+    Call it before the annotations are deleted or get a new value. Nothing is
+    committed.
+    """
+    for start in range(0, len(annotation_ids), chunk_size):
+        await mark_orphan_candidates(
+            db,
+            Annotation.elan_id == elan_id,
+            Annotation.annotation_id.in_(annotation_ids[start : start + chunk_size]),
+        )
+
+
+async def delete_annotations_by_ids(
+    db: AsyncSession,
+    elan_id: int,
+    annotation_ids: Sequence[str],
+    chunk_size: int = 1000,
+) -> int:
+    """Delete annotations of a file by id in chunked statements, without committing.
+
+    Returns:
+        Number of annotations deleted.
+
+    """
+    deleted = 0
+    for start in range(0, len(annotation_ids), chunk_size):
+        deleted += await DatabaseUtils.execute_rowcount(
+            db,
+            delete(Annotation).where(
+                Annotation.elan_id == elan_id,
+                Annotation.annotation_id.in_(
+                    annotation_ids[start : start + chunk_size]
+                ),
+            ),
+        )
+    return deleted
@@ -1,12 +1,77 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Literal
+
+from sqlalchemy import ColumnElement, and_, exists, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
-import asyncio
-from app.model.annotation_value import AnnotationValue
+
 from app.core.centralized_logging import get_logger
+from app.core.config import ANNOTATION_SEARCH_MIN_CHARS, ANNOTATION_VALUE_CACHE_SIZE
+from app.model.annotation import Annotation
+from app.model.annotation_value import AnnotationValue, AnnotationValueOrphanCandidate
+from app.utils.search import SearchQueryUtils
 
 logger = get_logger()
 
+# How search text is matched against annotation values
+SearchMode = Literal["exact", "contains", "prefix", "regex"]
+
+
+class ValueIdCache:
+    """LRU mapping of annotation value to value_id, bounded by entry count.
+
+    Only ids of committed rows belong here: values inserted by a transaction
+    that may still roll back are cached the next time a lookup finds them.
+    The cache is per process, so a value deleted by another worker's sweep
+    can still be cached here. Lookups re-verify the cached ids that are
+    orphan candidates and discard the deleted ones.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        """Initialize an empty cache holding at most max_entries values."""
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, int] = OrderedDict()
+
+    def get_many(self, values: Iterable[str]) -> tuple[dict[str, int], list[str]]:
+        """Split values into cached (value -> value_id) and missing ones."""
+        found: dict[str, int] = {}
+        missing: list[str] = []
+        for value in values:
+            value_id = self._entries.get(value)
+            if value_id is None:
+                missing.append(value)
+            else:
+                self._entries.move_to_end(value)
+                found[value] = value_id
+        return found, missing
+
+    def put_many(self, value_ids: dict[str, int]) -> None:
+        """Cache value ids, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        self._entries.update(value_ids)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, values: Iterable[str]) -> None:
+        """Forget the cached ids of the given values."""
+        for value in values:
+            self._entries.pop(value, None)
+
+    def clear(self) -> None:
+        """Forget every cached value id."""
+        self._entries.clear()
+
+
+# Shared by every session of the process
+_value_id_cache = ValueIdCache(ANNOTATION_VALUE_CACHE_SIZE)
+
+
+def clear_annotation_value_cache() -> None:
+    """Invalidate cached value ids, e.g. after annotation values were deleted."""
+    _value_id_cache.clear()
+
 
 async def get_or_create_annotation_value(db: AsyncSession, value: str) -> int:
     result = await db.execute(
@@ -30,118 +95,238 @@ async def get_annotation_value_by_id(db: AsyncSession, value_id: int) -> str | N
 
 
 async def bulk_get_or_create_annotation_values(
-    db: AsyncSession, tiers_data: list[dict]
+    db: AsyncSession, values: Iterable[str], chunk_size: int = 1000
 ) -> dict[str, int]:
-    import time
+    """Map every distinct annotation value to its value_id.
 
-    all_ann_values = set(
-        ann["annotation_value"]
-        for tier_data in tiers_data
-        for ann in tier_data["annotations"]
-    )
-    value_map = {}
-    logger.info(
-        f"[bulk_get_or_create_annotation_values] Start. Total unique values: {len(all_ann_values)}"
+    Values are resolved from the process-local LRU cache first. Only misses
+    reach the database: a chunked ``IN (...)`` lookup for existing rows, whose
+    ids are cached, then chunked multi-row ``INSERT ... ON DUPLICATE KEY
+    UPDATE`` statements for the values that are still missing, which are safe
+    against concurrent inserts of the same value. Resolved ids that are
+    orphan candidates are share-locked so the sweeper cannot delete them
+    before the caller's annotations refer to them, and values it already
+    deleted are inserted again. Nothing is committed, the caller owns the
+    transaction.
+
+    Args:
+        db: Database session.
+        values: Annotation values, duplicates allowed.
+        chunk_size: Maximum number of rows per INSERT or IN (...) lookup.
+
+    Returns:
+        Mapping of annotation value string to value_id.
+
+    """
+    value_map, misses = _value_id_cache.get_many(set(values))
+    cached_count = len(value_map)
+
+    existing = await _select_value_ids(db, misses, chunk_size)
+    _value_id_cache.put_many(existing)
+    value_map.update(existing)
+
+    swept = await _lock_orphan_candidates(db, value_map, chunk_size)
+    _value_id_cache.discard(swept)
+    for value in swept:
+        del value_map[value]
+
+    new_values = [value for value in misses if value not in existing] + swept
+    if not new_values:
+        return value_map
+    for start in range(0, len(new_values), chunk_size):
+        chunk = new_values[start : start + chunk_size]
+        stmt = mysql_insert(AnnotationValue).values(
+            [{"annotation_value": value} for value in chunk]
+        )
+        # No-op update: existing rows are kept, duplicates do not raise
+        await db.execute(
+            stmt.on_duplicate_key_update(value_id=AnnotationValue.value_id)
+        )
+    # Not cached yet: these rows disappear if the caller's transaction rolls back
+    value_map.update(await _select_value_ids(db, new_values, chunk_size))
+
+    # The column collation may fold case or accents, so a row can come back
+    # spelled differently than requested. Resolve those one by one.
+    for value in new_values:
+        if value not in value_map:
+            value_map[value] = await get_or_create_annotation_value(db, value)
+
+    logger.debug(
+        f"[bulk_get_or_create_annotation_values] Resolved {len(value_map)} annotation values "
+        f"({cached_count} cached, {len(existing)} existing, "
+        f"{len(new_values)} inserted, {len(swept)} of them swept meanwhile)"
     )
-    if all_ann_values:
+    return value_map
+
+
+async def _select_value_ids(
+    db: AsyncSession, values: list[str], chunk_size: int
+) -> dict[str, int]:
+    """Look up the value_id of existing values with chunked IN (...) queries."""
+    requested = set(values)
+    value_ids: dict[str, int] = {}
+    for start in range(0, len(values), chunk_size):
         result = await db.execute(
-            select(AnnotationValue).where(
-                AnnotationValue.annotation_value.in_(all_ann_values)
+            select(AnnotationValue.annotation_value, AnnotationValue.value_id).where(
+                AnnotationValue.annotation_value.in_(values[start : start + chunk_size])
             )
         )
-        for obj in result.scalars():
-            value_map[obj.annotation_value] = obj.value_id
-        missing_values = [v for v in all_ann_values if v not in value_map]
-        logger.info(
-            f"[bulk_get_or_create_annotation_values] Existing values in DB: {len(value_map)}. Missing: {len(missing_values)}"
+        # Rows matched through collation folding keep their stored spelling
+        value_ids.update(
+            {value: value_id for value, value_id in result if value in requested}
         )
-        if missing_values:
-            new_values = [AnnotationValue(annotation_value=v) for v in missing_values]
-            max_retries = 5
-            retry_delay = 0.2
-            for attempt in range(1, max_retries + 1):
-                try:
-                    db.add_all(new_values)
-                    await db.commit()
-                    db.expire_all()
-                    logger.info(
-                        f"[bulk_get_or_create_annotation_values] Inserted {len(new_values)} new values on attempt {attempt}."
-                    )
-                    break
-                except IntegrityError as e:
-                    logger.warning(
-                        f"[bulk_get_or_create_annotation_values] IntegrityError during bulk insert (attempt {attempt}): {e}. Rolling back and retrying fetch."
-                    )
-                    await db.rollback()
-                    # Sleep to avoid race conditions
-                    time.sleep(retry_delay)
-                except Exception as e:
-                    logger.error(
-                        f"[bulk_get_or_create_annotation_values] Unexpected error during bulk insert (attempt {attempt}): {e}"
-                    )
-                    await db.rollback()
-                    time.sleep(retry_delay)
-            # Always re-fetch after insert attempts
-            result = await db.execute(
-                select(AnnotationValue).where(
-                    AnnotationValue.annotation_value.in_(missing_values)
+    return value_ids
+
+
+async def _lock_orphan_candidates(
+    db: AsyncSession, value_map: dict[str, int], chunk_size: int
+) -> list[str]:
+    """Share-lock the resolved values that are orphan candidates.
+
+    The sweeper's DELETE waits for the lock until the caller commits, and by
+    then the value is referenced again. Ids that are not candidates cost a
+    single primary key probe per chunk.
+
+    Returns:
+        Values whose row was already deleted by a sweep.
+
+    """
+    value_ids = list(set(value_map.values()))
+    candidates: list[int] = []
+    for start in range(0, len(value_ids), chunk_size):
+        result = await db.execute(
+            select(AnnotationValueOrphanCandidate.value_id).where(
+                AnnotationValueOrphanCandidate.value_id.in_(
+                    value_ids[start : start + chunk_size]
                 )
             )
-            for obj in result.scalars():
-                value_map[obj.annotation_value] = obj.value_id
-            still_missing = [v for v in missing_values if v not in value_map]
-            logger.info(
-                f"[bulk_get_or_create_annotation_values] After bulk insert, still missing: {still_missing}"
-            )
-            # Try single inserts for any still missing
-            for v in still_missing:
-                for attempt in range(1, max_retries + 1):
-                    try:
-                        db.add(AnnotationValue(annotation_value=v))
-                        await db.commit()
-                        db.expire_all()
-                        logger.info(
-                            f"[bulk_get_or_create_annotation_values] Inserted missing value '{v}' on attempt {attempt}."
-                        )
-                        break
-                    except IntegrityError as e:
-                        logger.info(
-                            f"[bulk_get_or_create_annotation_values] IntegrityError on single insert for '{v}' (attempt {attempt}): {e}. Likely duplicate, will re-query."
-                        )
-                        await db.rollback()
-                        time.sleep(retry_delay)
-                    except Exception as e:
-                        logger.error(
-                            f"[bulk_get_or_create_annotation_values] Unexpected error on single insert for '{v}' (attempt {attempt}): {e}"
-                        )
-                        await db.rollback()
-                        time.sleep(retry_delay)
-                # Always re-fetch after insert attempts
-                result = await db.execute(
-                    select(AnnotationValue).where(AnnotationValue.annotation_value == v)
-                )
-                obj = result.scalars().first()
-                if obj:
-                    value_map[obj.annotation_value] = obj.value_id
-            # Final check
-            final_missing = [v for v in still_missing if v not in value_map]
-            if final_missing:
-                # Log DB state for debugging
-                logger.error(
-                    f"[bulk_get_or_create_annotation_values] Failed to insert or fetch annotation values after all attempts: {final_missing}"
-                )
-                db_values = await db.execute(select(AnnotationValue.annotation_value))
-                logger.error(
-                    f"[bulk_get_or_create_annotation_values] Current annotation values in DB: {[row[0] for row in db_values]}"
-                )
-                # Log session/transaction state
-                logger.error(
-                    f"[bulk_get_or_create_annotation_values] Session info: dirty={db.dirty}, new={db.new}, in_transaction={db.in_transaction()}"
-                )
-                raise RuntimeError(
-                    f"Could not insert or fetch annotation values: {final_missing}"
-                )
-    logger.info(
-        f"[bulk_get_or_create_annotation_values] Completed. Returning value_map with {len(value_map)} entries."
+        )
+        candidates.extend(result.scalars())
+    if not candidates:
+        return []
+
+    alive: set[int] = set()
+    for start in range(0, len(candidates), chunk_size):
+        result = await db.execute(
+            select(AnnotationValue.value_id)
+            .where(AnnotationValue.value_id.in_(candidates[start : start + chunk_size]))
+            .with_for_update(read=True)
+        )
+        alive.update(result.scalars())
+    gone = set(candidates) - alive
+    return [value for value, value_id in value_map.items() if value_id in gone]
+
+
+async def mark_orphan_candidates(
+    db: AsyncSession, *conditions: ColumnElement[bool]
+) -> None:
+    """Record the values of the matching annotations as possible orphans.
+
+    Call it before those annotations are deleted or point to another value.
+    A single ``INSERT IGNORE ... SELECT`` that only reads the affected rows.
+    Nothing is committed, the caller owns the transaction.
+
+    Args:
+        db: Database session.
+        conditions: WHERE clauses on Annotation selecting the rows.
+
+    """
+    await db.execute(
+        mysql_insert(AnnotationValueOrphanCandidate)
+        .prefix_with("IGNORE")
+        .from_select(
+            ["value_id"], select(Annotation.value_id).where(*conditions).distinct()
+        )
     )
-    return value_map
+
+
+async def sweep_orphan_values(db: AsyncSession, batch_size: int) -> tuple[int, int]:
+    """Delete the unreferenced values among one batch of orphan candidates.
+
+    Each candidate costs one primary key lookup and one probe of the
+    ANNOTATION value_id index, whatever the size of either table. A value
+    referenced again meanwhile is kept and simply leaves the candidates.
+
+    Args:
+        db: Database session.
+        batch_size: Maximum number of candidates checked.
+
+    Returns:
+        Number of candidates checked and number of values deleted.
+
+    """
+    result = await db.execute(
+        select(AnnotationValueOrphanCandidate.value_id)
+        .order_by(AnnotationValueOrphanCandidate.value_id)
+        .limit(batch_size)
+    )
+    value_ids = list(result.scalars())
+    if not value_ids:
+        return 0, 0
+
+    try:
+        result = await db.execute(
+            AnnotationValue.__table__.delete().where(
+                AnnotationValue.value_id.in_(value_ids),
+                ~exists().where(Annotation.value_id == AnnotationValue.value_id),
+            )
+        )
+        await db.execute(
+            AnnotationValueOrphanCandidate.__table__.delete().where(
+                AnnotationValueOrphanCandidate.value_id.in_(value_ids)
+            )
+        )
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+
+    if result.rowcount:
+        clear_annotation_value_cache()
+    return len(value_ids), result.rowcount
+
+
+def annotation_value_search_condition(
+    query: str, mode: SearchMode = "contains"
+) -> ColumnElement[bool]:
+    """Build a WHERE clause on AnnotationValue that uses an index.
+
+    "exact" compares the whole value. "contains", "prefix" and "regex" are
+    prefiltered through the FULLTEXT ngram index, requiring the ngrams of
+    the text (or of the literals a regex cannot match without), then
+    checked exactly with LIKE or REGEXP on the few remaining rows. The
+    server should run with innodb_ft_enable_stopword=OFF, otherwise ngrams
+    that contain a stopword are not indexed.
+
+    Args:
+        query: Search text, or a regular expression in "regex" mode.
+        mode: How values must match the query.
+
+    Returns:
+        The condition on AnnotationValue.annotation_value.
+
+    Raises:
+        ValueError: If the query has no part long enough for the index.
+
+    """
+    column = AnnotationValue.annotation_value
+    if mode == "exact":
+        return column == query
+
+    literals = SearchQueryUtils.required_literals(query) if mode == "regex" else [query]
+    terms = SearchQueryUtils.fulltext_terms(literals, ANNOTATION_SEARCH_MIN_CHARS)
+    if terms is None:
+        raise ValueError(
+            f"The search needs a literal of at least {ANNOTATION_SEARCH_MIN_CHARS} "
+            "characters"
+        )
+
+    if mode == "regex":
+        exact = column.regexp_match(query)
+    elif mode == "prefix":
+        exact = column.like(SearchQueryUtils.escape_like(query) + "%", escape="\\")
+    else:
+        exact = column.like(
+            "%" + SearchQueryUtils.escape_like(query) + "%", escape="\\"
+        )
+    return and_(column.match(terms), exact)
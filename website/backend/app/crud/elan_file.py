@@ -1,8 +1,10 @@
 """ELAN File CRUD operations - Simplified using utilities."""
 
-from sqlalchemy import delete, select
+from collections.abc import Collection, Mapping
+from decimal import Decimal
+
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete, select
 
 
 from app.model.associations import ElanFileToProject, ElanFileToTier
@@ -30,15 +32,41 @@ async def get_elan_files_by_user(db: AsyncSession, user_id: int) -> list[ElanFil
     return list(result.scalars().all())
 
 
+async def get_elan_files_page_by_user(
+    db: AsyncSession, user_id: int, limit: int, after_id: int | None = None
+) -> list[ElanFile]:
+    """Get one page of a user's ELAN files by elan_id, after the given one."""
+    stmt = (
+        select(ElanFile)
+        .where(ElanFile.user_id == user_id)
+        .order_by(ElanFile.elan_id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        stmt = stmt.where(ElanFile.elan_id > after_id)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
 async def check_elan_file_exists_by_filename(db: AsyncSession, filename: str) -> bool:
     """Check if an ELAN file with the given filename exists."""
     return await DatabaseUtils.exists(db, ElanFile, "filename", filename)
 
 
 async def create_elan_file_in_db(
-    db: AsyncSession, filename: str, file_path: str, file_size: int, user_id: int
+    db: AsyncSession,
+    filename: str,
+    file_path: str,
+    file_size: int,
+    user_id: int,
+    blob_sha: str | None = None,
+    commit: bool = True,
 ) -> ElanFile:
-    """Create a new ELAN file record in the database."""
+    """Create a new ELAN file record in the database.
+
+    With commit=False the row is only flushed (to get its elan_id), so it can be
+    written in the same transaction as its tiers and annotations.
+    """
     # Validate inputs
     ValidationUtils.validate_user_id(user_id)
     sanitized_filename = ValidationUtils.sanitize_filename(filename)
@@ -48,11 +76,44 @@ async def create_elan_file_in_db(
         file_path=file_path,
         file_size=file_size,
         user_id=user_id,
+        blob_sha=blob_sha,
     )
 
+    if not commit:
+        return await DatabaseUtils.create_and_flush(db, elan_file)
     return await DatabaseUtils.create_and_commit(db, elan_file)
 
 
+async def get_ingest_state_for_project(
+    db: AsyncSession, project_id: int
+) -> dict[str, tuple[int, str | None]]:
+    """Map filename to (elan_id, blob_sha) for all ELAN files of a project."""
+    result = await db.execute(
+        select(ElanFile.filename, ElanFile.elan_id, ElanFile.blob_sha)
+        .join(ElanFileToProject, ElanFile.elan_id == ElanFileToProject.elan_id)
+        .where(ElanFileToProject.project_id == project_id)
+    )
+    return {filename: (elan_id, blob_sha) for filename, elan_id, blob_sha in result}
+
+
+async def update_elan_file_content(
+    db: AsyncSession,
+    elan_id: int,
+    file_path: str,
+    file_size: int,
+    blob_sha: str | None,
+) -> None:
+    """Record the location, size and git blob id of re-ingested content.
+
+    Nothing is committed, the caller owns the transaction.
+    """
+    await db.execute(
+        update(ElanFile)
+        .where(ElanFile.elan_id == elan_id)
+        .values(file_path=file_path, file_size=file_size, blob_sha=blob_sha)
+    )
+
+
 async def delete_elan_file_by_id(db: AsyncSession, elan_id: int) -> bool:
     """Delete an ELAN file by ID."""
     try:
@@ -83,6 +144,19 @@ async def get_tiers_for_elan_file(db: AsyncSession, elan_id: int) -> list[str]:
     return [row[0] for row in result]
 
 
+async def get_tier_max_durations(
+    db: AsyncSession, elan_id: int, tier_ids: Collection[str] | None = None
+) -> dict[str, Decimal | None]:
+    """Map the tiers of a file to their longest annotation, None if unknown."""
+    stmt = select(ElanFileToTier.tier_id, ElanFileToTier.max_duration).where(
+        ElanFileToTier.elan_id == elan_id
+    )
+    if tier_ids is not None:
+        stmt = stmt.where(ElanFileToTier.tier_id.in_(tier_ids))
+    result = await db.execute(stmt)
+    return dict(result.tuples().all())
+
+
 async def add_elan_file_to_tier(db: AsyncSession, elan_id: int, tier_id: str) -> None:
     """Add association between ELAN file and tier if not exists."""
     exists = await db.execute(
@@ -110,15 +184,45 @@ async def remove_elan_file_to_tier(
 
 
 async def sync_elan_file_to_tiers(
-    db: AsyncSession, elan_id: int, new_tier_ids: list[str]
+    db: AsyncSession,
+    elan_id: int,
+    new_tier_ids: list[str],
+    max_durations: Mapping[str, Decimal] | None = None,
 ) -> None:
-    """Synchronize ELAN_FILE_TO_TIER associations for a file."""
+    """Synchronize ELAN_FILE_TO_TIER associations for a file.
+
+    Args:
+        db: Database session.
+        elan_id: ID of the ELAN file.
+        new_tier_ids: Tiers the file has now.
+        max_durations: Longest annotation per tier, stored on the association
+            to bound interval lookups. Unknown tiers get no bound.
+
+    """
+    max_durations = max_durations or {}
     current_tier_ids = set(await get_tiers_for_elan_file(db, elan_id))
     new_tier_ids_set = set(new_tier_ids)
 
     # Add new associations
     for tier_id in new_tier_ids_set - current_tier_ids:
-        db.add(ElanFileToTier(elan_id=elan_id, tier_id=tier_id))
+        db.add(
+            ElanFileToTier(
+                elan_id=elan_id,
+                tier_id=tier_id,
+                max_duration=max_durations.get(tier_id),
+            )
+        )
+
+    # Refresh the bound of kept associations, the annotations may have changed
+    for tier_id in new_tier_ids_set & current_tier_ids:
+        await db.execute(
+            update(ElanFileToTier)
+            .where(
+                ElanFileToTier.elan_id == elan_id,
+                ElanFileToTier.tier_id == tier_id,
+            )
+            .values(max_duration=max_durations.get(tier_id))
+        )
 
     # Remove old associations
     for tier_id in current_tier_ids - new_tier_ids_set:
@@ -1,7 +1,11 @@
+import functools
+from collections.abc import Callable
+
+from sqlalchemy import Delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from app.model.annotation import Annotation
-from app.crud.annotation import delete_unused_annotation_values
+from app.crud.annotation_value import mark_orphan_candidates
 from app.model.tier import Tier
 from app.model.elan_file import ElanFile
 from app.model.associations import (
@@ -19,6 +23,8 @@ from app.model.invitation import Invitation
 from app.model.project import Project
 from app.model.enums import ProjectPermission
 from app.core.centralized_logging import get_logger
+from app.utils.database import DatabaseUtils
+from app.core.config import PROJECT_DELETE_BATCH_SIZE
 
 logger = get_logger()
 
@@ -74,75 +80,124 @@ async def delete_project(db: AsyncSession, project_id: int) -> None:
 async def list_projects_by_instance(
     db: AsyncSession, instance_id: int
 ) -> list[Project]:
-    result = await db.execute(select(Project).where(Project.instance_id == instance_id))
+    """List the projects of an instance, leaving out those being deleted."""
+    result = await db.execute(
+        select(Project).where(
+            Project.instance_id == instance_id, Project.deleting.is_(False)
+        )
+    )
     return list(result.scalars().all())
 
 
 # --- ELAN FILE DELETION ---
 
 
-async def delete_annotations_for_tier(db: AsyncSession, tier_id: str):
-    logger.info(f"Attempting to delete annotations for tier_id={tier_id}")
-    try:
-        await db.execute(
-            Annotation.__table__.delete().where(Annotation.tier_id == tier_id)
+async def delete_in_batches(
+    db: AsyncSession,
+    stmt: Delete,
+    batch_size: int,
+    on_batch: Callable[[int], None] | None = None,
+) -> int:
+    """Run a DELETE repeatedly with a LIMIT, committing after each batch.
+
+    Short transactions keep row locks brief, so other requests are not stalled
+    behind one statement deleting millions of rows.
+
+    Returns:
+        Total number of rows deleted.
+
+    """
+    total = 0
+    while True:
+        deleted = await DatabaseUtils.execute_rowcount(
+            db, stmt.with_dialect_options(mysql_limit=batch_size)
         )
         await db.commit()
-        logger.info(f"Deleted annotations for tier_id={tier_id}")
-    except Exception as e:
-        logger.error(f"Failed to delete annotations for tier_id={tier_id}: {e}")
-
-
-async def delete_tiers_for_elan_file(db: AsyncSession, elan_id: int):
-    logger.info(f"Attempting to delete tiers for elan_id={elan_id}")
-    try:
-        result = await db.execute(select(Tier).where(Tier.elan_id == elan_id))
-        tiers = result.scalars().all()
-        for tier in tiers:
-            await delete_annotations_for_tier(db, tier.tier_id)
-            await db.delete(tier)
-        await db.commit()
-        logger.info(f"Deleted {len(tiers)} tiers for elan_id={elan_id}")
-    except Exception as e:
-        logger.error(f"Failed to delete tiers for elan_id={elan_id}: {e}")
+        total += deleted
+        if on_batch is not None:
+            on_batch(deleted)
+        if deleted < batch_size:
+            return total
 
 
-async def delete_elan_file_associations(db: AsyncSession, elan_id: int):
-    logger.info(f"Attempting to delete ELAN file associations for elan_id={elan_id}")
-    try:
-        await db.execute(
-            ElanFileToTier.__table__.delete().where(ElanFileToTier.elan_id == elan_id)
-        )
-        await db.execute(
-            CommentElanFile.__table__.delete().where(CommentElanFile.elan_id == elan_id)
+async def delete_elan_files_data(
+    db: AsyncSession,
+    elan_ids: list[int],
+    batch_size: int,
+    on_progress: Callable[[str, int], None] | None = None,
+) -> None:
+    """Delete ELAN files with their annotations, tiers and associations.
+
+    Tier ids are global, so annotations and tier links of other files that
+    point at a tier owned by one of these files go too, as the tier could not
+    be deleted otherwise.
+
+    Args:
+        db: Database session.
+        elan_ids: Files to delete.
+        batch_size: Maximum number of annotation rows per DELETE.
+        on_progress: Called with a step name and the rows it just deleted.
+
+    """
+    if not elan_ids:
+        return
+    report = on_progress or (lambda _step, _count: None)
+    owned_tiers = select(Tier.tier_id).where(Tier.elan_id.in_(elan_ids))
+
+    # Values are swept later, only among those these annotations used
+    await mark_orphan_candidates(db, Annotation.elan_id.in_(elan_ids))
+    await mark_orphan_candidates(db, Annotation.tier_id.in_(owned_tiers))
+    await db.commit()
+
+    await delete_in_batches(
+        db,
+        Annotation.__table__.delete().where(Annotation.elan_id.in_(elan_ids)),
+        batch_size,
+        functools.partial(report, "annotations"),
+    )
+    await delete_in_batches(
+        db,
+        Annotation.__table__.delete().where(Annotation.tier_id.in_(owned_tiers)),
+        batch_size,
+        functools.partial(report, "annotations"),
+    )
+
+    for table, condition in (
+        (ElanFileToTier, ElanFileToTier.elan_id.in_(elan_ids)),
+        (ElanFileToTier, ElanFileToTier.tier_id.in_(owned_tiers)),
+        (CommentElanFile, CommentElanFile.elan_id.in_(elan_ids)),
+        (ConflictOfElanFile, ConflictOfElanFile.elan_id.in_(elan_ids)),
+        (ElanFileToProject, ElanFileToProject.elan_id.in_(elan_ids)),
+    ):
+        report(
+            "file_links",
+            await DatabaseUtils.execute_rowcount(
+                db, table.__table__.delete().where(condition)
+            ),
         )
+
+    # Child tiers reference their parent, possibly across files: unlink them
+    # first so the tier rows can go in any order
+    tier_ids = list((await db.execute(owned_tiers)).scalars())
+    for start in range(0, len(tier_ids), batch_size):
         await db.execute(
-            ConflictOfElanFile.__table__.delete().where(
-                ConflictOfElanFile.elan_id == elan_id
-            )
-        )
-        await db.commit()
-        logger.info(
-            f"Deleted ELAN_FILE_TO_TIER, COMMENT_ELAN_FILE, and CONFLICT_OF_ELAN_FILE associations for elan_id={elan_id}"
-        )
-    except Exception as e:
-        logger.error(
-            f"Failed to delete ELAN file associations for elan_id={elan_id}: {e}"
+            Tier.__table__.update()
+            .where(Tier.parent_tier_id.in_(tier_ids[start : start + batch_size]))
+            .values(parent_tier_id=None)
         )
-
-
-async def delete_elan_file(db: AsyncSession, elan_file: ElanFile):
-    logger.info(
-        f"Deleting ELAN file and all related data for elan_id={elan_file.elan_id}"
+    report(
+        "tiers",
+        await DatabaseUtils.execute_rowcount(
+            db, Tier.__table__.delete().where(Tier.elan_id.in_(elan_ids))
+        ),
     )
-    try:
-        await delete_elan_file_associations(db, elan_file.elan_id)
-        await delete_tiers_for_elan_file(db, elan_file.elan_id)
-        await db.delete(elan_file)
-        await db.commit()
-        logger.info(f"Deleted ELAN file elan_id={elan_file.elan_id}")
-    except Exception as e:
-        logger.error(f"Failed to delete ELAN file elan_id={elan_file.elan_id}: {e}")
+    report(
+        "elan_files",
+        await DatabaseUtils.execute_rowcount(
+            db, ElanFile.__table__.delete().where(ElanFile.elan_id.in_(elan_ids))
+        ),
+    )
+    await db.commit()
 
 
 # --- PROJECT-LEVEL ASSOCIATIONS ---
@@ -209,55 +264,62 @@ async def delete_conflict_of_elan_file(db: AsyncSession, elan_id: int):
 # --- MAIN PROJECT DELETE FUNCTION ---
 
 
-async def delete_project_db(db: AsyncSession, project_name: str) -> None:
+async def hide_project(db: AsyncSession, project_name: str) -> Project | None:
+    """Flag a project as being deleted so listings stop showing it."""
+    project = await get_project_by_name(db, project_name)
+    if project is not None and not project.deleting:
+        project.deleting = True
+        await db.commit()
+    return project
+
+
+async def delete_project_db(
+    db: AsyncSession,
+    project_name: str,
+    batch_size: int = PROJECT_DELETE_BATCH_SIZE,
+    on_progress: Callable[[str, int], None] | None = None,
+) -> None:
+    """Delete a project and all its ELAN data with set-based statements.
+
+    Annotations are deleted in LIMIT-ed batches keyed by the project's files,
+    each committed on its own, so the project is hidden first and deletion
+    can resume if it is interrupted.
+
+    Args:
+        db: Database session.
+        project_name: Project to delete.
+        batch_size: Maximum number of annotation rows per DELETE.
+        on_progress: Called with a step name and the rows it just deleted.
+
+    """
     logger.info(f"Starting deletion for project '{project_name}'")
-    # Find the project
-    result = await db.execute(
-        select(Project).where(Project.project_name == project_name)
-    )
-    project = result.scalars().first()
+    project = await hide_project(db, project_name)
     if not project:
         logger.warning(f"Project '{project_name}' not found for deletion.")
         return
+    project_id = project.project_id
 
-    # Find all ELAN files associated with this project BEFORE deleting associations
     result = await db.execute(
-        select(ElanFile)
-        .join(ElanFileToProject, ElanFile.elan_id == ElanFileToProject.elan_id)
-        .where(ElanFileToProject.project_id == project.project_id)
-    )
-    elan_files = result.scalars().all()
-    logger.info(
-        f"Found {len(elan_files)} ELAN files for project_id={project.project_id}"
-    )
-
-    if not elan_files:
-        logger.warning(
-            f"No ELAN files found for project_id={project.project_id}. Check ElanFileToProject table for associations."
-        )
-
-    for elan_file in elan_files:
-        logger.info(
-            f"Deleting ELAN file with elan_id={elan_file.elan_id} for project_id={project.project_id}"
+        select(ElanFileToProject.elan_id).where(
+            ElanFileToProject.project_id == project_id
         )
-        await delete_elan_file(db, elan_file)
+    )
+    elan_ids = list(result.scalars())
+    logger.info(f"Found {len(elan_ids)} ELAN files for project_id={project_id}")
+    await delete_elan_files_data(db, elan_ids, batch_size, on_progress)
 
     # Now delete all project-level associations
-    await delete_project_associations(db, project.project_id)
-    await delete_project_invitations(db, project.project_id)
-    await delete_project_conflicts(db, project.project_id)
-    await delete_project_comments(db, project.project_id)
-
-    # Clean up unused annotation values after all annotations are deleted
-    logger.info(
-        f"Cleaning up unused annotation values after deleting project '{project_name}'"
-    )
-    await delete_unused_annotation_values(db)
+    await delete_project_associations(db, project_id)
+    await delete_project_invitations(db, project_id)
+    await delete_project_conflicts(db, project_id)
+    await delete_project_comments(db, project_id)
 
     # Finally, delete the project
-    logger.info(f"Deleting project '{project_name}' (project_id={project.project_id})")
-    await db.delete(project)
+    logger.info(f"Deleting project '{project_name}' (project_id={project_id})")
+    await db.execute(Project.__table__.delete().where(Project.project_id == project_id))
     await db.commit()
+    if on_progress:
+        on_progress("project", 1)
     logger.info(f"Finished deletion for project '{project_name}'")
 
 
@@ -1,10 +1,15 @@
 """Tier CRUD operations - Pure database access layer."""
 
-from sqlalchemy import select
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import Row, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
+from app.model.associations import ElanFileToTier
 from app.model.tier import Tier
+from app.utils.parsed_eaf import ParsedTier
 from app.core.centralized_logging import get_logger
 
 logger = get_logger()
@@ -73,7 +78,97 @@ async def get_tiers_by_elan_id(db: AsyncSession, elan_id: int) -> list[Tier]:
     return list(result.scalars().all())
 
 
+async def get_tier_rows_for_file(
+    db: AsyncSession, elan_id: int, tier_ids: Collection[str] | None = None
+) -> Sequence[Row]:
+    """Get (tier_id, tier_name, parent_tier_id) of the tiers linked to a file.
+
+    Args:
+        db: Database session.
+        elan_id: ID of the ELAN file.
+        tier_ids: Only return these tiers. Defaults to all tiers of the file.
+
+    Returns:
+        Rows ordered by tier id.
+
+    """
+    stmt = (
+        select(Tier.tier_id, Tier.tier_name, Tier.parent_tier_id)
+        .join(ElanFileToTier, ElanFileToTier.tier_id == Tier.tier_id)
+        .where(ElanFileToTier.elan_id == elan_id)
+        .order_by(Tier.tier_id)
+    )
+    if tier_ids is not None:
+        stmt = stmt.where(Tier.tier_id.in_(tier_ids))
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_tier_parents_for_files(
+    db: AsyncSession, elan_ids: Collection[int]
+) -> Sequence[Row]:
+    """Get (elan_id, tier_id, parent_tier_id) of the tiers linked to some files."""
+    result = await db.execute(
+        select(ElanFileToTier.elan_id, Tier.tier_id, Tier.parent_tier_id)
+        .join(Tier, ElanFileToTier.tier_id == Tier.tier_id)
+        .where(ElanFileToTier.elan_id.in_(elan_ids))
+    )
+    return result.all()
+
+
 async def check_tier_exists(db: AsyncSession, tier_id: str) -> bool:
     """Check if a tier exists."""
     result = await db.execute(select(Tier.tier_id).filter(Tier.tier_id == tier_id))
     return result.scalar_one_or_none() is not None
+
+
+async def bulk_get_or_create_tiers(
+    db: AsyncSession,
+    tiers: Sequence[ParsedTier],
+    elan_id: int,
+    chunk_size: int = 1000,
+) -> None:
+    """Insert the tiers of a file that do not exist yet, in chunked statements.
+
+    Existing tiers are left untouched, like create-if-missing. Parents are
+    written before their children so the PARENT_REF foreign key holds within a
+    single statement. Nothing is committed, the caller owns the transaction.
+    """
+    if elan_id is None:
+        raise ValueError(
+            "elan_id cannot be None when creating a Tier. This indicates a bug in the calling code."
+        )
+
+    rows = [
+        {
+            "tier_id": parsed_tier.tier_id,
+            "tier_name": parsed_tier.tier_name,
+            "elan_id": elan_id,
+            "parent_tier_id": parsed_tier.parent_tier_id,
+        }
+        for parsed_tier in _parents_first(tiers)
+    ]
+
+    for start in range(0, len(rows), chunk_size):
+        stmt = mysql_insert(Tier).values(rows[start : start + chunk_size])
+        await db.execute(stmt.on_duplicate_key_update(tier_id=Tier.tier_id))
+
+
+def _parents_first(tiers: Sequence[ParsedTier]) -> list[ParsedTier]:
+    """Order tiers so every parent tier precedes its children."""
+    by_id = {parsed_tier.tier_id: parsed_tier for parsed_tier in tiers}
+    ordered: list[ParsedTier] = []
+    seen: set[str] = set()
+
+    def visit(parsed_tier: ParsedTier) -> None:
+        if parsed_tier.tier_id in seen:
+            return
+        seen.add(parsed_tier.tier_id)
+        parent = by_id.get(parsed_tier.parent_tier_id)
+        if parent is not None:
+            visit(parent)
+        ordered.append(parsed_tier)
+
+    for parsed_tier in tiers:
+        visit(parsed_tier)
+    return ordered
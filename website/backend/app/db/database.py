@@ -9,6 +9,13 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import declarative_base
 from app.core.centralized_logging import get_logger
+from app.core.config import (
+    DB_ECHO,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+)
 
 logger = get_logger()
 
@@ -28,40 +35,92 @@ def build_database_url() -> str | None:
     return f"mysql+asyncmy://{user}:{encoded_password}@{host}:{port}/{name}"
 
 
-def get_engine(database_url: str | None = None, echo: bool = True) -> AsyncEngine:
-    """Lazily create and return an async SQLAlchemy engine."""
+# Process-wide engine and session factory, shared by every request
+_engine: AsyncEngine | None = None
+_session_maker: async_sessionmaker[AsyncSession] | None = None
+
+
+def build_engine(
+    database_url: str | None = None, echo: bool | None = None
+) -> AsyncEngine:
+    """Create a new async SQLAlchemy engine with the configured pool settings."""
     url = database_url or build_database_url()
     if not url:
         raise RuntimeError("DATABASE_URL is not set or incomplete")
-    engine = create_async_engine(url, echo=echo)
-    logger.debug(f"[ENGINE] Created AsyncEngine {id(engine)} with url: {url}")
+    engine = create_async_engine(
+        url,
+        echo=DB_ECHO if echo is None else echo,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    logger.debug(
+        f"[ENGINE] Created AsyncEngine {id(engine)} "
+        f"(pool_size={DB_POOL_SIZE}, max_overflow={DB_MAX_OVERFLOW})"
+    )
     return engine
 
 
+def get_engine() -> AsyncEngine:
+    """Return the process-wide async engine, creating it on first use."""
+    global _engine  # noqa: PLW0603
+    if _engine is None:
+        _engine = build_engine()
+    return _engine
+
+
+async def dispose_engine() -> None:
+    """Close every pooled connection and drop the process-wide engine."""
+    global _engine, _session_maker  # noqa: PLW0603
+    if _engine is not None:
+        await _engine.dispose()
+        logger.debug(f"[ENGINE] Disposed AsyncEngine {id(_engine)}")
+    _engine = None
+    _session_maker = None
+
+
 def get_session_maker(
     engine: AsyncEngine | None = None,
 ) -> async_sessionmaker[AsyncSession]:
-    """Return an async sessionmaker bound to the given engine."""
-    if engine is None:
-        engine = get_engine()
+    """Return an async sessionmaker, the shared one unless an engine is given."""
+    global _session_maker  # noqa: PLW0603
+    if engine is None and _session_maker is not None:
+        return _session_maker
+
     session_maker = async_sessionmaker(
-        bind=engine,
+        bind=engine or get_engine(),
         class_=AsyncSession,
         expire_on_commit=False,
         autoflush=False,
         autocommit=False,
     )
     logger.debug(
-        f"[SESSIONMAKER] Created async_sessionmaker {id(session_maker)} bound to engine {id(engine)}"
+        f"[SESSIONMAKER] Created async_sessionmaker {id(session_maker)} bound to engine {id(session_maker.kw['bind'])}"
     )
+    if engine is None:
+        _session_maker = session_maker
     return session_maker
 
 
+def get_pool_stats() -> dict[str, int | bool]:
+    """Return connection pool usage of the process-wide engine."""
+    pool = get_engine().pool
+    return {
+        "pool_size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,
+    }
+
+
 # Async session generator (for FastAPI dependency injection)
 async def get_db() -> AsyncGenerator[AsyncSession]:
     """Yield an async database session for dependency injection."""
-    engine = get_engine()
-    session_local = get_session_maker(engine)
+    session_local = get_session_maker()
     async with session_local() as session:
         logger.debug(f"[SESSION] get_db: Yielding session {id(session)} from generator")
         yield session
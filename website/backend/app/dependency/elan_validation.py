@@ -3,6 +3,8 @@ from app.core.centralized_logging import get_logger
 from fastapi import HTTPException, UploadFile
 
 from app.core.centralized_logging import get_logger
+from app.core.config import UPLOAD_CHUNK_SIZE
+from app.utils.file_processing import StreamingElanValidator
 
 logger = get_logger()
 
@@ -89,6 +91,9 @@ def validate_multiple_elan_files(files: list[UploadFile]) -> list[UploadFile]:
 async def validate_elan_file_content(file: UploadFile) -> UploadFile:
     """Validate ELAN file content structure (advanced validation).
 
+    The upload is read in chunks and checked incrementally, so the whole file
+    is never held in memory.
+
     Args:
         file: The uploaded file
 
@@ -99,45 +104,23 @@ async def validate_elan_file_content(file: UploadFile) -> UploadFile:
         HTTPException: If file content validation fails
 
     """
+    validator = StreamingElanValidator()
     try:
-        # Read file content
-        content = await file.read()
+        await file.seek(0)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            validator.feed(chunk)
+        validator.close()
 
         # Reset file pointer for later use
-        file.file.seek(0)
-
-        # Parse XML using lxml for security and speed
-        parser = lxml_etree.XMLParser(
-            resolve_entities=False, no_network=True, recover=True
-        )
-        root = lxml_etree.fromstring(content, parser=parser)
-
-        # Check if it's a valid ELAN file
-        if root.tag != "ANNOTATION_DOCUMENT":
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid ELAN file: missing ANNOTATION_DOCUMENT root element",
-            )
-
-        # Check for required elements
-        header = root.find("HEADER")
-        if header is None:
-            raise HTTPException(
-                status_code=400, detail="Invalid ELAN file: missing HEADER element"
-            )
-
-        time_order = root.find("TIME_ORDER")
-        if time_order is None:
-            raise HTTPException(
-                status_code=400, detail="Invalid ELAN file: missing TIME_ORDER element"
-            )
-
+        await file.seek(0)
         return file
 
     except lxml_etree.XMLSyntaxError as e:
         raise HTTPException(
             status_code=400, detail="Invalid ELAN file: XML parsing failed"
         ) from e
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid ELAN file: {e}") from e
     except Exception as e:
         raise HTTPException(
             status_code=400, detail=f"File validation failed: {e!s}"
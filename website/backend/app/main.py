@@ -1,4 +1,7 @@
 # Import API routers
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -7,6 +10,7 @@ from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.v1.auth import router as auth_router
+from app.api.v1.elan import router as elan_router
 from app.api.v1.git import router as git_router
 from app.api.v1.user import router as user_router
 from app.core.centralized_logging import get_logger
@@ -17,8 +21,15 @@ from app.core.exception_handler import (
     validation_exception_handler,
 )
 from app.core.limiter import limiter
+from app.db.database import dispose_engine, get_engine, get_pool_stats
+from app.dependency.user import get_admin_dep
 from app.middleware.csrf import CSRFMiddleware
 from app.middleware.security_headers import SecurityHeadersMiddleware
+from app.model.user import User
+from app.service.annotation_value_sweeper import annotation_value_sweeper
+from app.service.elan_pipeline import shutdown_parse_executor
+from app.service.git_blob_reader import close_all_blob_readers
+from app.service.git_operations import shutdown_git_executor
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
@@ -26,6 +37,21 @@ from starlette.middleware.trustedhost import TrustedHostMiddleware
 # Get logger (this will automatically call setup_application_logging)
 logger = get_logger()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Manage process-wide resources for the lifetime of the application."""
+    # One engine and connection pool for the whole process
+    get_engine()
+    annotation_value_sweeper.start()
+    yield
+    await annotation_value_sweeper.stop()
+    shutdown_parse_executor()
+    shutdown_git_executor()
+    close_all_blob_readers()
+    await dispose_engine()
+
+
 app = FastAPI(
     title="ELANORA - ELAN Collaboration Platform",
     description="API for collaborative ELAN annotation projects",
@@ -34,6 +60,7 @@ app = FastAPI(
     docs_url="/docs" if ENVIRONMENT != "server" else None,
     redoc_url="/redoc" if ENVIRONMENT != "server" else None,
     openapi_url="/openapi.json" if ENVIRONMENT != "server" else None,
+    lifespan=lifespan,
 )
 
 app.state.limiter = limiter
@@ -70,6 +97,7 @@ app.add_middleware(
 
 # Include API routers
 app.include_router(git_router, prefix=f"{API_V1_PREFIX}/git", tags=["GIT"])
+app.include_router(elan_router, prefix=f"{API_V1_PREFIX}/elan", tags=["ELAN"])
 app.include_router(user_router, prefix=f"{API_V1_PREFIX}/user", tags=["USER"])
 app.include_router(auth_router, prefix=f"{API_V1_PREFIX}/auth", tags=["AUTHENTICATION"])
 
@@ -90,3 +118,10 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+# Connection pool statistics, used to size DB_POOL_SIZE / DB_MAX_OVERFLOW
+@app.get("/health/db-pool")
+async def db_pool_stats(user: User = get_admin_dep):
+    """Return connection pool usage of the process-wide database engine."""
+    return get_pool_stats()
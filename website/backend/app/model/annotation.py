@@ -2,7 +2,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 
 from app.db.database import Base
-from sqlalchemy import ForeignKey, Numeric, String, Integer
+from sqlalchemy import ForeignKey, Index, Numeric, String, Integer
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -17,6 +17,12 @@ class Annotation(Base):
     """Annotation model representing individual annotations."""
 
     __tablename__ = "ANNOTATION"
+    __table_args__ = (
+        # Time-range lookups within the tiers of one file
+        Index("ix_annotation_file_tier_start", "elan_id", "tier_id", "start_time"),
+        # Keyset pages of a file, the primary key completes the sort key
+        Index("ix_annotation_file_start", "elan_id", "start_time"),
+    )
 
     annotation_id: Mapped[str] = mapped_column(String(50), primary_key=True)
     elan_id: Mapped[int] = mapped_column(
@@ -1,10 +1,31 @@
 from app.db.database import Base
-from sqlalchemy import Integer, Text
+from sqlalchemy import Index, Integer, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 
 class AnnotationValue(Base):
     __tablename__ = "ANNOTATION_VALUE"
+    __table_args__ = (
+        # Substring search, maintained by InnoDB on every insert
+        Index(
+            "ft_annotation_value",
+            "annotation_value",
+            mysql_prefix="FULLTEXT",
+            mysql_with_parser="ngram",
+        ),
+    )
 
     value_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     annotation_value: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+
+
+class AnnotationValueOrphanCandidate(Base):
+    """Value that lost a reference and may no longer be used by any annotation.
+
+    Filled when annotations are deleted or change value, drained by the
+    annotation value sweeper, which only checks these ids.
+    """
+
+    __tablename__ = "ANNOTATION_VALUE_ORPHAN_CANDIDATE"
+
+    value_id: Mapped[int] = mapped_column(Integer, primary_key=True)
@@ -1,5 +1,7 @@
+from decimal import Decimal
+
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Integer, Numeric, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.database import Base
@@ -36,6 +38,8 @@ class ElanFileToTier(Base):
     tier_id: Mapped[str] = mapped_column(
         String(50), ForeignKey("TIER.tier_id"), primary_key=True
     )
+    # Longest annotation of the file on this tier, bounds interval lookups
+    max_duration: Mapped[Decimal | None] = mapped_column(Numeric(10, 3), nullable=True)
 
 
 class ProjectAnnotStandard(Base):
@@ -22,6 +22,8 @@ class ElanFile(Base):
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("USER.user_id"), nullable=False
     )
+    # Git blob id of the content last ingested, used to skip unchanged files
+    blob_sha: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="elan_files")
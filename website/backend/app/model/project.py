@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, ForeignKey, Integer, String, Text, false
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -25,6 +25,10 @@ class Project(Base):
         Integer, ForeignKey("INSTANCE.instance_id"), nullable=False
     )
     project_path: Mapped[str] = mapped_column(String(512), nullable=False, unique=True)
+    # Set while a deletion is in progress, hidden from listings meanwhile
+    deleting: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=false()
+    )
 
     # Relationships - use string references
     instance: Mapped["Instance"] = relationship("Instance", back_populates="projects")
@@ -1,3 +1,5 @@
+from pydantic import Field
+
 from app.schema.common.base import CustomBaseModel
 from app.schema.common.git import FileStatus
 
@@ -19,6 +21,7 @@ class ProjectCreateResponse(CustomBaseModel):
     status: str
     git_initialized: bool
     created_at: str
+    failed_db_files: list[str] = Field(default_factory=list)
 
 
 class CommitResponse(CustomBaseModel):
@@ -74,6 +77,42 @@ class DiffHunk(CustomBaseModel):
     changes: list[DiffChange]
 
 
+class AnnotationChange(CustomBaseModel):
+    """One added, removed, retimed or relabelled annotation."""
+
+    annotation_id: str | None = None
+    old_annotation_id: str | None = None
+    value: str
+    old_value: str | None = None
+    start_time: float
+    end_time: float
+    old_start_time: float | None = None
+    old_end_time: float | None = None
+
+
+class TierDiff(CustomBaseModel):
+    """Annotation changes of one tier, each list capped per tier."""
+
+    tier_id: str
+    added: list[AnnotationChange] = Field(default_factory=list)
+    removed: list[AnnotationChange] = Field(default_factory=list)
+    retimed: list[AnnotationChange] = Field(default_factory=list)
+    relabelled: list[AnnotationChange] = Field(default_factory=list)
+    truncated: bool = False
+
+
+class SemanticDiff(CustomBaseModel):
+    """Annotation-level changes of an ELAN file."""
+
+    tiers: list[TierDiff]
+    total_added: int
+    total_removed: int
+    total_retimed: int
+    total_relabelled: int
+    summary: str
+    truncated: bool = False
+
+
 class FileChanges(CustomBaseModel):
     filename: str
     added_lines: list[DiffChange]
@@ -83,7 +122,9 @@ class FileChanges(CustomBaseModel):
     total_deletions: int
     hunks: list[DiffHunk]
     summary: str
-    diff_raw: str
+    diff_raw: str = ""
+    truncated: bool = False
+    semantic_diff: SemanticDiff | None = None
     error: str | None = None
 
 
@@ -108,6 +149,7 @@ class BatchFileUploadResponse(CustomBaseModel):
     status: str
     uploaded_at: str
     message: str | None = None
+    failed_db_files: list[str] = Field(default_factory=list)
 
 
 class ProjectStatusResponse(CustomBaseModel):
@@ -0,0 +1,106 @@
+"""Search annotation content across files and tiers."""
+
+from collections.abc import Collection, Sequence
+from decimal import Decimal, InvalidOperation
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.centralized_logging import get_logger
+from app.core.config import API_PAGE_SIZE
+from app.crud import annotation
+from app.crud.annotation_value import SearchMode, annotation_value_search_condition
+from app.utils.pagination import CursorUtils
+
+logger = get_logger()
+
+
+class AnnotationSearchService:
+    """Find annotations by value, with their file, tier and time."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def find(
+        self,
+        query: str,
+        mode: SearchMode = "contains",
+        limit: int = API_PAGE_SIZE,
+        cursor: str | None = None,
+        elan_ids: Collection[int] | None = None,
+        tier_ids: Collection[str] | None = None,
+    ) -> tuple[Sequence[Row], str | None]:
+        """Get one page of matching annotation rows and the next cursor.
+
+        Same arguments as search, which serializes these rows.
+        """
+        condition = annotation_value_search_condition(query, mode)
+
+        after = None
+        if cursor is not None:
+            elan_id, start_time, annotation_id = CursorUtils.decode(cursor, 3)
+            try:
+                after = (int(elan_id), Decimal(start_time), str(annotation_id))
+            except (InvalidOperation, TypeError, ValueError) as e:
+                raise ValueError("Invalid pagination cursor") from e
+
+        rows = await annotation.search_annotation_rows(
+            self.db, condition, limit + 1, after, elan_ids, tier_ids
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = CursorUtils.encode(
+                last.elan_id, str(last.start_time), last.annotation_id
+            )
+        return rows, next_cursor
+
+    async def search(
+        self,
+        query: str,
+        mode: SearchMode = "contains",
+        limit: int = API_PAGE_SIZE,
+        cursor: str | None = None,
+        elan_ids: Collection[int] | None = None,
+        tier_ids: Collection[str] | None = None,
+    ) -> dict:
+        """Get one page of the annotations whose value matches a query.
+
+        Args:
+            query: Search text, or a regular expression in "regex" mode.
+            mode: "exact", "contains", "prefix" or "regex".
+            limit: Maximum number of hits in the page.
+            cursor: next_cursor of the previous page, None for the first one.
+            elan_ids: Only search these files. Defaults to all.
+            tier_ids: Only search these tiers. Defaults to all.
+
+        Returns:
+            The hits, ordered by file and time, and the cursor of the next
+            page, None on the last one.
+
+        Raises:
+            ValueError: If the query cannot use the index or the cursor is
+                malformed.
+
+        """
+        rows, next_cursor = await self.find(
+            query, mode, limit, cursor, elan_ids, tier_ids
+        )
+
+        logger.debug(f"Search '{query}' ({mode}) returned {len(rows)} hits")
+        return {
+            "hits": [
+                {
+                    "elan_id": elan_id,
+                    "filename": filename,
+                    "tier_id": tier_id,
+                    "annotation_id": annotation_id,
+                    "annotation_value": value,
+                    "start_time": float(start_time),
+                    "end_time": float(end_time),
+                }
+                for elan_id, filename, tier_id, annotation_id, value, start_time, end_time in rows
+            ],
+            "next_cursor": next_cursor,
+        }
@@ -0,0 +1,83 @@
+"""Deferred deletion of annotation values no annotation refers to anymore."""
+
+import asyncio
+import contextlib
+
+from app.core.centralized_logging import get_logger
+from app.core.config import (
+    ANNOTATION_VALUE_SWEEP_BATCH_SIZE,
+    ANNOTATION_VALUE_SWEEP_INTERVAL,
+    ANNOTATION_VALUE_SWEEP_MAX_BATCHES,
+)
+from app.crud.annotation_value import sweep_orphan_values
+from app.db.database import get_session_maker
+from app.service.project_scheduler import project_scheduler
+
+logger = get_logger()
+
+
+class AnnotationValueSweeper:
+    """Periodically drain the orphan candidates in bounded batches.
+
+    A sweep only starts, and only continues to its next batch, while no
+    project operation is running or queued in this process, so it never
+    competes with uploads, merges or deletions for row locks.
+    """
+
+    def __init__(self, interval: float, batch_size: int, max_batches: int) -> None:
+        """Initialize with the seconds between sweeps and the per-sweep bounds."""
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sweeping in the background, unless disabled or already running."""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to end."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def sweep(self) -> int:
+        """Run up to max_batches batches while the process stays quiet.
+
+        Returns:
+            Number of annotation values deleted.
+
+        """
+        if not project_scheduler.is_idle():
+            return 0
+
+        deleted = 0
+        async with get_session_maker()() as db:
+            for _ in range(self.max_batches):
+                checked, removed = await sweep_orphan_values(db, self.batch_size)
+                deleted += removed
+                if checked < self.batch_size or not project_scheduler.is_idle():
+                    break
+        if deleted:
+            logger.info(f"Annotation value sweep deleted {deleted} orphaned values")
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                # Candidates stay recorded, the next sweep retries them
+                logger.error(f"Annotation value sweep failed: {e}")
+
+
+annotation_value_sweeper = AnnotationValueSweeper(
+    ANNOTATION_VALUE_SWEEP_INTERVAL,
+    ANNOTATION_VALUE_SWEEP_BATCH_SIZE,
+    ANNOTATION_VALUE_SWEEP_MAX_BATCHES,
+)
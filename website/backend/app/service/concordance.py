@@ -0,0 +1,263 @@
+"""Keyword-in-context concordances over annotation search hits."""
+
+import operator
+import time
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Collection, Iterator, Sequence
+from dataclasses import dataclass, field
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.centralized_logging import get_logger
+from app.core.config import API_PAGE_SIZE
+from app.crud import annotation, tier
+from app.crud.annotation_value import SearchMode
+from app.service.annotation_search import AnnotationSearchService
+
+logger = get_logger()
+
+# (elan_id, tier_id)
+FileTier = tuple[int, str]
+
+
+@dataclass(slots=True)
+class TierTimeline:
+    """Annotations of one tier of one file, sorted by start time."""
+
+    annotation_ids: list[str] = field(default_factory=list)
+    values: list[str] = field(default_factory=list)
+    start_ms: array = field(default_factory=lambda: array("q"))
+    end_ms: array = field(default_factory=lambda: array("q"))
+    positions: dict[str, int] = field(default_factory=dict)
+    max_duration_ms: int = 0
+
+    @classmethod
+    def from_columns(
+        cls,
+        annotation_ids: list[str],
+        values: list[str],
+        start_ms: Sequence[int],
+        end_ms: Sequence[int],
+    ) -> "TierTimeline":
+        """Build a timeline from annotation columns sorted by start time."""
+        return cls(
+            annotation_ids=annotation_ids,
+            values=values,
+            start_ms=array("q", start_ms),
+            end_ms=array("q", end_ms),
+            positions={aid: i for i, aid in enumerate(annotation_ids)},
+            max_duration_ms=max(map(operator.sub, end_ms, start_ms), default=0),
+        )
+
+    def neighbours(self, position: int, count: int) -> tuple[range, range]:
+        """Return the positions of up to count annotations before and after."""
+        return (
+            range(max(position - count, 0), position),
+            range(position + 1, min(position + 1 + count, len(self.values))),
+        )
+
+    def overlapping(self, start_ms: int, end_ms: int) -> Iterator[int]:
+        """Yield the positions of annotations sharing time with an interval.
+
+        A zero-length interval matches the annotations covering that instant.
+        No annotation is longer than max_duration_ms, so the scan starts at
+        the first one that can still reach the interval.
+        """
+        first = bisect_left(self.start_ms, start_ms - self.max_duration_ms)
+        for position in range(first, len(self.values)):
+            start = self.start_ms[position]
+            if start > end_ms or (start == end_ms and start_ms < end_ms):
+                return
+            end = self.end_ms[position]
+            if end > start_ms or (start_ms == end_ms and end >= start_ms):
+                yield position
+
+    def entry(self, position: int) -> dict:
+        """Serialize the annotation at a position."""
+        return {
+            "annotation_id": self.annotation_ids[position],
+            "annotation_value": self.values[position],
+            "start_time": self.start_ms[position] / 1000,
+            "end_time": self.end_ms[position] / 1000,
+        }
+
+
+class ConcordanceService:
+    """Build keyword-in-context lines for the hits of an annotation search."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def build(
+        self,
+        query: str,
+        mode: SearchMode = "contains",
+        context: int = 5,
+        dependents: bool = True,
+        limit: int = API_PAGE_SIZE,
+        cursor: str | None = None,
+        elan_ids: Collection[int] | None = None,
+        tier_ids: Collection[str] | None = None,
+    ) -> dict:
+        """Get one page of concordance lines for a search.
+
+        Every tier holding a hit, and its dependent tiers, is loaded once as
+        a sorted timeline in a single batched query. Neighbours are then a
+        slice around the hit and aligned annotations a bisect on start time,
+        so the cost is one pass over the involved tiers whatever the number
+        of hits.
+
+        Args:
+            query: Search text, or a regular expression in "regex" mode.
+            mode: "exact", "contains", "prefix" or "regex".
+            context: Number of annotations shown before and after each hit
+                on its own tier.
+            dependents: Include the annotations of the descendant tiers
+                (through parent_tier_id) that overlap each hit in time.
+            limit: Maximum number of hits in the page.
+            cursor: next_cursor of the previous page, None for the first one.
+            elan_ids: Only search these files. Defaults to all.
+            tier_ids: Only search these tiers. Defaults to all.
+
+        Returns:
+            The lines, ordered by file and time, and the cursor of the next
+            page, None on the last one.
+
+        Raises:
+            ValueError: If the query cannot use the index or the cursor is
+                malformed.
+
+        """
+        started = time.perf_counter()
+        hits, next_cursor = await AnnotationSearchService(self.db).find(
+            query, mode, limit, cursor, elan_ids, tier_ids
+        )
+        if not hits:
+            return {"lines": [], "next_cursor": next_cursor}
+
+        hit_tiers = {(hit.elan_id, hit.tier_id) for hit in hits}
+        descendants: dict[FileTier, list[str]] = {}
+        if dependents:
+            children: dict[FileTier, list[str]] = defaultdict(list)
+            for (
+                elan_id,
+                tier_id,
+                parent_tier_id,
+            ) in await tier.get_tier_parents_for_files(
+                self.db, {elan_id for elan_id, _ in hit_tiers}
+            ):
+                if parent_tier_id is not None:
+                    children[(elan_id, parent_tier_id)].append(tier_id)
+            descendants = {
+                file_tier: self._descendants(file_tier, children)
+                for file_tier in hit_tiers
+            }
+
+        needed = set(hit_tiers)
+        for (elan_id, _), tier_list in descendants.items():
+            needed.update((elan_id, tier_id) for tier_id in tier_list)
+        timelines = self._timelines(
+            await annotation.get_annotation_rows_for_file_tiers(self.db, needed)
+        )
+
+        lines = []
+        for hit in hits:
+            line = self._line(
+                hit, timelines, descendants.get((hit.elan_id, hit.tier_id), []), context
+            )
+            if line is not None:
+                lines.append(line)
+        if len(lines) < len(hits):
+            logger.debug(
+                f"Concordance '{query}': skipped {len(hits) - len(lines)} hits "
+                "changed by a re-ingest since the search"
+            )
+        logger.debug(
+            f"Concordance '{query}' ({mode}): {len(lines)} lines over "
+            f"{len(needed)} tiers in {time.perf_counter() - started:.3f}s"
+        )
+        return {"lines": lines, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _descendants(
+        file_tier: FileTier, children: dict[FileTier, list[str]]
+    ) -> list[str]:
+        """List the tiers depending on a tier, directly or not, parents first."""
+        elan_id, tier_id = file_tier
+        found: list[str] = []
+        seen = {tier_id}
+        pending = [tier_id]
+        while pending:
+            for child in children.get((elan_id, pending.pop(0)), []):
+                if child not in seen:
+                    seen.add(child)
+                    found.append(child)
+                    pending.append(child)
+        return found
+
+    @staticmethod
+    def _timelines(rows: Sequence[Row]) -> dict[FileTier, TierTimeline]:
+        """Split annotation rows, sorted by file, tier and time, into timelines.
+
+        Rows are turned into columns once, then each tier is a slice of them,
+        which is several times faster than appending row by row.
+        """
+        elan_ids, tier_ids, annotation_ids, values, starts, ends = (
+            [row[i] for row in rows] for i in range(6)
+        )
+        bounds = [
+            i
+            for i in range(1, len(rows))
+            if tier_ids[i] != tier_ids[i - 1] or elan_ids[i] != elan_ids[i - 1]
+        ]
+        return {
+            (elan_ids[first], tier_ids[first]): TierTimeline.from_columns(
+                annotation_ids[first:last],
+                values[first:last],
+                starts[first:last],
+                ends[first:last],
+            )
+            for first, last in zip([0, *bounds], [*bounds, len(rows)], strict=True)
+            if first < last
+        }
+
+    @staticmethod
+    def _line(
+        hit: Row,
+        timelines: dict[FileTier, TierTimeline],
+        dependent_tiers: list[str],
+        context: int,
+    ) -> dict | None:
+        """Assemble the concordance line of one hit.
+
+        Returns None when the hit was deleted or moved between the search and
+        the timeline queries, e.g. by a concurrent re-ingest of its file.
+        """
+        timeline = timelines.get((hit.elan_id, hit.tier_id))
+        position = timeline.positions.get(hit.annotation_id) if timeline else None
+        if timeline is None or position is None:
+            return None
+        left, right = timeline.neighbours(position, context)
+        start_ms = timeline.start_ms[position]
+        end_ms = timeline.end_ms[position]
+
+        aligned = {}
+        for tier_id in dependent_tiers:
+            dependent = timelines.get((hit.elan_id, tier_id))
+            if dependent is not None:
+                aligned[tier_id] = [
+                    dependent.entry(i) for i in dependent.overlapping(start_ms, end_ms)
+                ]
+
+        return {
+            "elan_id": hit.elan_id,
+            "filename": hit.filename,
+            "tier_id": hit.tier_id,
+            **timeline.entry(position),
+            "left": [timeline.entry(i) for i in left],
+            "right": [timeline.entry(i) for i in right],
+            "dependents": aligned,
+        }
@@ -0,0 +1,244 @@
+"""Annotation-level diff between two versions of an ELAN file."""
+
+import bisect
+import io
+from collections import defaultdict, deque
+from collections.abc import Iterable
+from typing import Any
+
+from app.utils.file_processing import StreamingElanParser
+
+# An annotation reduced to what reviewers compare: (id, value, start_ms, end_ms)
+Annotation = tuple[str, str, int, int]
+
+
+def parse_eaf_annotations(data: bytes) -> dict[str, list[Annotation]]:
+    """Parse EAF bytes into annotations per tier id, in document order."""
+    eaf = StreamingElanParser().parse(io.BytesIO(data))
+    return {tier.tier_id: list(eaf.annotations(tier)) for tier in eaf.tiers}
+
+
+def diff_eaf_bytes(
+    base: bytes, changed: bytes, max_changes_per_tier: int = 0
+) -> dict[str, Any]:
+    """Compare two EAF documents annotation by annotation.
+
+    Module-level so it can run in the parse process pool.
+
+    Args:
+        base: Raw bytes of the reference version.
+        changed: Raw bytes of the new version.
+        max_changes_per_tier: Maximum number of annotations listed per kind of
+            change and tier. Longer lists are cut and the tier is flagged as
+            truncated, totals still count every change. 0 disables the cap.
+
+    Returns:
+        Dict with per-tier added, removed, retimed and relabelled annotations
+        and the totals over all tiers.
+
+    """
+    base_tiers = parse_eaf_annotations(base)
+    changed_tiers = parse_eaf_annotations(changed)
+
+    tiers = []
+    totals = dict.fromkeys(("added", "removed", "retimed", "relabelled"), 0)
+    for tier_id in list(base_tiers) + [t for t in changed_tiers if t not in base_tiers]:
+        tier_diff = diff_tier(
+            tier_id, base_tiers.get(tier_id, []), changed_tiers.get(tier_id, [])
+        )
+        if any(tier_diff[kind] for kind in totals):
+            tiers.append(tier_diff)
+            for kind in totals:
+                totals[kind] += len(tier_diff[kind])
+                if max_changes_per_tier and len(tier_diff[kind]) > max_changes_per_tier:
+                    tier_diff[kind] = tier_diff[kind][:max_changes_per_tier]
+                    tier_diff["truncated"] = True
+
+    truncated = any(tier_diff["truncated"] for tier_diff in tiers)
+
+    return {
+        "tiers": tiers,
+        "total_added": totals["added"],
+        "total_removed": totals["removed"],
+        "total_retimed": totals["retimed"],
+        "total_relabelled": totals["relabelled"],
+        "summary": (
+            f"{totals['added']} added, {totals['removed']} removed, "
+            f"{totals['retimed']} retimed, {totals['relabelled']} relabelled "
+            f"annotations in {len(tiers)} tiers."
+            + (" Diff truncated." if truncated else "")
+        ),
+        "truncated": truncated,
+    }
+
+
+def diff_tier(
+    tier_id: str, base: list[Annotation], changed: list[Annotation]
+) -> dict[str, Any]:
+    """Diff the annotations of one tier.
+
+    Annotations are first paired by ANNOTATION_ID. The rest, typically renumbered
+    by ELAN, are paired by greatest time overlap in one sorted sweep.
+    """
+    changed_by_id = {annotation[0]: annotation for annotation in changed}
+    pairs = []
+    unmatched_base = []
+    for annotation in base:
+        other = changed_by_id.pop(annotation[0], None)
+        if other is None:
+            unmatched_base.append(annotation)
+        else:
+            pairs.append((annotation, other))
+
+    overlap_pairs, removed, added = _match_by_overlap(
+        unmatched_base, list(changed_by_id.values())
+    )
+    pairs += overlap_pairs
+
+    retimed = []
+    relabelled = []
+    for old, new in pairs:
+        if (old[2], old[3]) != (new[2], new[3]):
+            retimed.append(
+                {
+                    "annotation_id": new[0],
+                    "old_annotation_id": old[0],
+                    "value": new[1],
+                    "old_start_time": old[2] / 1000,
+                    "old_end_time": old[3] / 1000,
+                    "start_time": new[2] / 1000,
+                    "end_time": new[3] / 1000,
+                }
+            )
+        if old[1] != new[1]:
+            relabelled.append(
+                {
+                    "annotation_id": new[0],
+                    "old_annotation_id": old[0],
+                    "old_value": old[1],
+                    "value": new[1],
+                    "start_time": new[2] / 1000,
+                    "end_time": new[3] / 1000,
+                }
+            )
+
+    return {
+        "tier_id": tier_id,
+        "added": _entries(added),
+        "removed": _entries(removed),
+        "retimed": retimed,
+        "relabelled": relabelled,
+        "truncated": False,
+    }
+
+
+def _match_by_overlap(
+    base: list[Annotation], changed: list[Annotation]
+) -> tuple[list[tuple[Annotation, Annotation]], list[Annotation], list[Annotation]]:
+    """Pair annotations whose ids differ by content, then by time overlap.
+
+    Identical (value, start, end) annotations are paired first through a hash
+    lookup, and zero-length ones (reference annotations have no time) only pair
+    at the same instant. The remaining intervals are paired in one sweep over
+    start-sorted lists: base annotations enter a list kept sorted by end time
+    when the sweep reaches their start, and leave it once they end before the
+    current annotation starts or get paired. Candidates are tried from the
+    latest end down and the scan stops as soon as their end can no longer beat
+    the best overlap found. Equal overlaps prefer an identical value.
+
+    Returns:
+        Matched (base, changed) pairs, unmatched base and unmatched changed.
+
+    """
+    pairs = []
+    added = []
+
+    by_content: dict[tuple[str, int, int], deque[Annotation]] = defaultdict(deque)
+    for annotation in base:
+        by_content[annotation[1:]].append(annotation)
+    instants: dict[int, deque[Annotation]] = defaultdict(deque)
+    intervals = []
+    for annotation in changed:
+        same = by_content.get(annotation[1:])
+        if same:
+            pairs.append((same.popleft(), annotation))
+        else:
+            intervals.append(annotation)
+
+    base_intervals = []
+    for annotation in (a for same in by_content.values() for a in same):
+        if annotation[2] == annotation[3]:
+            instants[annotation[2]].append(annotation)
+        else:
+            base_intervals.append(annotation)
+
+    base_sorted = sorted(base_intervals, key=lambda a: (a[2], a[3]))
+    # (end, index in base_sorted) of unpaired base intervals, sorted by end
+    active: list[tuple[int, int]] = []
+    used: set[int] = set()
+    next_base = 0
+
+    for annotation in sorted(intervals, key=lambda a: (a[2], a[3])):
+        _, _, start, end = annotation
+        if start == end:
+            same_instant = instants.get(start)
+            if same_instant:
+                pairs.append((same_instant.popleft(), annotation))
+            else:
+                added.append(annotation)
+            continue
+
+        while next_base < len(base_sorted) and base_sorted[next_base][2] < end:
+            bisect.insort(active, (base_sorted[next_base][3], next_base))
+            next_base += 1
+        # Later annotations start no earlier, so expired intervals never return
+        del active[: bisect.bisect_right(active, (start, len(base_sorted)))]
+
+        best = _best_overlap(active, base_sorted, annotation)
+        if best is None:
+            added.append(annotation)
+        else:
+            _, index = active.pop(best)
+            used.add(index)
+            pairs.append((base_sorted[index], annotation))
+
+    removed = [a for i, a in enumerate(base_sorted) if i not in used]
+    removed += [a for same in instants.values() for a in same]
+    return pairs, removed, added
+
+
+def _best_overlap(
+    active: list[tuple[int, int]], base_sorted: list[Annotation], annotation: Annotation
+) -> int | None:
+    """Return the position in active of the best overlapping candidate, if any."""
+    _, value, start, end = annotation
+    best = None
+    best_key = None
+    for position in range(len(active) - 1, -1, -1):
+        candidate_end, index = active[position]
+        # Overlap can only shrink for candidates ending earlier
+        if best_key is not None and (min(end, candidate_end) - start, True) <= best_key:
+            break
+        candidate = base_sorted[index]
+        overlap = min(end, candidate_end) - max(start, candidate[2])
+        if overlap <= 0:
+            continue
+        key = (overlap, candidate[1] == value)
+        if best_key is None or key > best_key:
+            best, best_key = position, key
+    return best
+
+
+def _entries(annotations: Iterable[Annotation]) -> list[dict[str, Any]]:
+    """Serialize unpaired annotations, ordered by time."""
+    return [
+        {
+            "annotation_id": annotation_id,
+            "value": value,
+            "start_time": start / 1000,
+            "end_time": end / 1000,
+        }
+        for annotation_id, value, start, end in sorted(
+            annotations, key=lambda a: (a[2], a[3])
+        )
+    ]
@@ -1,25 +1,68 @@
 """ELAN Service - Simplified using utilities."""
 
-from lxml import etree as ET
-from pathlib import Path
-from typing import Dict, List, Optional
-from decimal import Decimal
+import json
+import time
+from collections.abc import AsyncIterator, Collection
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
-from sqlalchemy import func, select
+from lxml import etree as ET
+
+from sqlalchemy import Row, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.centralized_logging import get_logger
-from app.crud import annotation, elan_file, tier
+from app.core.config import (
+    API_PAGE_SIZE,
+    API_STREAM_BATCH_SIZE,
+    ELAN_INGEST_CHUNK_SIZE,
+    ELAN_STREAMING_PARSE_THRESHOLD_MB,
+)
+from app.crud import annotation, annotation_value, elan_file, tier
 from app.crud.project import get_project_by_name
-from app.model.tier import Tier
 from app.model.annotation import Annotation
-from app.utils.file_processing import ElanFileProcessor, XmlAttributeExtractor
+from app.model.elan_file import ElanFile
+from app.model.tier import Tier
+from app.utils.file_processing import (
+    ElanFileProcessor,
+    StreamingElanParser,
+    XmlAttributeExtractor,
+    add_alignable_annotation,
+)
+from app.utils.pagination import CursorUtils
+from app.utils.parsed_eaf import ParsedEaf
 
 # Get logger for this module
 logger = get_logger()
 
 
+@dataclass
+class IngestStats:
+    """Row counts and timing of one file's bulk ingest."""
+
+    tiers: int
+    annotation_values: int
+    annotations: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Annotation rows written per second."""
+        return self.annotations / self.seconds if self.seconds > 0 else 0.0
+
+
+@dataclass
+class ReingestStats:
+    """Annotation rows touched when re-ingesting a changed file."""
+
+    inserted: int
+    updated: int
+    deleted: int
+    unchanged: int
+    seconds: float
+
+
 class ElanService:
     """Service for ELAN file operations."""
 
@@ -28,71 +71,99 @@ class ElanService:
         self.file_processor = ElanFileProcessor()
         self.xml_extractor = XmlAttributeExtractor()
 
-    def parse_elan_file(self, file_path: str) -> dict:
-        """Parse a single ELAN file and extract all relevant information."""
+    @staticmethod
+    def parse_elan_file(file_path: str, streaming: bool | None = None) -> dict:
+        """Parse a single ELAN file and extract all relevant information.
+
+        Parsing does not touch the database session, so this is also the entry
+        point used by the process-pool parse pipeline.
+
+        Args:
+            file_path: Path to the .eaf file.
+            streaming: Force (True) or disable (False) the single-pass iterparse
+                mode. When None, streaming is used for files larger than
+                ELAN_STREAMING_PARSE_THRESHOLD_MB.
+
+        Returns:
+            The file_info dict with file metadata and the ParsedEaf under "eaf".
+
+        """
         logger.info(f"Starting to parse ELAN file: {file_path}")
 
         # Use utility for validation
         file_path_obj = ElanFileProcessor.validate_elan_file(file_path)
 
+        if streaming is None:
+            streaming = ElanService.should_stream(file_path_obj)
+        if streaming:
+            return ElanService._parse_elan_file_streaming(file_path_obj)
+
         parser = ET.XMLParser(resolve_entities=False, no_network=True, recover=False)
         tree = ET.parse(file_path_obj, parser=parser)
         root = tree.getroot()
 
+        eaf = ParsedEaf(time_slots=ElanFileProcessor.extract_time_slots(root))
+        ElanService._extract_tiers(root, eaf)
+
         # Use utilities for file info extraction
         file_info = ElanFileProcessor.get_file_info(file_path_obj)
-        file_info.update(
-            {"tiers": [], "time_slots": ElanFileProcessor.extract_time_slots(root)}
+        file_info["eaf"] = eaf.finish()
+        logger.info(
+            f"Successfully parsed ELAN file: {file_path} - Found {len(eaf.tiers)} tiers"
         )
+        return file_info
+
+    @staticmethod
+    def should_stream(file_path_obj: Path) -> bool:
+        """Return True if the file is large enough to use the streaming parser."""
+        threshold_bytes = ELAN_STREAMING_PARSE_THRESHOLD_MB * 1024 * 1024
+        return file_path_obj.stat().st_size > threshold_bytes
+
+    @staticmethod
+    def _parse_elan_file_streaming(file_path_obj: Path) -> dict:
+        """Parse an ELAN file in one iterparse pass with bounded memory."""
+        logger.debug(f"Using streaming parser for: {file_path_obj}")
+
+        eaf = StreamingElanParser().parse(file_path_obj)
+
+        file_info = ElanFileProcessor.get_file_info(file_path_obj)
+        file_info["eaf"] = eaf
 
-        self._extract_tiers(root, file_info)
         logger.info(
-            f"Successfully parsed ELAN file: {file_path} - Found {len(file_info['tiers'])} tiers"
+            f"Successfully parsed ELAN file (streaming): {file_path_obj} - Found {len(eaf.tiers)} tiers"
         )
         return file_info
 
-    def _extract_tiers(self, root: ET._Element, file_info: dict) -> None:
-        """Extract tiers using utility functions."""
-        tier_count = 0
+    @staticmethod
+    def _extract_tiers(root: ET._Element, eaf: ParsedEaf) -> None:
+        """Extract tiers and their annotations into the columns of eaf."""
         for tier_element in root.findall(".//TIER", namespaces=None):
-            tier_info = self.xml_extractor.get_tier_attributes(tier_element)
-            tier_info["annotations"] = self._extract_annotations(
-                tier_element, file_info["time_slots"]
+            ElanService._extract_annotations(tier_element, eaf)
+            eaf.close_tier(
+                tier_element.get("TIER_ID", None),
+                tier_element.get("PARENT_REF", None),
+                tier_element.get("LINGUISTIC_TYPE_REF", None),
             )
 
-            if tier_info["annotations"]:
-                file_info["tiers"].append(tier_info)
-                tier_count += 1
+        logger.debug(f"Extracted {len(eaf.tiers)} tiers with annotations")
 
-        logger.debug(f"Extracted {tier_count} tiers with annotations")
-
-    def _extract_annotations(
-        self, tier_element: ET._Element, time_slots: dict[str, int]
-    ) -> list[dict]:
-        """Extract annotations for a tier using utility functions."""
-        annotations = []
-
-        # Extract alignable annotations
+    @staticmethod
+    def _extract_annotations(tier_element: ET._Element, eaf: ParsedEaf) -> None:
+        """Append the annotations of a tier, alignable ones first."""
         for annotation_elem in tier_element.findall(
             ".//ANNOTATION/ALIGNABLE_ANNOTATION",
             namespaces=None,
         ):
-            ann_info = self.xml_extractor.get_alignable_annotation_attributes(
-                annotation_elem, time_slots
-            )
-            if ann_info:
-                annotations.append(ann_info)
+            add_alignable_annotation(eaf, annotation_elem)
 
-        # Extract reference annotations
         for annotation_elem in tier_element.findall(
             ".//ANNOTATION/REF_ANNOTATION", namespaces=None
         ):
-            ann_info = self.xml_extractor.get_ref_annotation_attributes(annotation_elem)
-            if ann_info:
-                annotations.append(ann_info)
-
-        logger.debug(f"Extracted {len(annotations)} annotations from tier")
-        return annotations
+            value = XmlAttributeExtractor.get_annotation_value(annotation_elem)
+            if value is not None:
+                eaf.add_annotation(
+                    annotation_elem.get("ANNOTATION_ID", None), value, 0, 0
+                )
 
     def get_files_in_directory(self, directory_path: str) -> list[Path]:
         """Get all ELAN files in a directory using utility."""
@@ -104,120 +175,131 @@ class ElanService:
     # ==================== STORAGE METHODS ====================
 
     async def _store_tiers_and_annotations(
-        self, tiers_data: List[Dict], elan_id: int
-    ) -> None:
-        """Store tiers and their annotations using CRUD functions."""
-        logger.debug(f"Storing {len(tiers_data)} tiers with annotations")
-
-        from app.model.annotation_value import AnnotationValue
-
-        # Build a value map to avoid duplicate AnnotationValue entries
-        value_map = {}
-        for tier_data in tiers_data:
-            for ann_data in tier_data["annotations"]:
-                value = ann_data["annotation_value"]
-                if value not in value_map:
-                    # Try to get or create the AnnotationValue
-                    result = await self.db.execute(
-                        select(AnnotationValue).filter(
-                            AnnotationValue.annotation_value == value
-                        )
-                    )
-                    annotation_value = result.scalar_one_or_none()
-                    if not annotation_value:
-                        annotation_value = AnnotationValue(annotation_value=value)
-                        self.db.add(annotation_value)
-                        await self.db.flush()
-                    value_map[value] = annotation_value.value_id
-
-        for tier_data in tiers_data:
-            # Get or create tier using CRUD
-            tier_obj = await self._get_or_create_tier(tier_data, elan_id)
-
-            # Store annotations using CRUD
-            annotation_count = 0
-            for ann_data in tier_data["annotations"]:
-                if not await annotation.check_annotation_exists(
-                    self.db, ann_data["annotation_id"], elan_id
-                ):
-                    await annotation.create_annotation_in_db(
-                        db=self.db,
-                        annotation_id=ann_data["annotation_id"],
-                        elan_id=elan_id,
-                        value_id=value_map[ann_data["annotation_value"]],
-                        start_time=ann_data["start_time"],
-                        end_time=ann_data["end_time"],
-                        tier_id=tier_obj.tier_id,
-                    )
-                    annotation_count += 1
+        self, eaf: ParsedEaf, elan_id: int
+    ) -> IngestStats:
+        """Store tiers and their annotations with set-based bulk statements.
+
+        Values, tiers and annotations are each written with chunked multi-row
+        INSERT ... ON DUPLICATE KEY UPDATE statements. Nothing is committed
+        here, so the whole file lands in the caller's transaction.
+        """
+        logger.debug(f"Storing {len(eaf.tiers)} tiers with annotations")
+        started = time.perf_counter()
+
+        value_map = await annotation_value.bulk_get_or_create_annotation_values(
+            self.db, eaf.values, chunk_size=ELAN_INGEST_CHUNK_SIZE
+        )
+        await tier.bulk_get_or_create_tiers(
+            self.db, eaf.tiers, elan_id, chunk_size=ELAN_INGEST_CHUNK_SIZE
+        )
+        annotation_count = await annotation.bulk_upsert_annotations(
+            self.db,
+            eaf,
+            elan_id,
+            value_map,
+            chunk_size=ELAN_INGEST_CHUNK_SIZE,
+        )
+
+        stats = IngestStats(
+            tiers=len(eaf.tiers),
+            annotation_values=len(value_map),
+            annotations=annotation_count,
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            f"Ingested {stats.annotations} annotations, {stats.annotation_values} values "
+            f"and {stats.tiers} tiers for elan_id={elan_id} in {stats.seconds:.2f}s "
+            f"({stats.rows_per_second:.0f} rows/s)"
+        )
+        return stats
 
-            if annotation_count > 0:
-                logger.debug(
-                    f"Stored {annotation_count} new annotations for tier: {tier_data['tier_name']}"
+    async def store_elan_file_data(
+        self,
+        file_info: dict,
+        user_id: int,
+        project_ids: list[int],
+        ingested: dict[str, tuple[int, str | None]] | None = None,
+    ) -> int:
+        """Store parsed ELAN file data in the database and sync associations.
+
+        If file_info carries a "blob_sha", it is recorded on the ELAN_FILE row so
+        later syncs can skip the file while its git content is unchanged. A file
+        of one of the given projects whose recorded blob id differs is
+        re-ingested in place, writing only the annotations that changed. A file
+        of the same name held only by other projects is never overwritten.
+
+        Args:
+            file_info: Parsed file, with the ParsedEaf under "eaf".
+            user_id: Owner recorded on a newly created ELAN_FILE row.
+            project_ids: Projects the file belongs to.
+            ingested: Filename to (elan_id, blob_sha) of the files of these
+                projects, as returned by get_ingest_state_for_project. Loaded
+                here when not given.
+
+        Raises:
+            ValueError: If another project holds a file of the same name with
+                different content.
+
+        """
+        filename = file_info["filename"]
+        logger.info(f"Storing ELAN file data: {filename}")
+        blob_sha = file_info.get("blob_sha")
+
+        if ingested is None:
+            ingested = {}
+            for project_id in project_ids:
+                ingested.update(
+                    await elan_file.get_ingest_state_for_project(self.db, project_id)
                 )
 
-    async def _get_or_create_tier(self, tier_data: Dict, elan_id: int) -> Tier:
-        """Get existing tier or create new one using CRUD."""
-        tier_obj = await tier.get_tier_by_id(self.db, tier_data["tier_id"])
+        project_file = ingested.get(filename)
+        if project_file is not None:
+            elan_id, ingested_sha = project_file
+            if blob_sha and ingested_sha != blob_sha:
+                await self.reingest_elan_file_data(elan_id, file_info)
+            else:
+                logger.info(f"File {filename} already exists. Skipping.")
+            await elan_file.sync_elan_file_to_projects(self.db, elan_id, project_ids)
+            return elan_id
+
+        existing_file = await elan_file.get_elan_file_by_filename(self.db, filename)
+        if existing_file:
+            if blob_sha and existing_file.blob_sha not in (None, blob_sha):
+                raise ValueError(
+                    f"File {filename} already belongs to another project with "
+                    "different content"
+                )
+            logger.info(f"File {filename} already exists. Skipping.")
+            # Same content, or unknown: share the stored file with these projects
+            await elan_file.sync_elan_file_to_projects(
+                self.db, existing_file.elan_id, project_ids
+            )
+            return existing_file.elan_id
 
-        if not tier_obj:
-            tier_obj = await tier.create_tier_in_db(
+        try:
+            # File row, tiers and annotations are written in one transaction
+            elan_file_obj = await elan_file.create_elan_file_in_db(
                 db=self.db,
-                tier_id=tier_data["tier_id"],
-                tier_name=tier_data["tier_name"],
-                elan_id=elan_id,
-                parent_tier_id=tier_data.get("parent_tier_id"),
-            )
-            logger.debug(
-                f"Created new tier: {tier_data['tier_name']} (ID: {tier_data['tier_id']})"
+                filename=file_info["filename"],
+                file_path=file_info["file_path"],
+                file_size=file_info["file_size"],
+                user_id=user_id,
+                blob_sha=blob_sha,
+                commit=False,
             )
-        else:
-            logger.debug(
-                f"Using existing tier: {tier_data['tier_name']} (ID: {tier_data['tier_id']})"
-            )
-
-        return tier_obj
-
-    async def store_elan_file_data(
-        self, file_info: dict, user_id: int, project_ids: list[int]
-    ) -> int:
-        """Store parsed ELAN file data in the database and sync associations."""
-        logger.info(f"Storing ELAN file data: {file_info['filename']}")
 
-        # Check if file already exists using CRUD
-        if await elan_file.check_elan_file_exists_by_filename(
-            self.db, file_info["filename"]
-        ):
-            existing_file = await elan_file.get_elan_file_by_filename(
-                self.db, file_info["filename"]
+            await self._store_tiers_and_annotations(
+                file_info["eaf"], elan_file_obj.elan_id
             )
-            if existing_file:
-                logger.info(f"File {file_info['filename']} already exists. Skipping.")
-                # Always sync associations even if file exists
-                await elan_file.sync_elan_file_to_projects(
-                    self.db, existing_file.elan_id, project_ids
-                )
-                return existing_file.elan_id
-
-        # Create ELAN file record using CRUD
-        elan_file_obj = await elan_file.create_elan_file_in_db(
-            db=self.db,
-            filename=file_info["filename"],
-            file_path=file_info["file_path"],
-            file_size=file_info["file_size"],
-            user_id=user_id,
-        )
-
-        # Store tiers and annotations using CRUD
-        await self._store_tiers_and_annotations(
-            file_info["tiers"], elan_file_obj.elan_id
-        )
 
-        # Sync ELAN_FILE_TO_TIER associations
-        tier_ids = [tier["tier_id"] for tier in file_info["tiers"]]
-        await elan_file.sync_elan_file_to_tiers(
-            self.db, elan_file_obj.elan_id, tier_ids
-        )
+            # Sync ELAN_FILE_TO_TIER associations, committing the file transaction
+            max_durations = self._tier_max_durations(file_info["eaf"])
+            await elan_file.sync_elan_file_to_tiers(
+                self.db, elan_file_obj.elan_id, list(max_durations), max_durations
+            )
+        except Exception:
+            await self.db.rollback()
+            raise
 
         # Always sync ELAN_FILE_TO_PROJECT associations
         await elan_file.sync_elan_file_to_projects(
@@ -229,6 +311,114 @@ class ElanService:
         )
         return elan_file_obj.elan_id
 
+    async def reingest_elan_file_data(
+        self, elan_id: int, file_info: dict
+    ) -> ReingestStats:
+        """Bring the stored annotations of a file in line with a new parse.
+
+        The new parse is diffed against the stored rows by annotation id. Only
+        new and changed annotations are upserted and only vanished ones are
+        deleted, all in one transaction together with the ELAN_FILE row and
+        its tier associations. The old values of relabelled and deleted
+        annotations are recorded as orphan candidates for the value sweeper.
+
+        Args:
+            elan_id: ID of the stored ELAN file.
+            file_info: Parsed file, with the ParsedEaf under "eaf".
+
+        Returns:
+            Row counts of the applied delta.
+
+        """
+        eaf: ParsedEaf = file_info["eaf"]
+        started = time.perf_counter()
+        try:
+            stored = await annotation.get_annotation_state_for_file(self.db, elan_id)
+
+            inserted = 0
+            changed_rows = []
+            relabelled = []
+            for parsed_tier in eaf.tiers:
+                for i in range(parsed_tier.start, parsed_tier.stop):
+                    current = stored.pop(eaf.annotation_ids[i], None)
+                    new = (
+                        eaf.values[i],
+                        eaf.start_ms[i],
+                        eaf.end_ms[i],
+                        parsed_tier.tier_id,
+                    )
+                    if current != new:
+                        changed_rows.append(i)
+                        inserted += current is None
+                        if current is not None and current[0] != new[0]:
+                            relabelled.append(eaf.annotation_ids[i])
+
+            # Whatever is left in stored no longer exists in the file
+            await annotation.mark_annotation_values_of(
+                self.db,
+                elan_id,
+                relabelled + list(stored),
+                chunk_size=ELAN_INGEST_CHUNK_SIZE,
+            )
+            await tier.bulk_get_or_create_tiers(
+                self.db, eaf.tiers, elan_id, chunk_size=ELAN_INGEST_CHUNK_SIZE
+            )
+            value_map = await annotation_value.bulk_get_or_create_annotation_values(
+                self.db,
+                (eaf.values[i] for i in changed_rows),
+                chunk_size=ELAN_INGEST_CHUNK_SIZE,
+            )
+            await annotation.bulk_upsert_annotations(
+                self.db,
+                eaf,
+                elan_id,
+                value_map,
+                chunk_size=ELAN_INGEST_CHUNK_SIZE,
+                rows=changed_rows,
+            )
+            deleted = await annotation.delete_annotations_by_ids(
+                self.db, elan_id, list(stored), chunk_size=ELAN_INGEST_CHUNK_SIZE
+            )
+            await elan_file.update_elan_file_content(
+                self.db,
+                elan_id,
+                file_path=file_info["file_path"],
+                file_size=file_info["file_size"],
+                blob_sha=file_info.get("blob_sha"),
+            )
+
+            # Sync ELAN_FILE_TO_TIER associations, committing the file transaction
+            max_durations = self._tier_max_durations(eaf)
+            await elan_file.sync_elan_file_to_tiers(
+                self.db, elan_id, list(max_durations), max_durations
+            )
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        stats = ReingestStats(
+            inserted=inserted,
+            updated=len(changed_rows) - inserted,
+            deleted=deleted,
+            unchanged=eaf.annotation_count - len(changed_rows),
+            seconds=time.perf_counter() - started,
+        )
+        logger.info(
+            f"Re-ingested {file_info['filename']} (ID: {elan_id}): "
+            f"{stats.inserted} inserted, {stats.updated} updated, "
+            f"{stats.deleted} deleted, {stats.unchanged} unchanged annotations "
+            f"in {stats.seconds:.2f}s"
+        )
+        return stats
+
+    @staticmethod
+    def _tier_max_durations(eaf: ParsedEaf) -> dict[str, Decimal]:
+        """Map each tier id to the length of its longest annotation, in seconds."""
+        return {
+            parsed_tier.tier_id: Decimal(eaf.max_duration_ms(parsed_tier)) / 1000
+            for parsed_tier in eaf.tiers
+        }
+
     async def process_single_file(
         self, file_path: str, user_id: int, project_name: str
     ) -> int:
@@ -249,31 +439,25 @@ class ElanService:
     async def process_directory(
         self, directory_path: str, user_id: int, project_name: str
     ) -> dict[str, int | None]:
-        """Process all ELAN files in a directory for the given project."""
+        """Process all ELAN files in a directory for the given project.
+
+        Files are parsed in the shared process pool and stored in order by a
+        single writer on this service's session.
+        """
+        from app.service.elan_pipeline import ElanParsePipeline
+
         logger.info(f"Starting directory processing: {directory_path}")
         eaf_files = self.get_files_in_directory(directory_path)
 
         logger.info(f"Found {len(eaf_files)} ELAN files in {directory_path}")
 
-        results = {}
-        processed_count = 0
-        failed_count = 0
-
-        for eaf_file in eaf_files:
-            try:
-                logger.info(f"Processing: {eaf_file.name}")
-                elan_id = await self.process_single_file(
-                    str(eaf_file), user_id, project_name
-                )
-                results[eaf_file.name] = elan_id
-                processed_count += 1
-            except Exception as e:
-                logger.error(f"Failed to process {eaf_file.name}: {e}")
-                results[eaf_file.name] = None
-                failed_count += 1
+        results = await ElanParsePipeline(self.db).store_files(
+            eaf_files, user_id, project_name
+        )
 
+        failed_count = sum(1 for elan_id in results.values() if elan_id is None)
         logger.info(
-            f"Directory processing completed. Processed: {processed_count}, Failed: {failed_count}"
+            f"Directory processing completed. Processed: {len(results) - failed_count}, Failed: {failed_count}"
         )
         return results
 
@@ -299,64 +483,98 @@ class ElanService:
         # Return all tiers for all files (you might want to refine this logic)
         return {f.filename: tier_names for f in files}
 
-    async def get_file_structure(self, filename: str) -> dict | None:
-        """Get complete structure for a specific file."""
+    async def get_file_structure(
+        self, filename: str, tier_ids: Collection[str] | None = None
+    ) -> dict | None:
+        """Get complete structure for a specific file, looked up by name."""
         logger.debug(f"Retrieving file structure for: {filename}")
 
-        # Get file using CRUD
         elan_file_obj = await elan_file.get_elan_file_by_filename(self.db, filename)
-
         if not elan_file_obj:
             logger.warning(f"File not found in database: {filename}")
             return None
+        return await self._build_file_structure(elan_file_obj, tier_ids)
 
-        # Get all tiers with annotations
-        tiers_with_annotations = await self._get_tiers_with_annotations()
-
-        file_structure = {
-            "elan_id": elan_file_obj.elan_id,
-            "filename": elan_file_obj.filename,
-            "file_path": elan_file_obj.file_path,
-            "file_size": elan_file_obj.file_size,
-            "tiers": [],
+    async def get_file_structure_by_id(
+        self, elan_id: int, tier_ids: Collection[str] | None = None
+    ) -> dict | None:
+        """Get complete structure for a specific file, looked up by ID."""
+        elan_file_obj = await elan_file.get_elan_file_by_id(self.db, elan_id)
+        if not elan_file_obj:
+            logger.warning(f"File not found in database: ID {elan_id}")
+            return None
+        return await self._build_file_structure(elan_file_obj, tier_ids)
+
+    async def _build_file_structure(
+        self, elan_file_obj: ElanFile, tier_ids: Collection[str] | None
+    ) -> dict:
+        """Load the tiers and annotations of a file in two queries.
+
+        Annotation rows come ordered by tier, so they are grouped under their
+        tier in a single pass.
+
+        Args:
+            elan_file_obj: The stored ELAN file.
+            tier_ids: Only include these tiers. Defaults to all tiers of the file.
+
+        Returns:
+            The file with its tiers, each holding its annotations by time.
+
+        """
+        elan_id = elan_file_obj.elan_id
+        tiers: dict[str, dict] = {
+            tier_id: {
+                "tier_id": tier_id,
+                "tier_name": tier_name,
+                "parent_tier_id": parent_tier_id,
+                "annotation_count": 0,
+                "annotations": [],
+            }
+            for tier_id, tier_name, parent_tier_id in await tier.get_tier_rows_for_file(
+                self.db, elan_id, tier_ids
+            )
         }
 
-        total_annotations = 0
-        for tier_obj in tiers_with_annotations:
-            # Get annotations using CRUD
-            annotations_list = await annotation.get_annotations_by_tier(
-                self.db, tier_obj.tier_id
+        rows = await annotation.get_annotation_rows_for_file(self.db, elan_id, tier_ids)
+        current_id = None
+        current: list[dict] = []
+        for tier_id, annotation_id, value, start_time, end_time in rows:
+            if tier_id != current_id:
+                current_id = tier_id
+                tier_data = tiers.get(tier_id)
+                if tier_data is None:
+                    # Annotation on a tier shared with another file
+                    tier_data = tiers[tier_id] = {
+                        "tier_id": tier_id,
+                        "tier_name": tier_id,
+                        "parent_tier_id": None,
+                        "annotation_count": 0,
+                        "annotations": [],
+                    }
+                current = tier_data["annotations"]
+            current.append(
+                {
+                    "annotation_id": annotation_id,
+                    "annotation_value": value,
+                    "start_time": float(start_time),
+                    "end_time": float(end_time),
+                }
             )
 
-            tier_data = {
-                "tier_id": tier_obj.tier_id,
-                "tier_name": tier_obj.tier_name,
-                "parent_tier_id": tier_obj.parent_tier_id,
-                "annotation_count": len(annotations_list),
-                "annotations": [
-                    {
-                        "annotation_id": ann.annotation_id,
-                        "annotation_value": ann.annotation_value,
-                        "start_time": float(ann.start_time),
-                        "end_time": float(ann.end_time),
-                    }
-                    for ann in annotations_list
-                ],
-            }
-            file_structure["tiers"].append(tier_data)
-            total_annotations += len(annotations_list)
+        for tier_data in tiers.values():
+            tier_data["annotation_count"] = len(tier_data["annotations"])
 
         logger.debug(
-            f"Retrieved structure for {filename}: {len(file_structure['tiers'])} tiers, {total_annotations} annotations"
+            f"Retrieved structure for {elan_file_obj.filename}: {len(tiers)} tiers, "
+            f"{len(rows)} annotations"
         )
-        return file_structure
-
-    async def _get_tiers_with_annotations(self) -> list[Tier]:
-        """Get all tiers that have at least one annotation."""
-        result = await self.db.execute(select(Tier).join(Annotation).distinct())
-        tiers = list(result.scalars().all())
-        logger.debug(f"Found {len(tiers)} tiers with annotations")
-        return tiers
+        return {
+            "elan_id": elan_id,
+            "filename": elan_file_obj.filename,
+            "file_path": elan_file_obj.file_path,
+            "file_size": elan_file_obj.file_size,
+            "tiers": list(tiers.values()),
+        }
 
     async def get_tier_statistics(self) -> dict:
         """Get statistics about tiers across all files."""
@@ -403,6 +621,41 @@ class ElanService:
             for f in files
         ]
 
+    async def get_user_files_page(
+        self, user_id: int, limit: int = API_PAGE_SIZE, cursor: str | None = None
+    ) -> dict:
+        """Get one page of a user's ELAN files, ordered by ID.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+
+        """
+        after_id = None
+        if cursor is not None:
+            (after_id,) = CursorUtils.decode(cursor, 1)
+            if not isinstance(after_id, int):
+                raise ValueError("Invalid pagination cursor")
+
+        files = await elan_file.get_elan_files_page_by_user(
+            self.db, user_id, limit + 1, after_id
+        )
+        next_cursor = None
+        if len(files) > limit:
+            files = files[:limit]
+            next_cursor = CursorUtils.encode(files[-1].elan_id)
+        return {
+            "files": [
+                {
+                    "elan_id": f.elan_id,
+                    "filename": f.filename,
+                    "file_path": f.file_path,
+                    "file_size": f.file_size,
+                }
+                for f in files
+            ],
+            "next_cursor": next_cursor,
+        }
+
     async def delete_file(self, elan_id: int) -> bool:
         """Delete an ELAN file."""
         logger.info(f"Deleting ELAN file with ID: {elan_id}")
@@ -442,6 +695,113 @@ class ElanService:
             for ann in annotations_list
         ]
 
+    async def get_annotations_in_interval(
+        self,
+        elan_id: int,
+        start_time: Decimal,
+        end_time: Decimal,
+        relation: annotation.IntervalRelation = "overlaps",
+        tier_ids: Collection[str] | None = None,
+    ) -> list[dict]:
+        """Get annotations of a file relative to a time interval.
+
+        Args:
+            elan_id: ID of the ELAN file.
+            start_time: Interval start, in seconds.
+            end_time: Interval end, in seconds. Equal to start_time for a
+                point lookup with relation "contains".
+            relation: "overlaps", "within" or "contains".
+            tier_ids: Only search these tiers. Defaults to all tiers of the file.
+
+        Returns:
+            Annotations with their tier, ordered by tier, then time.
+
+        Raises:
+            ValueError: If the interval ends before it starts.
+
+        """
+        if end_time < start_time:
+            raise ValueError("end_time must not be before start_time")
+
+        max_durations = await elan_file.get_tier_max_durations(
+            self.db, elan_id, tier_ids
+        )
+        rows = await annotation.get_annotation_rows_in_interval(
+            self.db, elan_id, max_durations, start_time, end_time, relation
+        )
+        return [self._annotation_row_to_dict(row) for row in rows]
+
+    async def get_annotation_page(
+        self,
+        elan_id: int,
+        limit: int = API_PAGE_SIZE,
+        cursor: str | None = None,
+        tier_ids: Collection[str] | None = None,
+    ) -> dict:
+        """Get one page of the annotations of a file, ordered by time.
+
+        Args:
+            elan_id: ID of the ELAN file.
+            limit: Maximum number of annotations in the page.
+            cursor: next_cursor of the previous page, None for the first one.
+            tier_ids: Only include these tiers. Defaults to all tiers of the file.
+
+        Returns:
+            The annotations and the cursor of the next page, None on the last one.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+
+        """
+        after = None
+        if cursor is not None:
+            start_time, annotation_id = CursorUtils.decode(cursor, 2)
+            try:
+                after = (Decimal(start_time), str(annotation_id))
+            except (InvalidOperation, TypeError) as e:
+                raise ValueError("Invalid pagination cursor") from e
+
+        # One extra row tells whether another page follows
+        rows = await annotation.get_annotation_page(
+            self.db, elan_id, limit + 1, after, tier_ids
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = CursorUtils.encode(
+                str(rows[-1].start_time), rows[-1].annotation_id
+            )
+        return {
+            "annotations": [self._annotation_row_to_dict(row) for row in rows],
+            "next_cursor": next_cursor,
+        }
+
+    async def stream_annotations_ndjson(
+        self, elan_id: int, tier_ids: Collection[str] | None = None
+    ) -> AsyncIterator[bytes]:
+        """Yield the annotations of a file as NDJSON, one batch of lines at a time.
+
+        Rows are read through a server-side cursor in the order of
+        get_annotation_page, so memory use does not grow with the file.
+        """
+        async for rows in annotation.stream_annotation_rows(
+            self.db, elan_id, API_STREAM_BATCH_SIZE, tier_ids
+        ):
+            yield "".join(
+                json.dumps(self._annotation_row_to_dict(row)) + "\n" for row in rows
+            ).encode("utf-8")
+
+    @staticmethod
+    def _annotation_row_to_dict(row: Row) -> dict:
+        tier_id, annotation_id, value, start_time, end_time = row
+        return {
+            "tier_id": tier_id,
+            "annotation_id": annotation_id,
+            "annotation_value": value,
+            "start_time": float(start_time),
+            "end_time": float(end_time),
+        }
+
     async def delete_tier_annotations(self, tier_id: str) -> int:
         """Delete all annotations for a specific tier."""
         logger.info(f"Deleting all annotations for tier ID: {tier_id}")
@@ -0,0 +1,214 @@
+"""ELAN parse pipeline - process-pool parsing with a single ordered DB writer."""
+
+import asyncio
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import AsyncIterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.centralized_logging import get_logger
+from app.core.config import ELAN_PARSE_WORKERS
+from app.crud import elan_file
+from app.crud.project import get_project_by_name
+from app.service.elan import ElanService
+
+logger = get_logger()
+
+# Process-wide pool, created lazily and shut down with the application
+_executor: ProcessPoolExecutor | None = None
+
+ParseResult = tuple[Path, dict | None, Exception | None]
+
+
+def get_parse_worker_count() -> int:
+    """Return the configured number of parse worker processes."""
+    return ELAN_PARSE_WORKERS if ELAN_PARSE_WORKERS > 0 else os.cpu_count() or 1
+
+
+def get_parse_executor() -> ProcessPoolExecutor:
+    """Return the shared parse process pool, creating it on first use."""
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        workers = get_parse_worker_count()
+        # spawn avoids forking a process that already runs an event loop and threads
+        _executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info(f"Started ELAN parse pool with {workers} worker processes")
+    return _executor
+
+
+def shutdown_parse_executor() -> None:
+    """Shut down the shared parse process pool if it was started."""
+    global _executor  # noqa: PLW0603
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+        logger.info("ELAN parse pool shut down")
+
+
+class ElanParsePipeline:
+    """Parse ELAN files in worker processes and store them from one coroutine.
+
+    Parsing runs ahead in the process pool while results are handed back in
+    input order, so database writes stay sequential on the caller's session.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        executor: ProcessPoolExecutor | None = None,
+        max_in_flight: int | None = None,
+    ):
+        """Initialize with a DB session and an optional dedicated executor.
+
+        Args:
+            db: Session used by the single writer coroutine.
+            executor: Process pool to parse in. Defaults to the shared pool.
+            max_in_flight: Maximum number of parsed-but-unstored files kept in
+                memory. Defaults to twice the worker count.
+
+        """
+        self.db = db
+        self.executor = executor or get_parse_executor()
+        self.max_in_flight = max_in_flight or 2 * get_parse_worker_count()
+
+    async def parse_files(
+        self,
+        file_paths: Sequence[Path],
+        preparsed: dict[Path, dict] | None = None,
+    ) -> AsyncIterator[ParseResult]:
+        """Yield (path, file_info, error) tuples in input order.
+
+        Files found in preparsed are yielded as is instead of being parsed.
+        """
+        loop = asyncio.get_running_loop()
+        pending: deque[tuple[Path, asyncio.Future]] = deque()
+        preparsed = preparsed or {}
+
+        try:
+            for file_path in file_paths:
+                if file_path in preparsed:
+                    future = loop.create_future()
+                    future.set_result(preparsed[file_path])
+                else:
+                    future = loop.run_in_executor(
+                        self.executor, ElanService.parse_elan_file, str(file_path)
+                    )
+                pending.append((file_path, future))
+                if len(pending) >= self.max_in_flight:
+                    yield await self._next_result(pending)
+
+            while pending:
+                yield await self._next_result(pending)
+        finally:
+            # Consumer stopped early: do not leave parses queued in the pool
+            for _, future in pending:
+                future.cancel()
+
+    @staticmethod
+    async def _next_result(
+        pending: deque[tuple[Path, asyncio.Future]],
+    ) -> ParseResult:
+        """Wait for the oldest submitted parse and wrap its outcome."""
+        file_path, future = pending.popleft()
+        try:
+            return file_path, await future, None
+        except Exception as e:  # noqa: BLE001 - any parse failure only fails its file
+            return file_path, None, e
+
+    async def store_files(
+        self,
+        file_paths: Sequence[Path],
+        user_id: int,
+        project_name: str,
+        blob_shas: dict[Path, str] | None = None,
+        parsed: dict[str, dict] | None = None,
+    ) -> dict[str, int | None]:
+        """Parse files in parallel and store them in order for the given project.
+
+        Args:
+            file_paths: ELAN files to ingest.
+            user_id: Owner recorded on newly created ELAN_FILE rows.
+            project_name: Project the files belong to.
+            blob_shas: Optional git blob id per file path. Files whose blob id
+                matches the one last ingested for this project are skipped
+                without being parsed.
+            parsed: Optional content already parsed during upload validation,
+                keyed by git blob id. Files whose blob id is found here are
+                stored without being parsed again.
+
+        Returns:
+            Mapping of filename to elan_id, or None if the file failed.
+
+        """
+        project = await get_project_by_name(self.db, project_name)
+        if not project:
+            raise ValueError(f"Project '{project_name}' not found")
+        project_ids = [project.project_id]
+
+        results: dict[str, int | None] = {}
+        blob_shas = blob_shas or {}
+        to_parse = list(file_paths)
+        ingested = await elan_file.get_ingest_state_for_project(
+            self.db, project.project_id
+        )
+        if blob_shas:
+            to_parse = []
+            for file_path in file_paths:
+                elan_id, ingested_sha = ingested.get(file_path.name, (None, None))
+                if elan_id is not None and ingested_sha == blob_shas.get(file_path):
+                    results[file_path.name] = elan_id
+                else:
+                    to_parse.append(file_path)
+
+        # Blob ids are content hashes: identical files share one parse result
+        preparsed = {}
+        for file_path in to_parse:
+            blob_sha = blob_shas.get(file_path)
+            content = (parsed or {}).get(blob_sha) if blob_sha is not None else None
+            if content is not None:
+                preparsed[file_path] = {
+                    "filename": file_path.name,
+                    "file_path": str(file_path.absolute()),
+                    **content,
+                }
+
+        logger.info(
+            f"Parsing {len(to_parse) - len(preparsed)} ELAN files for project "
+            f"'{project_name}' with {get_parse_worker_count()} workers "
+            f"({len(results)} unchanged files skipped, "
+            f"{len(preparsed)} reused from upload validation)"
+        )
+
+        elan_service = ElanService(self.db)
+        failed_count = 0
+
+        async for file_path, file_info, parse_error in self.parse_files(
+            to_parse, preparsed
+        ):
+            failure: Exception | None = parse_error
+            if file_info is not None:
+                file_info["blob_sha"] = blob_shas.get(file_path)
+                try:
+                    results[file_path.name] = await elan_service.store_elan_file_data(
+                        file_info, user_id, project_ids, ingested
+                    )
+                    continue
+                except (SQLAlchemyError, ValueError) as e:
+                    await self.db.rollback()
+                    failure = e
+
+            logger.error(f"Failed to process {file_path.name}: {failure}")
+            results[file_path.name] = None
+            failed_count += 1
+
+        logger.info(
+            f"Parse pipeline completed. Processed: {len(results) - failed_count}, Failed: {failed_count}"
+        )
+        return results
@@ -15,10 +15,13 @@ from sqlalchemy.future import select
 from app.crud.project import (
     create_project_db,
     delete_project_db,
+    hide_project,
     list_projects_by_instance,
     project_exists_by_name,
 )
-from app.service.elan import ElanService
+from app.service.elan_pipeline import ElanParsePipeline
+from app.service.git_blob_reader import close_blob_reader
+from app.service.project_deletion import ProjectDeletionJob, project_deletions
 from app.service.git_diff_parser import GitDiffParser
 from app.service.git_operations import (
     FileUploadProcessor,
@@ -28,6 +31,7 @@ from app.service.git_operations import (
     GitMerger,
     delete_project_folder,
 )
+from app.service.project_scheduler import project_operation, project_scheduler
 
 logger = get_logger()
 
@@ -48,14 +52,16 @@ class GitService:
             self.base_path = elanora_root / ELAN_PROJECTS_BASE_PATH
         else:
             self.base_path = Path(base_path)
+        # project name -> (master commit id, file tree listed from that commit)
+        self._file_tree_cache: dict[str, tuple[str, dict | None]] = {}
 
         self.base_path.mkdir(parents=True, exist_ok=True)
 
-    def check_git_availability(self) -> dict[str, Any]:
+    async def check_git_availability(self) -> dict[str, Any]:
         """Check if Git is available on the system."""
         try:
             runner = GitCommandRunner(self.base_path)
-            result = runner.run(["--version"])
+            result = await runner.run(["--version"])
             return {
                 "git_available": result.returncode == 0,
                 "version": result.stdout.strip() if result.returncode == 0 else None,
@@ -69,6 +75,7 @@ class GitService:
                 "error": "Git not installed",
             }
 
+    @project_operation("create_project")
     async def create_project(
         self,
         project_name: str,
@@ -100,7 +107,7 @@ class GitService:
             runner = GitCommandRunner(project_path)
 
             # Initialize Git repository
-            runner.init_repo()
+            await runner.init_repo()
 
             # Create project structure
             (project_path / "elan_files").mkdir(exist_ok=True)
@@ -118,8 +125,8 @@ class GitService:
                 f.write(readme_content)
 
             # Initial commit
-            runner.add_all()
-            runner.commit("Initial project setup")
+            await runner.add_all()
+            await runner.commit("Initial project setup")
 
             # Paths
             central_githooks = project_path.parent / ".githooks"
@@ -165,7 +172,8 @@ class GitService:
         except Exception as e:
             raise RuntimeError(f"Project creation failed: {e}") from e
 
-    def get_project_status(self, project_name: str) -> dict[str, Any]:
+    @project_operation("status")
+    async def get_project_status(self, project_name: str) -> dict[str, Any]:
         """Get Git status of a project."""
         project_path = self.base_path / project_name
 
@@ -176,13 +184,13 @@ class GitService:
             runner = GitCommandRunner(project_path)
 
             # Get Git status
-            files = self._parse_git_status(runner.get_status())
+            files = self._parse_git_status(await runner.get_status())
 
             # Get recent commits
-            commits = self._get_recent_commits(project_path)
+            commits = await self._get_recent_commits(project_path)
 
             # Check for conflicts
-            conflicts = self._check_for_conflicts(project_path)
+            conflicts = await self._check_for_conflicts(project_path)
 
             return {
                 "project_name": project_name,
@@ -196,7 +204,8 @@ class GitService:
             raise RuntimeError(f"Git status check failed: {e}") from e
 
     # TODO: error 500 when commiting file that is already in folder projects
-    def commit_changes(
+    @project_operation("commit")
+    async def commit_changes(
         self, project_name: str, commit_message: str, user_name: str = "user"
     ) -> dict[str, Any]:
         """Commit changes to a project."""
@@ -209,18 +218,18 @@ class GitService:
             runner = GitCommandRunner(project_path)
 
             # Check if there are changes to commit
-            if not runner.get_status().strip():
+            if not (await runner.get_status()).strip():
                 raise ValueError("No changes to commit")
 
             # Add all changes
-            runner.add_all()
+            await runner.add_all()
 
             # Commit with user info
             full_message = f"{commit_message}\n\nCommitted by: {user_name}"
-            runner.commit(full_message)
+            await runner.commit(full_message)
 
             # Get commit hash
-            commit_hash = runner.get_commit_hash()
+            commit_hash = await runner.get_commit_hash()
 
             return {
                 "project_name": project_name,
@@ -233,6 +242,7 @@ class GitService:
         except Exception as e:
             raise RuntimeError(f"Commit failed: {e}") from e
 
+    @project_operation("upload")
     async def add_elan_files(
         self,
         project_name: str,
@@ -249,8 +259,8 @@ class GitService:
 
         try:
             # Setup Git environment
-            self._configure_git_user(project_path, user_name)
-            existing_files = self._get_existing_files(project_path, files)
+            await self._configure_git_user(project_path, user_name)
+            existing_files = await self._get_existing_files(project_path, files)
 
             # Initialize managers
             branch_manager = GitBranchManager(project_path)
@@ -259,7 +269,9 @@ class GitService:
             merger = GitMerger(project_path)
 
             # Create branch and process files
-            branch_name = branch_manager.create_upload_branch(user_name, len(files))
+            branch_name = await branch_manager.create_upload_branch(
+                user_name, len(files)
+            )
             uploaded_files, failed_files = await file_processor.process_files(
                 files, existing_files
             )
@@ -268,7 +280,7 @@ class GitService:
                 raise RuntimeError("No files were successfully uploaded")
 
             # Commit and attempt merge
-            file_processor.commit_files(uploaded_files, user_name)
+            await file_processor.commit_files(uploaded_files, user_name)
             merge_result = await self._attempt_merge(
                 branch_manager,
                 diff_analyzer,
@@ -278,6 +290,11 @@ class GitService:
                 user_id=user_id,
                 project_path=project_path,
                 project_name=project_name,
+                parsed={
+                    result.blob_sha: result.parsed
+                    for result in uploaded_files
+                    if result.parsed is not None and result.blob_sha is not None
+                },
             )
 
             # Build response
@@ -291,7 +308,7 @@ class GitService:
             )
 
         except subprocess.CalledProcessError as e:
-            self._cleanup_on_error(project_path)
+            await self._cleanup_on_error(project_path)
             raise RuntimeError(f"Failed to add ELAN files: {e}") from e
         except Exception as e:
             logger.error(f"Batch file operation failed: {e}")
@@ -301,6 +318,7 @@ class GitService:
         projects = await list_projects_by_instance(db, instance_id)
         return [p.project_name for p in projects]
 
+    @project_operation("init_from_folder")
     async def init_project_from_folder_upload(
         self,
         project_name: str,
@@ -329,9 +347,9 @@ class GitService:
 
         # Initialize git repo, commit, and register in DB (reuse your existing logic)
         runner = GitCommandRunner(project_path)
-        runner.init_repo()
-        runner.add_all()
-        runner.commit("Initial commit from uploaded folder")
+        await runner.init_repo()
+        await runner.add_all()
+        await runner.commit("Initial commit from uploaded folder")
 
         await create_project_db(
             db=db,
@@ -343,31 +361,63 @@ class GitService:
         )
 
         # Parse and store ELAN files in DB
-        elan_service = ElanService(db)
         elan_files = list(elan_files_dir.rglob("*.eaf"))
-        for elan_file in elan_files:
-            await elan_service.process_single_file(
-                str(elan_file), user_id, project_name
-            )
+        failed_db_files = self._failed_filenames(
+            await ElanParsePipeline(db).store_files(elan_files, user_id, project_name)
+        )
 
         return {
             "project_name": project_name,
             "path": str(project_path),
-            "status": "initialized",
+            "status": "initialized_with_failures" if failed_db_files else "initialized",
             "git_initialized": True,
             "created_at": datetime.now().isoformat(),
+            "failed_db_files": failed_db_files,
         }
 
     async def _sync_elan_files_with_db(
-        self, project_path: Path, db: AsyncSession, user_id: int, project_name: str
-    ):
-        """Parse all .eaf files in the project and update the database."""
-        elan_service = ElanService(db)
+        self,
+        project_path: Path,
+        db: AsyncSession,
+        user_id: int,
+        project_name: str,
+        parsed: dict[str, dict] | None = None,
+    ) -> list[str]:
+        """Parse changed .eaf files in the project and update the database.
+
+        Args:
+            project_path: Project working tree.
+            db: Database session.
+            user_id: Owner recorded on new ELAN_FILE rows.
+            project_name: Project the files belong to.
+            parsed: Content parsed while validating uploads, keyed by blob id.
+
+        Returns:
+            Names of the files that could not be parsed or stored.
+
+        """
         elan_files = [f for f in (project_path / "elan_files").glob("*.eaf")]
-        for elan_file in elan_files:
-            await elan_service.process_single_file(
-                str(elan_file), user_id, project_name
-            )
+        results = await ElanParsePipeline(db).store_files(
+            elan_files,
+            user_id,
+            project_name,
+            blob_shas=await self._get_elan_blob_shas(project_path),
+            parsed=parsed,
+        )
+        return self._failed_filenames(results)
+
+    @staticmethod
+    def _failed_filenames(results: dict[str, int | None]) -> list[str]:
+        """Return the files ElanParsePipeline.store_files could not store."""
+        return sorted(name for name, elan_id in results.items() if elan_id is None)
+
+    async def _get_elan_blob_shas(self, project_path: Path) -> dict[Path, str]:
+        """Return the git blob id of every tracked .eaf file, keyed by disk path."""
+        runner = GitCommandRunner(project_path)
+        return {
+            project_path / path: blob_sha
+            for path, blob_sha in (await runner.get_blob_shas("elan_files/")).items()
+        }
 
     def _validate_upload_request(
         self, project_path: Path, files: list[UploadFile]
@@ -381,7 +431,7 @@ class GitService:
             if not file.filename:
                 raise ValueError("All files must have filenames")
 
-    def _get_existing_files(
+    async def _get_existing_files(
         self, project_path: Path, files: list[UploadFile]
     ) -> list[str]:
         """Get list of files that already exist in Git repository."""
@@ -390,7 +440,7 @@ class GitService:
 
         # Get files tracked by Git
         try:
-            tracked_result = runner.run(["ls-files", "elan_files/"])
+            tracked_result = await runner.run(["ls-files", "elan_files/"])
             tracked_files = set(tracked_result.stdout.strip().splitlines())
             logger.debug(f"Git tracked files: {tracked_files}")
         except Exception:
@@ -419,6 +469,7 @@ class GitService:
         user_id: int,
         project_path: Path,
         project_name: str,
+        parsed: dict[str, dict] | None = None,
     ) -> dict[str, Any]:
         logger.info(f"Attempting to merge branch '{branch_name}' to master branch")
         """Attempt to merge the upload branch with selective merge strategy."""
@@ -426,11 +477,13 @@ class GitService:
             f"Attempting selective merge of branch '{branch_name}' to main branch"
         )
         diff_parser = GitDiffParser()
-        branch_manager.switch_to_master()
-        analysis = diff_analyzer.analyze_merge_differences(branch_name, diff_parser)
+        await branch_manager.switch_to_master()
+        analysis = await diff_analyzer.analyze_merge_differences(
+            branch_name, diff_parser
+        )
 
         # Use selective merge instead of auto_merge_if_safe
-        merge_result = merger.selective_merge_with_conflict_isolation(
+        merge_result = await merger.selective_merge_with_conflict_isolation(
             branch_name, analysis
         )
 
@@ -439,11 +492,11 @@ class GitService:
             "selective_merge_completed",
         ):
             # If merge was successful, delete the branch
-            branch_manager.delete_branch(branch_name)
+            await branch_manager.delete_branch(branch_name)
             # --- Sync DB with merged ELAN files ---
             if db and user_id and project_path:
-                await self._sync_elan_files_with_db(
-                    project_path, db, user_id, project_name
+                merge_result["failed_db_files"] = await self._sync_elan_files_with_db(
+                    project_path, db, user_id, project_name, parsed
                 )
 
         logger.info(f"Merge result: {merge_result['status']}")
@@ -469,6 +522,14 @@ class GitService:
         else:
             final_status = "uploaded_pending_review"
 
+        failed_db_files = merge_result.get("failed_db_files", [])
+        message = merge_result.get("message") or "Batch upload completed"
+        if failed_db_files:
+            message += (
+                f" {len(failed_db_files)} files failed to parse or store: "
+                f"{', '.join(failed_db_files)}."
+            )
+
         response = {
             "project_name": project_name,
             "branch_name": branch_name,
@@ -489,7 +550,8 @@ class GitService:
             "conflict_branch": merge_result.get("conflict_branch"),
             "status": final_status,
             "uploaded_at": datetime.now().isoformat(),
-            "message": merge_result.get("message", "Batch upload completed"),
+            "message": message,
+            "failed_db_files": failed_db_files,
         }
 
         return response
@@ -504,18 +566,14 @@ class GitService:
             }
         return result  # Already a dict
 
-    def _cleanup_on_error(self, project_path: Path) -> None:
+    async def _cleanup_on_error(self, project_path: Path) -> None:
         """Cleanup on error - try to return to master branch."""
         try:
-            subprocess.run(
-                ["git", "checkout", "master"],
-                cwd=project_path,
-                check=False,
-            )
+            await GitCommandRunner(project_path).checkout("master")
         except:
             pass
 
-    def get_branches(self, project_name: str) -> dict[str, Any]:
+    async def get_branches(self, project_name: str) -> dict[str, Any]:
         """Get all branches for a project."""
         project_path = self.base_path / project_name
 
@@ -524,7 +582,7 @@ class GitService:
 
         try:
             runner = GitCommandRunner(project_path)
-            branches_raw = runner.get_branches()
+            branches_raw = await runner.get_branches()
             branches = []
             current_branch = None
 
@@ -545,6 +603,7 @@ class GitService:
         except Exception as e:
             raise RuntimeError(f"Failed to get branches: {e}") from e
 
+    @project_operation("resolve_conflicts")
     async def resolve_conflicts(
         self,
         project_name: str,
@@ -561,7 +620,7 @@ class GitService:
 
         try:
             runner = GitCommandRunner(project_path)
-            result = runner.resolve_conflicts(branch_name, resolution_strategy)
+            result = await runner.resolve_conflicts(branch_name, resolution_strategy)
 
             # --- Sync DB with merged ELAN files ---
             await self._sync_elan_files_with_db(project_path, db, user_id, project_name)
@@ -575,20 +634,16 @@ class GitService:
         except Exception as e:
             raise RuntimeError(f"Failed to resolve conflicts: {e}") from e
 
-    def _configure_git_user(self, project_path: Path, instance_name: str) -> None:
+    async def _configure_git_user(self, project_path: Path, instance_name: str) -> None:
         runner = GitCommandRunner(project_path)
-        runner.configure_user(instance_name)
+        await runner.configure_user(instance_name)
 
-    def _detect_merge_conflicts(self, project_path: Path) -> list[dict[str, str]]:
+    async def _detect_merge_conflicts(self, project_path: Path) -> list[dict[str, str]]:
         """Detect and parse merge conflicts."""
         try:
             # Get files with conflicts
-            result = subprocess.run(
-                ["git", "diff", "--name-only", "--diff-filter=U"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                check=False,
+            result = await GitCommandRunner(project_path).run(
+                ["diff", "--name-only", "--diff-filter=U"]
             )
 
             conflicts = []
@@ -653,12 +708,12 @@ class GitService:
             files.append({"filename": filename, "status": status})
         return files
 
-    def _get_recent_commits(
+    async def _get_recent_commits(
         self, project_path: Path, count: int = 5
     ) -> list[dict[str, str]]:
         """Get recent commits for the project."""
         runner = GitCommandRunner(project_path)
-        result = runner.get_log(count)
+        result = await runner.get_log(count)
         commits = []
         for line in result.strip().splitlines():
             parts = line.split("|", 3)
@@ -673,18 +728,21 @@ class GitService:
                 )
         return commits
 
-    def _check_for_conflicts(self, project_path: Path) -> list[dict[str, str]]:
+    async def _check_for_conflicts(self, project_path: Path) -> list[dict[str, str]]:
         """Check for merge conflicts in the project."""
-        return self._detect_merge_conflicts(project_path)
+        return await self._detect_merge_conflicts(project_path)
 
-    def checkout_branch(self, project_name: str, branch_name: str) -> dict[str, str]:
+    @project_operation("checkout")
+    async def checkout_branch(
+        self, project_name: str, branch_name: str
+    ) -> dict[str, str]:
         """Switch to a different branch in the given project."""
         project_path = self.base_path / project_name
         if not project_path.exists():
             raise FileNotFoundError(f"Project '{project_name}' not found")
         try:
             runner = GitCommandRunner(project_path)
-            runner.checkout(branch_name)
+            await runner.checkout(branch_name)
             return {
                 "project_name": project_name,
                 "branch_name": branch_name,
@@ -695,60 +753,62 @@ class GitService:
             raise RuntimeError(f"Failed to checkout branch: {e}") from e
 
     async def list_project_files(self, project_name: str) -> dict[str, Any]:
-        """Return a tree of .eaf files and folders containing .eaf files for the given project,
-        always from the master branch. Restore the previous branch after listing.
+        """Return a tree of .eaf files and folders containing .eaf files on master.
+
+        The tree is read from the master commit with ``git ls-tree``, so the
+        working tree is never touched, and cached until master moves.
         """
         project_path = self.base_path / project_name
-        elan_files_dir = project_path / "elan_files"
-        if not elan_files_dir.exists():
-            raise FileNotFoundError(
-                f"Project '{project_name}' does not have an 'elan_files' directory."
-            )
+        if not project_path.exists():
+            raise FileNotFoundError(f"Project '{project_name}' not found")
 
         runner = GitCommandRunner(project_path)
+        master_sha = await runner.rev_parse("master")
+        if master_sha is None:
+            raise FileNotFoundError(f"Project '{project_name}' has no master branch")
 
-        # Detect current branch
-        current_branch = None
-        try:
-            branches_raw = runner.get_branches()
-            for line in branches_raw:
-                line = line.strip()
-                if line.startswith("* "):
-                    current_branch = line[2:]
-                    break
-        except Exception:
-            current_branch = None
-
-        # Checkout master branch before listing files
-        runner.checkout("master")
-
-        def build_tree(path: Path) -> dict | None:
-            if path.is_file():
-                if path.suffix.lower() == ".eaf":
-                    return {"name": path.name, "type": "file"}
-                return None
-            children = []
-            for child in sorted(
-                path.iterdir(), key=lambda p: (not p.is_dir(), p.name.lower())
-            ):
-                subtree = build_tree(child)
-                if subtree:
-                    children.append(subtree)
-            if children:
-                return {"name": path.name, "type": "folder", "children": children}
-            return None
-
-        tree = build_tree(elan_files_dir)
-
-        # Restore previous branch if needed
-        if current_branch and current_branch != "master":
-            try:
-                runner.checkout(current_branch)
-            except Exception:
-                pass
+        cached = self._file_tree_cache.get(project_name)
+        if cached and cached[0] == master_sha:
+            return {"tree": cached[1]}
 
+        paths = await runner.list_tree_paths(master_sha, "elan_files/")
+        tree = self._build_file_tree(paths)
+        self._file_tree_cache[project_name] = (master_sha, tree)
         return {"tree": tree}
 
+    @staticmethod
+    def _build_file_tree(paths: list[str]) -> dict | None:
+        """Build the nested folder/file tree of the .eaf files among paths."""
+        root: dict[str, dict | None] = {}
+        for path in paths:
+            if not path.lower().endswith(".eaf"):
+                continue
+            # Paths are relative to the repository root and start with elan_files/
+            *folders, filename = path.split("/")[1:]
+            node = root
+            for folder in folders:
+                node = node.setdefault(folder, {})
+            node[filename] = None
+
+        def to_tree(name: str, children: dict[str, dict | None]) -> dict:
+            # Folders first, then case-insensitive by name
+            ordered = sorted(
+                children.items(), key=lambda item: (item[1] is None, item[0].lower())
+            )
+            return {
+                "name": name,
+                "type": "folder",
+                "children": [
+                    {"name": child, "type": "file"}
+                    if grandchildren is None
+                    else to_tree(child, grandchildren)
+                    for child, grandchildren in ordered
+                ],
+            }
+
+        return to_tree("elan_files", root) if root else None
+
+    @project_operation("synchronize")
     async def synchronize_project(
         self, project_name: str, db: AsyncSession, user_id: int
     ):
@@ -764,7 +824,7 @@ class GitService:
         # Work on master branch
         current_branch = None
         try:
-            branches_raw = runner.get_branches()
+            branches_raw = await runner.get_branches()
             for line in branches_raw:
                 line = line.strip()
                 if line.startswith("* "):
@@ -773,43 +833,101 @@ class GitService:
         except Exception:
             pass
         if current_branch != "master":
-            runner.checkout("master")
+            await runner.checkout("master")
 
         # Add and commit new/changed .eaf files
-        runner.add_all()
-        if runner.get_status().strip():
-            runner.commit("Synchronize .eaf files from filesystem")
+        await runner.add_all()
+        if (await runner.get_status()).strip():
+            await runner.commit("Synchronize .eaf files from filesystem")
 
-        elan_service = ElanService(db)
         elan_files = list(elan_files_dir.rglob("*.eaf"))
-        for elan_file in elan_files:
-            await elan_service.process_single_file(
-                str(elan_file), user_id, project_name
-            )
+        results = await ElanParsePipeline(db).store_files(
+            elan_files,
+            user_id,
+            project_name,
+            blob_shas=await self._get_elan_blob_shas(project_path),
+        )
+        failed_count = len(self._failed_filenames(results))
 
         # Restore previous branch
         if current_branch and current_branch != "master":
             try:
-                runner.checkout(current_branch)
+                await runner.checkout(current_branch)
             except Exception:
                 pass
 
-        return (
+        message = (
             f"Synchronized {len(elan_files)} .eaf files for project '{project_name}'."
         )
+        if failed_count:
+            message += f" {failed_count} files failed to parse or store."
+        return message
+
+    @project_operation("delete")
+    async def delete_project(
+        self,
+        project_name: str,
+        db: AsyncSession,
+        user_id: int,
+        background: bool = False,
+    ) -> dict[str, Any]:
+        """Delete a project, its files, and all associated database artifacts.
+
+        Args:
+            project_name: Project to delete.
+            db: Database session of the request.
+            user_id: User requesting the deletion.
+            background: Hide the project and return right away, deleting it in
+                a background task whose progress get_project_deletion reports.
+
+        Returns:
+            Snapshot of the deletion job.
+
+        """
+        if project_deletions.is_running(project_name):
+            return project_deletions.get(project_name).to_dict()
 
-    async def delete_project(self, project_name: str, db: AsyncSession, user_id: int):
         logger.info(f"Starting deletion of project: {project_name}")
+        job = project_deletions.start(project_name)
+        if background:
+            await hide_project(db, project_name)
+            project_deletions.run_in_background(
+                job, self._delete_project_in_background(job)
+            )
+        else:
+            await self._delete_project(job, db)
+        return job.to_dict()
+
+    def get_project_deletion(self, project_name: str) -> dict[str, Any] | None:
+        """Return the progress of the latest deletion of a project, if any."""
+        job = project_deletions.get(project_name)
+        return job.to_dict() if job else None
+
+    async def _delete_project_in_background(self, job: ProjectDeletionJob) -> None:
+        """Delete a project with its own session once its queue has drained."""
+        async with (
+            project_scheduler.acquire(job.project_name, "delete"),
+            get_session_maker()() as db,
+        ):
+            await self._delete_project(job, db)
+
+    async def _delete_project(self, job: ProjectDeletionJob, db: AsyncSession) -> None:
+        project_name = job.project_name
         # Remove all DB artifacts (project, files, annotations, etc.)
         try:
-            await delete_project_db(db, project_name)
+            await delete_project_db(db, project_name, on_progress=job.record)
             logger.info(f"Database records deleted for project: {project_name}")
         except Exception as db_exc:
             logger.error(
                 f"Failed to delete project from DB: {project_name} | Error: {db_exc}"
             )
+            job.finish(db_exc)
             raise
 
         # Remove the project folder from disk
         project_path = self.base_path / project_name
+        close_blob_reader(project_path)
         delete_project_folder(project_path)
+        self._file_tree_cache.pop(project_name, None)
+        project_scheduler.forget(project_name)
+        job.finish()
@@ -0,0 +1,271 @@
+"""Long-lived ``git cat-file`` processes for reading objects without checkouts.
+
+Each project gets a small pool of ``git cat-file --batch`` processes plus one
+``--batch-check`` process. A lookup is one request/response over a pipe instead
+of a process spawn, and blobs are cached by their (immutable) object id.
+"""
+
+import asyncio
+import queue
+import re
+import subprocess
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from app.core.centralized_logging import get_logger
+from app.core.config import (
+    GIT_BLOB_CACHE_MB,
+    GIT_BLOB_READERS_PER_PROJECT,
+    GIT_COMMAND_TIMEOUT_SECONDS,
+)
+
+logger = get_logger()
+
+_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$|^[0-9a-f]{64}$")
+# "<sha> <type> <size>"
+_HEADER_FIELDS = 3
+
+
+@dataclass(frozen=True)
+class ObjectInfo:
+    """Header returned by cat-file for an existing object."""
+
+    sha: str
+    type: str
+    size: int
+
+
+class BlobCache:
+    """LRU of blob contents keyed by object id, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize an empty cache holding at most max_bytes of content."""
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    def get(self, sha: str) -> bytes | None:
+        """Return the cached content and mark it as recently used."""
+        content = self._entries.get(sha)
+        if content is not None:
+            self._entries.move_to_end(sha)
+        return content
+
+    def put(self, sha: str, content: bytes) -> None:
+        """Cache content unless it alone exceeds the budget, evicting old entries."""
+        if len(content) > self.max_bytes or sha in self._entries:
+            return
+        self._entries[sha] = content
+        self.current_bytes += len(content)
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= len(evicted)
+
+
+class _CatFileProcess:
+    """One ``git cat-file`` process, used by a single thread at a time."""
+
+    def __init__(
+        self,
+        project_path: Path,
+        mode: str,
+        timeout: float = GIT_COMMAND_TIMEOUT_SECONDS,
+    ) -> None:
+        self.project_path = project_path
+        self.mode = mode
+        self.timeout = timeout
+        self.process: subprocess.Popen[bytes] | None = None
+
+    def query(self, object_name: str) -> tuple[ObjectInfo, bytes | None] | None:
+        """Look up one object, restarting the process once if it died.
+
+        Raises:
+            ValueError: If the object name contains a newline.
+            RuntimeError: If cat-file did not answer within the timeout. The
+                process is killed and restarted by the next lookup.
+
+        """
+        # A newline would be read as a second request and desync the protocol
+        if "\n" in object_name:
+            raise ValueError(f"Invalid object name: {object_name!r}")
+        for attempt in range(2):
+            try:
+                return self._query(object_name)
+            except (BrokenPipeError, ConnectionError, OSError):
+                self.close()
+                if attempt:
+                    raise
+        return None
+
+    def read(self, object_name: str) -> tuple[ObjectInfo, bytes] | None:
+        """Look up one object with its content, in ``--batch`` mode only."""
+        result = self.query(object_name)
+        if result is None:
+            return None
+        info, content = result
+        if content is None:
+            raise RuntimeError(f"git cat-file {self.mode} does not return content")
+        return info, content
+
+    def _query(self, object_name: str) -> tuple[ObjectInfo, bytes | None] | None:
+        if self.process is None or self.process.poll() is not None:
+            self.process = subprocess.Popen(
+                ["git", "cat-file", self.mode],
+                cwd=self.project_path,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        process = self.process
+        if process.stdin is None or process.stdout is None:
+            raise BrokenPipeError(f"git cat-file {self.mode} has no pipes")
+        # Killing the process unblocks the pipe reads and writes below
+        timer = threading.Timer(self.timeout, process.kill)
+        timer.start()
+        try:
+            return self._exchange(process.stdin, process.stdout, object_name)
+        except (OSError, ValueError):
+            if not timer.is_alive():
+                self.close()
+                logger.error(
+                    f"git cat-file {self.mode} {object_name} timed out "
+                    f"after {self.timeout}s"
+                )
+                raise RuntimeError(
+                    f"Git command timed out after {self.timeout}s: git cat-file"
+                ) from None
+            raise
+        finally:
+            timer.cancel()
+
+    def _exchange(
+        self, stdin: IO[bytes], stdout: IO[bytes], object_name: str
+    ) -> tuple[ObjectInfo, bytes | None] | None:
+        stdin.write(object_name.encode("utf-8") + b"\n")
+        stdin.flush()
+
+        header = stdout.readline()
+        if not header:
+            raise BrokenPipeError(f"git cat-file {self.mode} exited")
+        parts = header.decode("utf-8", errors="replace").rstrip("\n").rsplit(" ", 2)
+        # "<name> missing" / "<name> ambiguous" instead of "<sha> <type> <size>"
+        if parts[-1] in ("missing", "ambiguous") or len(parts) != _HEADER_FIELDS:
+            return None
+
+        info = ObjectInfo(sha=parts[0], type=parts[1], size=int(parts[2]))
+        if self.mode != "--batch":
+            return info, None
+        content = stdout.read(info.size)
+        if len(content) != info.size:
+            raise BrokenPipeError(f"git cat-file {self.mode} exited")
+        # Each object is followed by a newline
+        stdout.read(1)
+        return info, content
+
+    def close(self) -> None:
+        if self.process is not None:
+            try:
+                if self.process.stdin is not None:
+                    self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+            self.process = None
+
+
+class GitBlobReader:
+    """Async access to the objects of one repository through cat-file pipes."""
+
+    def __init__(self, project_path: Path, pool_size: int = 1) -> None:
+        """Initialize with the repository path and the number of --batch processes."""
+        self.project_path = project_path
+        self._batch: queue.Queue[_CatFileProcess] = queue.Queue()
+        for _ in range(max(pool_size, 1)):
+            self._batch.put(_CatFileProcess(project_path, "--batch"))
+        self._check = _CatFileProcess(project_path, "--batch-check")
+        self._check_lock = threading.Lock()
+        self._all = [*self._batch.queue, self._check]
+
+    async def check(self, object_name: str) -> ObjectInfo | None:
+        """Return the id, type and size of an object, or None if it does not exist.
+
+        Args:
+            object_name: Object id or any revision expression such as ``rev:path``.
+
+        """
+        return await asyncio.to_thread(self._check_sync, object_name)
+
+    async def read(self, object_name: str) -> bytes | None:
+        """Return the content of a blob, or None if it does not exist.
+
+        Args:
+            object_name: Blob id or ``rev:path``.
+
+        """
+        sha = object_name
+        if not _SHA_PATTERN.match(object_name):
+            info = await self.check(object_name)
+            if info is None or info.type != "blob":
+                return None
+            sha = info.sha
+
+        content = _blob_cache.get(sha)
+        if content is not None:
+            return content
+
+        result = await asyncio.to_thread(self._read_sync, sha)
+        if result is None:
+            return None
+        info, content = result
+        if info.type != "blob":
+            return None
+        _blob_cache.put(info.sha, content)
+        return content
+
+    def _check_sync(self, object_name: str) -> ObjectInfo | None:
+        with self._check_lock:
+            result = self._check.query(object_name)
+        return result[0] if result else None
+
+    def _read_sync(self, object_name: str) -> tuple[ObjectInfo, bytes] | None:
+        process = self._batch.get()
+        try:
+            return process.read(object_name)
+        finally:
+            self._batch.put(process)
+
+    def close(self) -> None:
+        """Terminate all cat-file processes of this repository."""
+        for process in self._all:
+            process.close()
+
+
+# Object ids are content hashes, so one cache serves every project
+_blob_cache = BlobCache(GIT_BLOB_CACHE_MB * 1024 * 1024)
+_readers: dict[Path, GitBlobReader] = {}
+
+
+def get_blob_reader(project_path: Path) -> GitBlobReader:
+    """Return the shared reader of a repository, creating it on first use."""
+    reader = _readers.get(project_path)
+    if reader is None:
+        reader = GitBlobReader(project_path, GIT_BLOB_READERS_PER_PROJECT)
+        _readers[project_path] = reader
+    return reader
+
+
+def close_blob_reader(project_path: Path) -> None:
+    """Stop the reader of a repository, e.g. before its folder is deleted."""
+    reader = _readers.pop(project_path, None)
+    if reader is not None:
+        reader.close()
+
+
+def close_all_blob_readers() -> None:
+    """Stop every reader, called on application shutdown."""
+    for project_path in list(_readers):
+        close_blob_reader(project_path)
+    logger.info("Git blob readers closed")
@@ -1,4 +1,5 @@
 import re
+from collections.abc import Iterable, Iterator
 from typing import Any
 
 from app.core.centralized_logging import get_logger
@@ -28,6 +29,65 @@ class GitDiffParser:
                 "error": str(e),
             }
 
+    def parse_batched_diff(
+        self, lines: Iterable[str], max_hunks: int = 0, max_bytes: int = 0
+    ) -> Iterator[dict[str, Any]]:
+        """Parse a multi-file git diff stream, yielding one result per file.
+
+        Only the lines of the file currently being read are kept in memory.
+        Once a file exceeds max_hunks hunks or max_bytes of diff text, its
+        remaining lines are skipped and its result is flagged as truncated.
+        A cap of 0 disables it. Results leave diff_raw empty, so the raw
+        text of all files is never held at once.
+        """
+        filename = None
+        file_lines: list[str] = []
+        size = hunks = 0
+        truncated = False
+
+        for raw_line in lines:
+            line = raw_line.rstrip("\n")
+            if line.startswith("diff --git "):
+                if filename is not None:
+                    yield self._parse_file_diff(filename, file_lines, truncated)
+                filename = self._filename_from_header(line)
+                file_lines = [line]
+                size, hunks, truncated = len(line) + 1, 0, False
+                continue
+            if filename is None or truncated:
+                continue
+
+            if line.startswith("@@"):
+                hunks += 1
+            size += len(line) + 1
+            if (max_hunks and hunks > max_hunks) or (max_bytes and size > max_bytes):
+                truncated = True
+                continue
+            file_lines.append(line)
+
+        if filename is not None:
+            yield self._parse_file_diff(filename, file_lines, truncated)
+
+    def _parse_file_diff(
+        self, filename: str, file_lines: list[str], truncated: bool
+    ) -> dict[str, Any]:
+        """Parse the collected lines of one file from a batched diff."""
+        changes = self.parse_git_diff_output("\n".join(file_lines), filename)
+        changes["diff_raw"] = ""
+        changes["truncated"] = truncated
+        if truncated:
+            changes["summary"] += " Diff truncated."
+        return changes
+
+    def _filename_from_header(self, header: str) -> str:
+        """Extract the path from a 'diff --git a/<path> b/<path>' header."""
+        paths = header[len("diff --git ") :]
+        # Unrenamed files have the same path on both sides: "a/X b/X"
+        length = (len(paths) - 5) // 2
+        if paths[2 + length : 5 + length] == " b/":
+            return paths[2 : 2 + length]
+        return paths.split(" b/", 1)[0].removeprefix("a/")
+
     def _parse_diff_lines(self, diff_output: str, filename: str) -> dict[str, Any]:
         """Parse the diff line by line."""
         lines = diff_output.split("\n")
@@ -98,7 +158,7 @@ class GitDiffParser:
         content = line[1:]
         line_number_new += 1
         changes["added_lines"].append(
-            {"line_number": line_number_new, "content": content}
+            {"type": "addition", "line_number": line_number_new, "content": content}
         )
         changes["total_additions"] += 1
         if current_hunk is not None:
@@ -114,7 +174,7 @@ class GitDiffParser:
         content = line[1:]
         line_number_old += 1
         changes["removed_lines"].append(
-            {"line_number": line_number_old, "content": content}
+            {"type": "deletion", "line_number": line_number_old, "content": content}
         )
         changes["total_deletions"] += 1
         if current_hunk is not None:
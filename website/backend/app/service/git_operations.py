@@ -1,14 +1,64 @@
-import subprocess
+import asyncio
+import functools
+import hashlib
+import os
 import shutil
-from dataclasses import dataclass
+import subprocess
+import tempfile
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
+
+from lxml import etree as ET
 
 from app.core.centralized_logging import get_logger
+from app.core.config import (
+    ELAN_DIFF_MAX_BYTES_PER_FILE,
+    ELAN_DIFF_MAX_CHANGES_PER_TIER,
+    ELAN_DIFF_MAX_HUNKS_PER_FILE,
+    GIT_COMMAND_TIMEOUT_SECONDS,
+    GIT_MAX_WORKERS,
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_PARSE_REUSE_MAX_MB,
+)
+from app.service.eaf_diff import diff_eaf_bytes
+from app.service.git_blob_reader import get_blob_reader
+from app.service.elan_pipeline import get_parse_executor, get_parse_worker_count
+from app.service.git_diff_parser import GitDiffParser
+from app.utils.file_processing import StreamingElanValidator
 
 logger = get_logger()
 
+T = TypeVar("T")
+
+# Dedicated bounded pool so git subprocesses never block the event loop and
+# never starve the default executor used by the rest of the application
+_git_executor: ThreadPoolExecutor | None = None
+
+
+def get_git_executor() -> ThreadPoolExecutor:
+    """Return the shared git thread pool, creating it on first use."""
+    global _git_executor  # noqa: PLW0603
+    if _git_executor is None:
+        _git_executor = ThreadPoolExecutor(
+            max_workers=GIT_MAX_WORKERS, thread_name_prefix="git"
+        )
+        logger.info(f"Started git executor with {GIT_MAX_WORKERS} workers")
+    return _git_executor
+
+
+def shutdown_git_executor() -> None:
+    """Shut down the shared git thread pool if it was started."""
+    global _git_executor  # noqa: PLW0603
+    if _git_executor is not None:
+        _git_executor.shutdown(wait=True, cancel_futures=True)
+        _git_executor = None
+        logger.info("Git executor shut down")
+
 
 @dataclass
 class FileUploadResult:
@@ -19,6 +69,10 @@ class FileUploadResult:
     existed: bool
     success: bool
     error: str | None = None
+    sha256: str | None = None
+    blob_sha: str | None = None
+    # ParsedEaf and size collected while validating, reused by ingest
+    parsed: dict | None = field(default=None, repr=False)
 
 
 @dataclass
@@ -40,31 +94,23 @@ class GitBranchManager:
         self.project_path = project_path
         self.commandRunner = GitCommandRunner(project_path)
 
-    def create_upload_branch(self, user_name: str, file_count: int) -> str:
+    async def create_upload_branch(self, user_name: str, file_count: int) -> str:
         """Create a unique branch for file uploads."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         branch_name = f"upload_batch_{user_name}_{timestamp}_{file_count}_files"
 
-        subprocess.run(
-            ["git", "checkout", "-b", branch_name],
-            cwd=self.project_path,
-            check=True,
-        )
+        await self.commandRunner.run(["checkout", "-b", branch_name], check=True)
         logger.info(f"Created and switched to branch: {branch_name}")
         return branch_name
 
-    def switch_to_master(self) -> None:
+    async def switch_to_master(self) -> None:
         """Switch to master branch."""
-        subprocess.run(
-            ["git", "checkout", "master"],
-            cwd=self.project_path,
-            check=True,
-        )
+        await self.commandRunner.checkout("master")
         logger.info("Switched to master branch")
 
-    def delete_branch(self, branch_name: str) -> None:
+    async def delete_branch(self, branch_name: str) -> None:
         """Delete a branch."""
-        self.commandRunner.delete_branch(branch_name)
+        await self.commandRunner.delete_branch(branch_name)
         logger.info(f"Deleted branch: {branch_name}")
 
 
@@ -74,19 +120,24 @@ class GitDiffAnalyzer:
     def __init__(self, project_path: Path):
         """Initialize with the project path."""
         self.project_path = project_path
+        self.runner = GitCommandRunner(project_path)
 
-    def analyze_merge_differences(self, branch_name: str, diff_parser) -> MergeAnalysis:
+    async def analyze_merge_differences(
+        self, branch_name: str, diff_parser
+    ) -> MergeAnalysis:
         """Analyze differences between master and branch using Git's diff."""
         logger.info(
             f"Analyzing merge differences for branch '{branch_name}' using Git diff"
         )
 
-        diff_result = subprocess.run(
-            ["git", "diff", f"master...{branch_name}", "--name-status"],
-            cwd=self.project_path,
-            capture_output=True,
-            text=True,
-            check=False,
+        diff_result = await self.runner.run(
+            [
+                "-c",
+                "core.quotePath=false",
+                "diff",
+                f"master...{branch_name}",
+                "--name-status",
+            ]
         )
 
         new_files = []
@@ -116,7 +167,7 @@ class GitDiffAnalyzer:
 
         file_changes = []
         if has_conflicts:
-            file_changes = self._get_detailed_changes(
+            file_changes = await self._get_detailed_changes(
                 branch_name, modified_files, diff_parser
             )
 
@@ -128,27 +179,112 @@ class GitDiffAnalyzer:
             file_changes=file_changes,
         )
 
-    def _get_detailed_changes(
-        self, branch_name: str, modified_files: list[str], diff_parser
+    async def _get_detailed_changes(
+        self, branch_name: str, modified_files: list[str], diff_parser: GitDiffParser
     ) -> list[dict]:
-        """Get detailed changes for modified files."""
-        file_changes = []
-        for filename in modified_files:
-            file_diff_result = subprocess.run(
-                ["git", "diff", f"master...{branch_name}", "--", filename],
-                cwd=self.project_path,
-                capture_output=True,
-                text=True,
-                check=False,
-            )
+        """Get detailed changes for modified files.
+
+        ELAN files get an annotation-level diff. Other files, and ELAN files
+        that cannot be parsed, fall back to a line diff. At most twice the
+        parse worker count of ELAN files are read and diffed at once, so a
+        large merge does not hold every blob in memory.
+        """
+        merge_base = (
+            await self.runner.run(["merge-base", "master", branch_name], check=True)
+        ).stdout.strip()
+
+        eaf_files = [f for f in modified_files if f.lower().endswith(".eaf")]
+        in_flight = asyncio.Semaphore(2 * get_parse_worker_count())
+
+        async def semantic_changes(filename: str) -> dict:
+            async with in_flight:
+                return await self._get_semantic_changes(
+                    merge_base, branch_name, filename
+                )
+
+        semantic_results = await asyncio.gather(
+            *(semantic_changes(filename) for filename in eaf_files),
+            return_exceptions=True,
+        )
 
-            if file_diff_result.stdout:
-                parsed_changes = diff_parser.parse_git_diff_output(
-                    file_diff_result.stdout, filename
+        changes_by_file: dict[str, dict] = {}
+        for filename, result in zip(eaf_files, semantic_results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Semantic diff failed for {filename}: {result}")
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                changes_by_file[filename] = result
+
+        line_diff_files = [f for f in modified_files if f not in changes_by_file]
+        if line_diff_files:
+            for changes in await self._get_line_changes(
+                branch_name, line_diff_files, diff_parser
+            ):
+                changes_by_file[changes["filename"]] = changes
+
+        return [changes_by_file[f] for f in modified_files if f in changes_by_file]
+
+    async def _get_semantic_changes(
+        self, merge_base: str, branch_name: str, filename: str
+    ) -> dict:
+        """Diff one ELAN file annotation by annotation in the parse pool."""
+        reader = get_blob_reader(self.project_path)
+        base = await reader.read(f"{merge_base}:{filename}")
+        changed = await reader.read(f"{branch_name}:{filename}")
+        if base is None or changed is None:
+            raise FileNotFoundError(f"{filename} is missing from one of the revisions")
+
+        loop = asyncio.get_running_loop()
+        semantic_diff = await loop.run_in_executor(
+            get_parse_executor(),
+            diff_eaf_bytes,
+            base,
+            changed,
+            ELAN_DIFF_MAX_CHANGES_PER_TIER,
+        )
+        return {
+            "filename": filename,
+            "added_lines": [],
+            "removed_lines": [],
+            "modified_sections": [],
+            "total_additions": 0,
+            "total_deletions": 0,
+            "hunks": [],
+            "summary": semantic_diff["summary"],
+            "diff_raw": "",
+            "semantic_diff": semantic_diff,
+        }
+
+    async def _get_line_changes(
+        self, branch_name: str, filenames: list[str], diff_parser: GitDiffParser
+    ) -> list[dict]:
+        """Get line diffs for the given files from a single streamed diff."""
+        wanted = set(filenames)
+
+        def consume(lines: Iterable[str]) -> list[dict]:
+            return [
+                changes
+                for changes in diff_parser.parse_batched_diff(
+                    lines,
+                    max_hunks=ELAN_DIFF_MAX_HUNKS_PER_FILE,
+                    max_bytes=ELAN_DIFF_MAX_BYTES_PER_FILE,
                 )
-                file_changes.append(parsed_changes)
+                if changes["filename"] in wanted
+            ]
 
-        return file_changes
+        return await self.runner.stream(
+            [
+                "-c",
+                "core.quotePath=false",
+                "diff",
+                "--no-renames",
+                "--no-color",
+                "--diff-filter=M",
+                f"master...{branch_name}",
+            ],
+            consume,
+        )
 
 
 class GitMerger:
@@ -157,8 +293,9 @@ class GitMerger:
     def __init__(self, project_path: Path):
         """Initialize with the project path."""
         self.project_path = project_path
+        self.runner = GitCommandRunner(project_path)
 
-    def selective_merge_with_conflict_isolation(
+    async def selective_merge_with_conflict_isolation(
         self, branch_name: str, analysis: MergeAnalysis
     ) -> dict[str, Any]:
         """Perform selective merge: auto-merge safe files, isolate conflicts."""
@@ -169,91 +306,80 @@ class GitMerger:
 
         if not analysis.has_conflicts:
             logger.info("No conflicts detected, performing auto-merge")
-            return self._perform_auto_merge(branch_name, analysis.new_files)
+            return await self._perform_auto_merge(branch_name, analysis.new_files)
 
         logger.info("Conflicts detected, proceeding with selective merge strategy")
         # If we have conflicts, perform selective merge
-        return self._perform_selective_merge(branch_name, analysis)
+        return await self._perform_selective_merge(branch_name, analysis)
 
-    def _perform_selective_merge(
+    async def _perform_selective_merge(
         self, branch_name: str, analysis: MergeAnalysis
     ) -> dict[str, Any]:
-        """Merge only non-conflicting files, isolate problematic ones."""
+        """Merge only non-conflicting files, isolate problematic ones.
+
+        The conflict branch, the cleaned upload commit and the merge commit are
+        all built from object data with a temporary index, so the shared working
+        tree is only touched once at the end to follow master.
+        """
         logger.info(f"Performing selective merge for branch '{branch_name}'")
-        runner = GitCommandRunner(self.project_path)
+        runner = self.runner
 
         conflict_branch_name = f"{branch_name}_conflicts"
+        conflict_branch_created = False
 
         try:
-            # Start from master and create conflict branch
-            runner.checkout("master")
-            runner.run(["checkout", "-b", conflict_branch_name], check=True)
-            logger.info(f"Created conflict branch '{conflict_branch_name}' from master")
+            master_sha = await self._resolve("master")
+            branch_sha = await self._resolve(branch_name)
 
-            # Cherry-pick ONLY modified files to conflict branch
-            if analysis.modified_files:
+            master_entries = await self._tree_entries(master_sha)
+            branch_entries = await self._tree_entries(branch_sha)
+
+            # Conflict branch: master plus ONLY the modified files from the upload
+            conflict_entries = [
+                branch_entries[path]
+                for path in analysis.modified_files
+                if path in branch_entries
+            ]
+            conflict_sha = master_sha
+            if conflict_entries:
                 logger.info(
-                    f"Adding {len(analysis.modified_files)} modified files to conflict branch"
+                    f"Adding {len(conflict_entries)} modified files to conflict branch"
                 )
-                for modified_file in analysis.modified_files:
-                    try:
-                        # Get the modified version from upload branch
-                        runner.run(
-                            ["checkout", branch_name, "--", modified_file], check=True
-                        )
-                        logger.debug(f"Added modified file: {modified_file}")
-                    except subprocess.CalledProcessError as e:
-                        logger.warning(f"Could not add {modified_file}: {e}")
-
-                # Commit only the modified files
-                runner.add_all()
-                runner.commit(f"Modified files from {branch_name} for review")
-                logger.info("Successfully created conflict branch with modified files")
-
-            # Switch to upload branch and remove ALL conflicting content
-            runner.checkout(branch_name)
-
-            # Remove modified files (reset to master version = remove changes)
-            if analysis.modified_files:
-                logger.info(
-                    f"Resetting {len(analysis.modified_files)} modified files to master version"
+                conflict_tree = await self._write_tree(master_sha, conflict_entries)
+                conflict_sha = await self._commit_tree(
+                    conflict_tree,
+                    [master_sha],
+                    f"Modified files from {branch_name} for review",
                 )
-                for modified_file in analysis.modified_files:
-                    try:
-                        runner.run(
-                            ["checkout", "master", "--", modified_file], check=True
-                        )
-                        logger.debug(f"Reset to master: {modified_file}")
-                    except subprocess.CalledProcessError as e:
-                        logger.warning(f"Could not reset {modified_file}: {e}")
-
-            # Handle deleted files (restore them from master)
-            if analysis.deleted_files:
-                logger.info(
-                    f"Restoring {len(analysis.deleted_files)} deleted files from master"
+            await runner.run(
+                ["update-ref", f"refs/heads/{conflict_branch_name}", conflict_sha, ""],
+                check=True,
+            )
+            conflict_branch_created = True
+            logger.info(f"Created conflict branch '{conflict_branch_name}' from master")
+
+            # Cleaned upload commit: modified and deleted files reset to master
+            cleaned_sha = branch_sha
+            reset_paths = analysis.modified_files + analysis.deleted_files
+            if reset_paths:
+                restore_entries = []
+                for path in reset_paths:
+                    if path in master_entries:
+                        restore_entries.append(master_entries[path])
+                    else:
+                        logger.debug(f"Could not restore {path} (not in master)")
+                cleaned_tree = await self._write_tree(branch_sha, restore_entries)
+                cleaned_sha = await self._commit_tree(
+                    cleaned_tree,
+                    [branch_sha],
+                    "Remove conflicting changes - keep only new files",
                 )
-                for deleted_file in analysis.deleted_files:
-                    try:
-                        runner.run(
-                            ["checkout", "master", "--", deleted_file], check=True
-                        )
-                        logger.debug(f"Restored deleted file: {deleted_file}")
-                    except subprocess.CalledProcessError as e:
-                        logger.debug(
-                            f"Could not restore {deleted_file} (may not exist in master): {e}"
-                        )
-
-            # Commit the cleanup (this makes upload branch have only new files)
-            if analysis.modified_files or analysis.deleted_files:
-                runner.add_all()
-                runner.commit("Remove conflicting changes - keep only new files")
                 logger.info("Cleaned upload branch to contain only new files")
 
-            # Merge clean upload branch to master
-            runner.checkout("master")
-
             # Check what's actually different (should be only new files now)
-            diff_check = runner.run(["diff", "--name-only", f"master...{branch_name}"])
+            diff_check = await runner.run(
+                ["diff", "--name-only", f"{master_sha}...{cleaned_sha}"], check=True
+            )
             files_to_merge = [
                 f.strip() for f in diff_check.stdout.splitlines() if f.strip()
             ]
@@ -262,13 +388,13 @@ class GitMerger:
                 merge_message = (
                     f"Add {len(files_to_merge)} new files from {branch_name}"
                 )
-                runner.merge(branch_name, merge_message, no_ff=True)
+                await self._merge_into_master(master_sha, cleaned_sha, merge_message)
                 logger.info(f"Successfully merged {len(files_to_merge)} new files")
             else:
                 logger.info("No new files to merge")
 
             # Clean up upload branch
-            runner.delete_branch(branch_name)
+            await runner.delete_branch(branch_name)
 
             return {
                 "status": "selective_merge_completed",
@@ -278,20 +404,107 @@ class GitMerger:
                 "conflict_files": analysis.modified_files,
                 "conflict_branch": conflict_branch_name,
                 "deleted_files": analysis.deleted_files,
+                "file_changes": analysis.file_changes,
                 "message": f"Merged {len(files_to_merge)} new files. {len(analysis.modified_files)} modified files isolated for review in '{conflict_branch_name}'",
             }
 
         except Exception as e:
-            # Cleanup on error
+            # Cleanup on error, master itself is only moved by the final update-ref
             try:
-                runner.checkout("master")
-                runner.run(["branch", "-D", conflict_branch_name], check=False)
-                runner.run(["branch", "-D", branch_name], check=False)
-            except:
-                pass
+                if conflict_branch_created:
+                    await runner.run(
+                        ["update-ref", "-d", f"refs/heads/{conflict_branch_name}"]
+                    )
+                await runner.run(["branch", "-D", branch_name], check=False)
+            except Exception as cleanup_error:
+                logger.warning(f"Cleanup after failed merge failed: {cleanup_error}")
             raise RuntimeError(f"Selective merge failed: {e}") from e
 
-    def auto_merge_if_safe(
+    async def _resolve(self, ref: str) -> str:
+        """Resolve a ref to a commit id, failing if it does not exist."""
+        commit_sha = await self.runner.rev_parse(ref)
+        if commit_sha is None:
+            raise RuntimeError(f"Unknown revision '{ref}'")
+        return commit_sha
+
+    async def _tree_entries(self, ref: str) -> dict[str, str]:
+        """Map each path under elan_files/ in ref to its ls-tree line."""
+        result = await self.runner.run(
+            ["ls-tree", "-r", "-z", ref, "--", "elan_files/"], check=True
+        )
+        entries = {}
+        for entry in result.stdout.split("\0"):
+            if entry:
+                entries[entry.split("\t", 1)[1]] = entry
+        return entries
+
+    async def _write_tree(self, base: str, entries: list[str]) -> str:
+        """Write the tree of base with entries (ls-tree lines) replaced.
+
+        A throwaway GIT_INDEX_FILE keeps the repository index and the working
+        tree untouched.
+        """
+        with tempfile.TemporaryDirectory(prefix="elanora-index-") as tmp_dir:
+            env = {"GIT_INDEX_FILE": str(Path(tmp_dir) / "index")}
+            await self.runner.run(["read-tree", base], check=True, env=env)
+            if entries:
+                await self.runner.run(
+                    ["update-index", "-z", "--index-info"],
+                    check=True,
+                    stdin="".join(f"{entry}\0" for entry in entries),
+                    env=env,
+                )
+            result = await self.runner.run(["write-tree"], check=True, env=env)
+        return result.stdout.strip()
+
+    async def _commit_tree(self, tree: str, parents: list[str], message: str) -> str:
+        """Create a commit object for tree with the given parents."""
+        args = ["commit-tree", tree]
+        for parent in parents:
+            args += ["-p", parent]
+        result = await self.runner.run([*args, "-m", message], check=True)
+        return result.stdout.strip()
+
+    async def _merge_into_master(
+        self, master_sha: str, branch_sha: str, message: str
+    ) -> str:
+        """Record a --no-ff merge of branch_sha into master without a checkout.
+
+        Returns:
+            The id of the new master commit.
+
+        Raises:
+            RuntimeError: If the trees conflict or master moved concurrently.
+
+        """
+        merge_result = await self.runner.run(
+            ["merge-tree", "--write-tree", "--no-messages", master_sha, branch_sha]
+        )
+        if merge_result.returncode != 0:
+            raise RuntimeError(
+                f"Merge of {branch_sha[:10]} into master has conflicts: "
+                f"{merge_result.stdout.strip() or merge_result.stderr.strip()}"
+            )
+        merged_tree = merge_result.stdout.splitlines()[0].strip()
+        merge_sha = await self._commit_tree(
+            merged_tree, [master_sha, branch_sha], message
+        )
+
+        # Compare-and-swap so a concurrent update of master is never overwritten
+        await self.runner.run(
+            ["update-ref", "-m", message, "refs/heads/master", merge_sha, master_sha],
+            check=True,
+        )
+
+        # Bring the index and files up to date if master is the checked out branch
+        head_ref = await self.runner.run(["symbolic-ref", "-q", "HEAD"])
+        if head_ref.stdout.strip() == "refs/heads/master":
+            await self.runner.run(
+                ["read-tree", "-m", "-u", master_sha, merge_sha], check=True
+            )
+        return merge_sha
+
+    async def auto_merge_if_safe(
         self, branch_name: str, analysis: MergeAnalysis
     ) -> dict[str, Any]:
         """Automatically merge if only new files, otherwise return conflict info."""
@@ -299,14 +512,14 @@ class GitMerger:
 
         if not analysis.has_conflicts:
             logger.info("No conflicts detected, proceeding with auto-merge")
-            return self._perform_auto_merge(branch_name, analysis.new_files)
+            return await self._perform_auto_merge(branch_name, analysis.new_files)
         else:
             logger.warning(
                 f"Conflicts detected in branch '{branch_name}', returning conflict response"
             )
-            return self._create_conflict_response(branch_name, analysis)
+            return await self._create_conflict_response(branch_name, analysis)
 
-    def _perform_auto_merge(
+    async def _perform_auto_merge(
         self, branch_name: str, new_files: list[str]
     ) -> dict[str, Any]:
         """Perform automatic merge for new files only."""
@@ -318,18 +531,9 @@ class GitMerger:
         logger.debug(f"Merge message: {merge_message}")
 
         try:
-            subprocess.run(
-                [
-                    "git",
-                    "merge",
-                    branch_name,
-                    "--no-ff",
-                    "-m",
-                    merge_message,
-                ],
-                cwd=self.project_path,
-                check=True,
-            )
+            master_sha = await self._resolve("master")
+            branch_sha = await self._resolve(branch_name)
+            await self._merge_into_master(master_sha, branch_sha, merge_message)
             logger.info(
                 f"Successfully auto-merged {len(new_files)} new files from branch '{branch_name}'"
             )
@@ -343,11 +547,11 @@ class GitMerger:
                 "deleted_files": [],
                 "message": f"Successfully merged {len(new_files)} new files",
             }
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, RuntimeError) as e:
             logger.error(f"Auto-merge failed for branch '{branch_name}': {e}")
             raise RuntimeError(f"Auto-merge failed: {e}") from e
 
-    def _create_conflict_response(
+    async def _create_conflict_response(
         self, branch_name: str, analysis: MergeAnalysis
     ) -> dict[str, Any]:
         """Create response for conflicts that need review."""
@@ -358,12 +562,8 @@ class GitMerger:
 
         # Get summary stats
         try:
-            detailed_diff = subprocess.run(
-                ["git", "diff", f"master...{branch_name}", "--stat"],
-                cwd=self.project_path,
-                capture_output=True,
-                text=True,
-                check=False,
+            detailed_diff = await self.runner.run(
+                ["diff", f"master...{branch_name}", "--stat"]
             )
             logger.debug(f"Generated diff stats for branch '{branch_name}'")
         except Exception as e:
@@ -398,32 +598,38 @@ class FileUploadProcessor:
     async def process_files(
         self, files, existing_files: list[str]
     ) -> tuple[list[FileUploadResult], list[FileUploadResult]]:
-        """Process all uploaded files and return success/failure lists."""
-        uploaded_files = []
+        """Process all uploaded files and return success/failure lists.
+
+        Every file is written first, then all of them are staged with a single
+        ``git add`` so the index is rewritten once per batch.
+        """
+        written_files = []
         failed_files = []
+        reuse_budget = UPLOAD_PARSE_REUSE_MAX_MB * 1024 * 1024
 
         for file in files:
             try:
                 result = await self._process_single_file(file, existing_files)
-                uploaded_files.append(result)
-                logger.info(f"Added file to Git: {file.filename}")
+                # Past the budget, ingest parses the file again from disk
+                reuse_budget -= result.size
+                if reuse_budget < 0:
+                    result.parsed = None
+                written_files.append(result)
             except Exception as e:
-                failed_result = FileUploadResult(
-                    filename=file.filename,
-                    size=file.size or 0,
-                    existed=file.filename in existing_files,
-                    success=False,
-                    error=str(e),
-                )
-                failed_files.append(failed_result)
+                failed_files.append(self._failed_result(file, existing_files, e))
                 logger.error(f"Failed to process file {file.filename}: {e}")
 
+        uploaded_files, add_failures = await self._stage_files(written_files)
+        failed_files.extend(add_failures)
+        for result in uploaded_files:
+            logger.info(f"Added file to Git: {result.filename}")
+
         return uploaded_files, failed_files
 
     async def _process_single_file(
         self, file, existing_files: list[str]
     ) -> FileUploadResult:
-        """Process a single file upload."""
+        """Write a single uploaded file into elan_files/ without staging it."""
         # Ensure elan_files directory exists
         elan_files_dir = self.project_path / "elan_files"
         elan_files_dir.mkdir(exist_ok=True)
@@ -432,30 +638,145 @@ class FileUploadProcessor:
         logger.debug(f"Processing file: {file.filename} -> {dest_path}")
 
         # Always save the file - let Git determine if it changed
-        content = await file.read()
-        with open(dest_path, "wb") as buffer:
-            buffer.write(content)
+        size, sha256, blob_sha, parsed = await self._stream_to_disk(file, dest_path)
 
-        logger.info(f"File saved: {dest_path} ({len(content)} bytes)")
+        logger.info(f"File saved: {dest_path} ({size} bytes, blob {blob_sha})")
 
-        # Add to git - Git will handle change detection
-        try:
-            runner = GitCommandRunner(self.project_path)
-            runner.run(["add", f"elan_files/{file.filename}"], check=True)
-            logger.debug(f"Git add successful for {file.filename}")
+        return FileUploadResult(
+            filename=file.filename,
+            size=size,
+            existed=file.filename in existing_files,
+            success=True,
+            sha256=sha256,
+            blob_sha=blob_sha,
+            parsed=parsed,
+        )
 
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Git add failed for {file.filename}: {e}")
-            raise RuntimeError(f"Failed to add file to Git: {e}") from e
+    async def _stage_files(
+        self, results: list[FileUploadResult]
+    ) -> tuple[list[FileUploadResult], list[FileUploadResult]]:
+        """Stage written files with one git add, attributing failures per file.
+
+        Returns:
+            The staged results and the results of files git refused to add.
+
+        """
+        if not results:
+            return [], []
+
+        runner = GitCommandRunner(self.project_path)
+        paths = [f"elan_files/{result.filename}" for result in results]
+        batch = await runner.run(
+            [
+                "--literal-pathspecs",
+                "add",
+                "--pathspec-from-file=-",
+                "--pathspec-file-nul",
+            ],
+            stdin="\0".join(paths),
+        )
+        if batch.returncode == 0:
+            logger.debug(f"Git add successful for {len(paths)} files")
+            return results, []
 
+        # Retry one by one so each file reports its own error
+        logger.warning(
+            f"Batch git add failed, staging files individually: {batch.stderr.strip()}"
+        )
+        staged = []
+        failed = []
+        for result, path in zip(results, paths, strict=True):
+            try:
+                await runner.run(["--literal-pathspecs", "add", path], check=True)
+                staged.append(result)
+            except subprocess.CalledProcessError as e:
+                logger.error(f"Git add failed for {result.filename}: {e.stderr}")
+                result.success = False
+                result.error = f"Failed to add file to Git: {e.stderr.strip() or e}"
+                failed.append(result)
+        return staged, failed
+
+    @staticmethod
+    def _failed_result(
+        file, existing_files: list[str], error: Exception
+    ) -> FileUploadResult:
+        """Build the result of an upload that could not be written."""
         return FileUploadResult(
             filename=file.filename,
             size=file.size or 0,
             existed=file.filename in existing_files,
-            success=True,
+            success=False,
+            error=str(error),
         )
 
-    def commit_files(
+    async def _stream_to_disk(
+        self, file, dest_path: Path
+    ) -> tuple[int, str, str, dict]:
+        """Copy an upload to dest_path chunk by chunk, validating and hashing it.
+
+        The content goes to a temporary sibling first and only replaces
+        dest_path once the whole file was written and validated. The validation
+        pass also collects the time slots and tiers, so ingest does not have to
+        parse the file again.
+
+        Returns:
+            The size in bytes, the SHA-256, the git blob id and the parsed
+            content (ParsedEaf and file size) of the upload.
+
+        Raises:
+            RuntimeError: If the content is not a valid ELAN document.
+
+        """
+        # The spooled upload knows its size, which the git blob header needs upfront
+        file.file.seek(0, os.SEEK_END)
+        size = file.file.tell()
+        await file.seek(0)
+
+        part_path = dest_path.with_name(f"{dest_path.name}.part")
+        try:
+            # One worker thread runs the whole copy: lxml parsers must stay on
+            # the thread that created them
+            sha256, blob_sha, parsed = await asyncio.to_thread(
+                self._copy_upload, file.file, part_path, size
+            )
+            await asyncio.to_thread(os.replace, part_path, dest_path)
+        except (ValueError, ET.XMLSyntaxError) as e:
+            part_path.unlink(missing_ok=True)
+            raise RuntimeError(f"Invalid ELAN file: {e}") from e
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+        return size, sha256, blob_sha, parsed
+
+    @staticmethod
+    def _copy_upload(source, part_path: Path, size: int) -> tuple[str, str, dict]:
+        """Copy source to part_path in chunks, validating and hashing on the way.
+
+        Returns:
+            The SHA-256, the git blob id and the parsed content of the upload.
+
+        """
+        sha256 = hashlib.sha256()
+        blob_sha = hashlib.sha1(f"blob {size}\0".encode(), usedforsecurity=False)
+        validator = StreamingElanValidator(collect=True)
+
+        written = 0
+        with open(part_path, "wb") as out:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                sha256.update(chunk)
+                blob_sha.update(chunk)
+                validator.feed(chunk)
+                out.write(chunk)
+                written += len(chunk)
+        validator.close()
+
+        if written != size:
+            raise RuntimeError(f"Expected {size} bytes but received {written}")
+        parsed = {"file_size": size, "eaf": validator.parsed()}
+        return sha256.hexdigest(), blob_sha.hexdigest(), parsed
+
+    async def commit_files(
         self, uploaded_files: list[FileUploadResult], user_name: str
     ) -> None:
         """Commit all uploaded files with Git's change detection."""
@@ -464,7 +785,7 @@ class FileUploadProcessor:
         runner = GitCommandRunner(self.project_path)
 
         # Let Git determine what actually changed
-        status_result = runner.run(["status", "--porcelain"])
+        status_result = await runner.run(["status", "--porcelain"])
         staged_files = []
 
         for line in status_result.stdout.splitlines():
@@ -500,7 +821,7 @@ class FileUploadProcessor:
         logger.debug(f"Commit message: {full_message}")
 
         try:
-            runner.run(["commit", "-m", full_message], check=True)
+            await runner.run(["commit", "-m", full_message], check=True)
             logger.info(f"Successfully committed {changed_count} changed files")
         except subprocess.CalledProcessError as e:
             if "nothing to commit" in e.stderr:
@@ -517,104 +838,255 @@ class GitCommandRunner:
     def __init__(self, project_path: Path):
         self.project_path = project_path
 
-    def run(self, args: list[str], check: bool = False) -> subprocess.CompletedProcess:
-        return subprocess.run(
-            ["git"] + args,
-            cwd=self.project_path,
-            capture_output=True,
-            text=True,
-            check=check,
-        )
+    async def run(
+        self,
+        args: list[str],
+        check: bool = False,
+        timeout: float | None = None,
+        stdin: str | None = None,
+        env: dict[str, str] | None = None,
+    ) -> subprocess.CompletedProcess:
+        """Run a git command on the git executor without blocking the event loop.
+
+        Args:
+            args: Arguments passed to git.
+            check: Raise CalledProcessError on a non-zero exit status.
+            timeout: Seconds before the command is killed. Defaults to
+                GIT_COMMAND_TIMEOUT_SECONDS.
+            stdin: Optional text written to the command's standard input.
+            env: Extra environment variables, e.g. GIT_INDEX_FILE.
+
+        Returns:
+            The completed process with captured stdout and stderr.
+
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                get_git_executor(),
+                functools.partial(
+                    subprocess.run,
+                    ["git"] + args,
+                    cwd=self.project_path,
+                    capture_output=True,
+                    text=True,
+                    check=check,
+                    timeout=timeout or GIT_COMMAND_TIMEOUT_SECONDS,
+                    input=stdin,
+                    env={**os.environ, **env} if env else None,
+                ),
+            )
+        except subprocess.TimeoutExpired as e:
+            logger.error(f"git {' '.join(args)} timed out after {e.timeout}s")
+            raise RuntimeError(
+                f"Git command timed out after {e.timeout}s: git {args[0]}"
+            ) from e
+
+    async def stream(
+        self,
+        args: list[str],
+        consume: Callable[[Iterable[str]], T],
+        timeout: float | None = None,
+    ) -> T:
+        """Run a git command and hand its stdout lines to consume as they arrive.
+
+        Both the process and consume run on the git executor, so large outputs
+        are processed incrementally instead of being buffered in one string.
+
+        Args:
+            args: Arguments passed to git.
+            consume: Callable reading the line iterator, its result is returned.
+            timeout: Seconds before the command is killed. Defaults to
+                GIT_COMMAND_TIMEOUT_SECONDS.
+
+        Returns:
+            Whatever consume returned.
+
+        Raises:
+            subprocess.CalledProcessError: If git exits with a non-zero status.
+            RuntimeError: If the command timed out.
+
+        """
+        timeout = timeout or GIT_COMMAND_TIMEOUT_SECONDS
+
+        def run_streaming() -> T:
+            with subprocess.Popen(
+                ["git", *args],
+                cwd=self.project_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+            ) as process:
+                timer = threading.Timer(timeout, process.kill)
+                timer.start()
+                try:
+                    result = consume(process.stdout)
+                    # Drain whatever consume did not read so git can exit
+                    for _ in process.stdout:
+                        pass
+                    stderr = process.stderr.read()
+                    returncode = process.wait()
+                except BaseException:
+                    process.kill()
+                    raise
+                finally:
+                    timed_out = not timer.is_alive()
+                    timer.cancel()
+            if timed_out and returncode != 0:
+                raise RuntimeError(
+                    f"Git command timed out after {timeout}s: git {args[0]}"
+                )
+            if returncode != 0:
+                raise subprocess.CalledProcessError(
+                    returncode, ["git", *args], stderr=stderr
+                )
+            return result
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_git_executor(), run_streaming)
 
-    def get_status(self) -> str:
-        return self.run(["status", "--porcelain"]).stdout
+    async def get_status(self) -> str:
+        return (await self.run(["status", "--porcelain"])).stdout
 
-    def get_log(self, count: int = 5) -> str:
-        return self.run(
-            ["log", f"-{count}", "--pretty=format:%h|%an|%ad|%s", "--date=iso"]
+    async def get_log(self, count: int = 5) -> str:
+        return (
+            await self.run(
+                ["log", f"-{count}", "--pretty=format:%h|%an|%ad|%s", "--date=iso"]
+            )
         ).stdout
 
-    def get_conflicted_files(self) -> list[str]:
-        result = self.run(["diff", "--name-only", "--diff-filter=U"])
+    async def get_conflicted_files(self) -> list[str]:
+        result = await self.run(["diff", "--name-only", "--diff-filter=U"])
         return [
             line.strip() for line in result.stdout.strip().split("\n") if line.strip()
         ]
 
-    def get_conflict_details(self, filename: str) -> dict[str, Any]:
-        file_path = self.project_path / filename
-        if file_path.exists():
+    async def get_conflict_details(
+        self, filename: str, revision: str | None = None
+    ) -> dict[str, Any]:
+        """Count conflict markers in a file.
+
+        Args:
+            filename: Path relative to the repository root.
+            revision: Read the file as stored in this revision (or index stage,
+                e.g. ``:2``) through the cat-file reader. Defaults to the
+                working tree copy.
+
+        """
+        if revision is not None:
+            data = await get_blob_reader(self.project_path).read(
+                f"{revision}:{filename}"
+            )
+            if data is None:
+                return {"error": "File not found"}
+            content = data.decode("utf-8", errors="ignore")
+        else:
+            file_path = self.project_path / filename
+            if not file_path.exists():
+                return {"error": "File not found"}
             with open(file_path, encoding="utf-8", errors="ignore") as f:
                 content = f.read()
-            conflict_markers = content.count("<<<<<<< HEAD")
-            return {
-                "conflict_markers_count": conflict_markers,
-                "file_size": len(content),
-                "has_binary_conflict": "<<<<<<< HEAD" not in content,
-            }
-        return {"error": "File not found"}
+        conflict_markers = content.count("<<<<<<< HEAD")
+        return {
+            "conflict_markers_count": conflict_markers,
+            "file_size": len(content),
+            "has_binary_conflict": "<<<<<<< HEAD" not in content,
+        }
 
-    def configure_user(self, instance_name: str):
+    async def configure_user(self, instance_name: str):
         """Configure Git user using the instance name."""
         # Clean the instance name for use in email (lowercase, no spaces)
         safe_name = instance_name.lower().replace(" ", "_")
         email = f"{safe_name}@elanora.local"
-        self.run(["config", "user.name", instance_name], check=True)
-        self.run(["config", "user.email", email], check=True)
+        await self.run(["config", "user.name", instance_name], check=True)
+        await self.run(["config", "user.email", email], check=True)
         logger.info(f"Configured Git user: {instance_name} <{email}>")
 
-    def get_branches(self) -> list[str]:
-        result = self.run(["branch", "-a"], check=True)
+    async def get_branches(self) -> list[str]:
+        result = await self.run(["branch", "-a"], check=True)
         return result.stdout.strip().split("\n")
 
-    def checkout(self, branch: str):
-        self.run(["checkout", branch], check=True)
-
-    def add_all(self):
-        self.run(["add", "."], check=True)
+    async def checkout(self, branch: str):
+        await self.run(["checkout", branch], check=True)
 
-    def commit(self, message: str):
-        self.run(["commit", "-m", message], check=True)
+    async def add_all(self):
+        await self.run(["add", "."], check=True)
 
-    def get_commit_hash(self) -> str:
-        return self.run(["rev-parse", "HEAD"]).stdout.strip()
+    async def commit(self, message: str):
+        await self.run(["commit", "-m", message], check=True)
 
-    def init_repo(self):
-        self.run(["init"], check=True)
+    async def get_commit_hash(self) -> str:
+        return (await self.run(["rev-parse", "HEAD"])).stdout.strip()
 
-    def add_file(self, filepath: str):
-        self.run(["add", filepath], check=True)
-
-    def merge(self, branch_name: str, message: str, no_ff: bool = True):
+    async def rev_parse(self, ref: str) -> str | None:
+        """Resolve a ref to its commit id, or None if it does not exist."""
+        result = await self.run(
+            ["rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}"]
+        )
+        return result.stdout.strip() or None
+
+    async def list_tree_paths(
+        self, ref: str, pathspec: str = "elan_files/"
+    ) -> list[str]:
+        """List the file paths under pathspec in a commit, without a checkout."""
+        result = await self.run(
+            ["ls-tree", "-r", "-z", "--name-only", ref, "--", pathspec], check=True
+        )
+        return [path for path in result.stdout.split("\0") if path]
+
+    async def get_blob_shas(self, pathspec: str = "elan_files/") -> dict[str, str]:
+        """Map tracked paths under pathspec to their git blob ids from the index."""
+        result = await self.run(["ls-files", "-s", "-z", "--", pathspec], check=True)
+        blob_shas = {}
+        for entry in result.stdout.split("\0"):
+            if not entry:
+                continue
+            meta, path = entry.split("\t", 1)
+            _, blob_sha, stage = meta.split()
+            # Only merged entries, conflicted paths have no single blob
+            if stage == "0":
+                blob_shas[path] = blob_sha
+        return blob_shas
+
+    async def init_repo(self):
+        await self.run(["init"], check=True)
+
+    async def add_file(self, filepath: str):
+        await self.run(["add", filepath], check=True)
+
+    async def merge(self, branch_name: str, message: str, no_ff: bool = True):
         args = ["merge", branch_name]
         if no_ff:
             args.append("--no-ff")
         args += ["-m", message]
-        self.run(args, check=True)
+        await self.run(args, check=True)
 
-    def diff_stat(self, branch_name: str) -> str:
-        return self.run(["diff", f"master...{branch_name}", "--stat"]).stdout
+    async def diff_stat(self, branch_name: str) -> str:
+        return (await self.run(["diff", f"master...{branch_name}", "--stat"])).stdout
 
-    def delete_branch_localy(self, branch_name: str):
-        self.run(["branch", "-D", branch_name], check=False)
+    async def delete_branch_localy(self, branch_name: str):
+        await self.run(["branch", "-D", branch_name], check=False)
 
-    def delete_branch_on_remote(self, branch_name: str):
-        self.run(["push", "origin", "--delete", branch_name], check=False)
+    async def delete_branch_on_remote(self, branch_name: str):
+        await self.run(["push", "origin", "--delete", branch_name], check=False)
 
-    def delete_branch(self, branch_name: str):
-        self.delete_branch_localy(branch_name)
-        self.delete_branch_on_remote(branch_name)
+    async def delete_branch(self, branch_name: str):
+        await self.delete_branch_localy(branch_name)
+        await self.delete_branch_on_remote(branch_name)
 
-    def resolve_conflicts(
+    async def resolve_conflicts(
         self, branch_name: str, resolution_strategy: str
     ) -> dict[str, Any]:
-        self.checkout("master")
-        self.run(["merge", branch_name, "--no-ff"], check=False)
+        await self.checkout("master")
+        await self.run(["merge", branch_name, "--no-ff"], check=False)
         if resolution_strategy == "accept_incoming":
-            self.run(["checkout", "--theirs", "."], check=True)
+            await self.run(["checkout", "--theirs", "."], check=True)
         elif resolution_strategy == "accept_current":
-            self.run(["checkout", "--ours", "."], check=True)
-        self.run(["add", "."], check=True)
-        self.run(
+            await self.run(["checkout", "--ours", "."], check=True)
+        await self.run(["add", "."], check=True)
+        await self.run(
             [
                 "commit",
                 "-m",
@@ -622,26 +1094,26 @@ class GitCommandRunner:
             ],
             check=True,
         )
-        self.run(["branch", "-d", branch_name], check=False)
+        await self.run(["branch", "-d", branch_name], check=False)
         return {
             "branch_name": branch_name,
             "resolution_strategy": resolution_strategy,
             "status": "resolved",
         }
 
-    def cleanup_on_error(self):
+    async def cleanup_on_error(self):
         try:
-            self.run(["checkout", "master"], check=False)
+            await self.run(["checkout", "master"], check=False)
         except Exception:
             pass
 
-    def detect_merge_conflicts(self) -> list[dict[str, str]]:
-        result = self.run(["diff", "--name-only", "--diff-filter=U"])
+    async def detect_merge_conflicts(self) -> list[dict[str, str]]:
+        result = await self.run(["diff", "--name-only", "--diff-filter=U"])
         conflicts = []
         if result.stdout:
             for filename in result.stdout.strip().split("\n"):
                 if filename.strip():
-                    conflict_details = self.get_conflict_details(filename.strip())
+                    conflict_details = await self.get_conflict_details(filename.strip())
                     conflicts.append(
                         {
                             "filename": filename.strip(),
@@ -0,0 +1,95 @@
+"""Progress tracking for project deletions, which may run in the background."""
+
+import asyncio
+from collections.abc import Coroutine
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from app.core.centralized_logging import get_logger
+
+logger = get_logger()
+
+
+@dataclass
+class ProjectDeletionJob:
+    """State and row counts of one project deletion."""
+
+    project_name: str
+    status: str = "running"
+    step: str | None = None
+    deleted: dict[str, int] = field(default_factory=dict)
+    started_at: datetime = field(default_factory=datetime.now)
+    finished_at: datetime | None = None
+    error: str | None = None
+
+    def record(self, step: str, count: int) -> None:
+        """Add rows deleted by a step, used as the deletion progress callback."""
+        self.step = step
+        self.deleted[step] = self.deleted.get(step, 0) + count
+
+    def finish(self, error: Exception | None = None) -> None:
+        """Mark the job as completed, or as failed with the given error."""
+        self.status = "failed" if error else "completed"
+        self.error = str(error) if error else None
+        self.finished_at = datetime.now()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the job."""
+        return {
+            "project_name": self.project_name,
+            "status": self.status,
+            "step": self.step,
+            "deleted": dict(self.deleted),
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "error": self.error,
+        }
+
+
+class ProjectDeletionTracker:
+    """Keep the latest deletion job of every project and own background tasks."""
+
+    def __init__(self) -> None:
+        """Initialize without any job."""
+        self._jobs: dict[str, ProjectDeletionJob] = {}
+        # Strong references, the event loop only keeps weak ones to tasks
+        self._tasks: set[asyncio.Task] = set()
+
+    def start(self, project_name: str) -> ProjectDeletionJob:
+        """Register a new deletion job for a project."""
+        job = ProjectDeletionJob(project_name)
+        self._jobs[project_name] = job
+        return job
+
+    def get(self, project_name: str) -> ProjectDeletionJob | None:
+        """Return the latest deletion job of a project, if any."""
+        return self._jobs.get(project_name)
+
+    def is_running(self, project_name: str) -> bool:
+        """Return True if a deletion of the project is in progress."""
+        job = self._jobs.get(project_name)
+        return job is not None and job.status == "running"
+
+    def run_in_background(
+        self, job: ProjectDeletionJob, coro: Coroutine[Any, Any, None]
+    ) -> None:
+        """Run a deletion coroutine as a task, recording its failure on the job."""
+
+        async def run() -> None:
+            try:
+                await coro
+            except Exception as e:
+                logger.error(
+                    f"Background deletion of project '{job.project_name}' failed: {e}"
+                )
+                if job.status == "running":
+                    job.finish(e)
+
+        task = asyncio.create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+# Shared by every GitService instance in the process
+project_deletions = ProjectDeletionTracker()
@@ -0,0 +1,147 @@
+"""Per-project serialization of git working-tree operations.
+
+Each project has a single working tree, so operations that move HEAD, touch the
+index or rewrite files must not interleave. Operations on different projects
+run fully in parallel; operations on the same project queue on an asyncio lock,
+which wakes waiters in FIFO order.
+"""
+
+import asyncio
+import functools
+import inspect
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, ParamSpec, TypeVar
+
+from app.core.centralized_logging import get_logger
+
+logger = get_logger()
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+@dataclass
+class ProjectOperationStats:
+    """Queueing statistics for one project's operations."""
+
+    completed: int = 0
+    waiting: int = 0
+    running: str | None = None
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    total_run_seconds: float = 0.0
+
+    @property
+    def average_wait_seconds(self) -> float:
+        """Mean time an operation spent queued before it could start."""
+        return self.total_wait_seconds / self.completed if self.completed else 0.0
+
+
+class ProjectOperationScheduler:
+    """Hand out one exclusive slot per project and record wait-time metrics.
+
+    The lock is per process: deployments running several workers against the
+    same projects directory still need a single writer per project.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty scheduler."""
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._stats: dict[str, ProjectOperationStats] = {}
+        self._retired: set[str] = set()
+
+    @asynccontextmanager
+    async def acquire(self, project_name: str, operation: str) -> AsyncIterator[None]:
+        """Wait for exclusive access to a project's working tree.
+
+        Args:
+            project_name: Project whose working tree is used.
+            operation: Short label of the operation, reported in metrics.
+
+        """
+        lock = self._locks.setdefault(project_name, asyncio.Lock())
+        stats = self._stats.setdefault(project_name, ProjectOperationStats())
+
+        queued_at = time.perf_counter()
+        stats.waiting += 1
+        try:
+            await lock.acquire()
+        finally:
+            stats.waiting -= 1
+
+        started_at = time.perf_counter()
+        wait_seconds = started_at - queued_at
+        stats.running = operation
+        if wait_seconds > 1:
+            logger.info(
+                f"'{operation}' on project '{project_name}' waited {wait_seconds:.2f}s for the working tree"
+            )
+        try:
+            yield
+        finally:
+            stats.running = None
+            stats.completed += 1
+            stats.total_wait_seconds += wait_seconds
+            stats.max_wait_seconds = max(stats.max_wait_seconds, wait_seconds)
+            stats.total_run_seconds += time.perf_counter() - started_at
+            lock.release()
+            if project_name in self._retired and not stats.waiting:
+                self._retired.discard(project_name)
+                self._locks.pop(project_name, None)
+                self._stats.pop(project_name, None)
+
+    def is_idle(self) -> bool:
+        """Return True if no project operation is running or queued."""
+        return not any(stats.running or stats.waiting for stats in self._stats.values())
+
+    def forget(self, project_name: str) -> None:
+        """Drop a deleted project's lock and stats once its queue has drained."""
+        self._retired.add(project_name)
+
+    def get_metrics(self) -> dict[str, dict[str, Any]]:
+        """Return a snapshot of the queueing statistics of every project."""
+        return {
+            project_name: {
+                "completed": stats.completed,
+                "waiting": stats.waiting,
+                "running": stats.running,
+                "average_wait_seconds": round(stats.average_wait_seconds, 4),
+                "max_wait_seconds": round(stats.max_wait_seconds, 4),
+                "total_run_seconds": round(stats.total_run_seconds, 4),
+            }
+            for project_name, stats in self._stats.items()
+        }
+
+
+# Shared by every GitService instance in the process
+project_scheduler = ProjectOperationScheduler()
+
+
+def project_operation(
+    operation: str,
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    """Serialize a GitService coroutine on its ``project_name`` argument.
+
+    Args:
+        operation: Label reported in the scheduler metrics.
+
+    Returns:
+        Decorator wrapping the coroutine in ``project_scheduler.acquire``.
+
+    """
+
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            project_name = signature.bind(*args, **kwargs).arguments["project_name"]
+            async with project_scheduler.acquire(project_name, operation):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
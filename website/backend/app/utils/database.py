@@ -1,8 +1,9 @@
 """Database utility functions for common operations."""
 
-from typing import Any, TypeVar
+from typing import Any, TypeVar, cast
 
-from sqlalchemy import select
+from sqlalchemy import Executable, select
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -50,6 +51,19 @@ class DatabaseUtils:
             await db.rollback()
             raise
 
+    @staticmethod
+    async def create_and_flush(db: AsyncSession, instance: ModelType) -> ModelType:
+        """Generic create with flush only, leaving the transaction open."""
+        db.add(instance)
+        await db.flush()
+        return instance
+
+    @staticmethod
+    async def execute_rowcount(db: AsyncSession, stmt: Executable) -> int:
+        """Execute an INSERT, UPDATE or DELETE and return the matched row count."""
+        result = cast(CursorResult[Any], await db.execute(stmt))
+        return result.rowcount
+
     @staticmethod
     async def delete_by_filter(
         db: AsyncSession, model: type[ModelType], **filters
@@ -4,6 +4,9 @@ from lxml import etree as ET
 from pathlib import Path
 from decimal import Decimal
 from pathlib import Path
+from typing import BinaryIO
+
+from app.utils.parsed_eaf import ParsedEaf
 
 
 class ElanFileProcessor:
@@ -111,6 +114,14 @@ class XmlAttributeExtractor:
             "end_time": Decimal(end_time) / 1000,
         }
 
+    @staticmethod
+    def get_annotation_value(annotation: ET._Element) -> str | None:
+        """Return the stripped ANNOTATION_VALUE text, or None if it is empty."""
+        annotation_value_elem = annotation.find("ANNOTATION_VALUE", namespaces=None)
+        if annotation_value_elem is None or not annotation_value_elem.text:
+            return None
+        return annotation_value_elem.text.strip()
+
     @staticmethod
     def get_ref_annotation_attributes(
         annotation: ET._Element,
@@ -126,3 +137,202 @@ class XmlAttributeExtractor:
             "start_time": Decimal(0),
             "end_time": Decimal(0),
         }
+
+
+class StreamingElanValidator:
+    """Incremental structural check of an ELAN document fed in chunks.
+
+    The first KB is sniffed so obviously wrong uploads fail before any parsing,
+    then an lxml pull parser checks the root element and the required top-level
+    sections while elements are discarded as soon as they close.
+
+    With ``collect=True`` the same pass also fills a ParsedEaf like
+    StreamingElanParser, so an upload is parsed once for validation and ingest.
+    Collection needs a well-formed document: the parser then runs without
+    recovery, exactly like the ingest parser.
+    """
+
+    SNIFF_BYTES = 1024
+    ROOT_TAG = "ANNOTATION_DOCUMENT"
+    REQUIRED_SECTIONS = ("HEADER", "TIME_ORDER")
+
+    def __init__(self, collect: bool = False) -> None:
+        """Initialize an empty validation state, optionally collecting the content."""
+        self._parser = ET.XMLPullParser(
+            events=("start", "end"),
+            resolve_entities=False,
+            no_network=True,
+            recover=not collect,
+        )
+        self._collector = StreamingElanParser() if collect else None
+        self._head = b""
+        self._sniffed = False
+        self._depth = 0
+        self._root_tag: str | None = None
+        self._sections: set[str] = set()
+
+    def feed(self, chunk: bytes) -> None:
+        """Validate the next chunk of the document.
+
+        Raises:
+            ValueError: If the content cannot be an ELAN document.
+            lxml.etree.XMLSyntaxError: If collecting and the content is not
+                well-formed XML.
+
+        """
+        if not self._sniffed:
+            self._head += chunk[: self.SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= self.SNIFF_BYTES:
+                self._sniff()
+        try:
+            self._parser.feed(chunk)
+        except ET.XMLSyntaxError:
+            # Report non-XML content as such rather than as a parser error
+            if not self._sniffed:
+                self._sniff()
+            raise
+        self._read_events()
+
+    def close(self) -> None:
+        """Finish parsing and check that the required structure was seen.
+
+        Raises:
+            ValueError: If the document is not a structurally valid ELAN file.
+
+        """
+        if not self._sniffed:
+            self._sniff()
+        self._parser.close()
+        self._read_events()
+        if self._root_tag != self.ROOT_TAG:
+            raise ValueError(f"missing {self.ROOT_TAG} root element")
+        for section in self.REQUIRED_SECTIONS:
+            if section not in self._sections:
+                raise ValueError(f"missing {section} element")
+
+    def _sniff(self) -> None:
+        self._sniffed = True
+        head = self._head.removeprefix(b"\xef\xbb\xbf").lstrip()
+        if not head.startswith(b"<"):
+            raise ValueError("content is not an XML document")
+
+    def _read_events(self) -> None:
+        for event, element in self._parser.read_events():
+            if event == "start":
+                self._depth += 1
+                if self._depth == 1:
+                    self._root_tag = element.tag
+                    if element.tag != self.ROOT_TAG:
+                        raise ValueError(f"missing {self.ROOT_TAG} root element")
+                elif self._depth == 2:  # noqa: PLR2004
+                    self._sections.add(element.tag)
+                continue
+
+            self._depth -= 1
+            if self._collector is None:
+                if self._depth >= 1:
+                    StreamingElanParser._release(element)
+            elif element.tag in self._collector.EVENT_TAGS:
+                self._collector.handle_element(element)
+            elif self._depth == 1:
+                # Annotation children are kept until their ANNOTATION closes
+                StreamingElanParser._release(element)
+
+    def parsed(self) -> ParsedEaf:
+        """Return the content collected by a closed validator."""
+        if self._collector is None:
+            raise RuntimeError("Validator was not created with collect=True")
+        return self._collector.eaf.finish()
+
+
+class StreamingElanParser:
+    """Single-pass ELAN parser built on lxml ``iterparse``.
+
+    Elements are handled on their ``end`` event and cleared right away, so peak
+    memory stays bounded by the largest single tier entry instead of the whole
+    document tree. Annotations go straight into the columns of a ParsedEaf.
+    """
+
+    EVENT_TAGS = ("TIME_SLOT", "ANNOTATION", "TIER")
+
+    def __init__(self) -> None:
+        """Initialize empty parse state."""
+        self.eaf = ParsedEaf()
+        self._reference: list[tuple[str, str]] = []
+
+    def parse(self, source: Path | BinaryIO) -> ParsedEaf:
+        """Parse an ELAN file or binary stream into a ParsedEaf."""
+        context = ET.iterparse(
+            str(source) if isinstance(source, Path) else source,
+            events=("end",),
+            tag=self.EVENT_TAGS,
+            resolve_entities=False,
+            no_network=True,
+            recover=False,
+        )
+        for _, element in context:
+            self.handle_element(element)
+        del context
+        return self.eaf.finish()
+
+    def handle_element(self, element: ET._Element) -> None:
+        """Consume one completed element and release it."""
+        tag = element.tag
+        if tag == "TIME_SLOT":
+            slot_id = element.get("TIME_SLOT_ID", None)
+            if slot_id:
+                self.eaf.time_slots[slot_id] = int(element.get("TIME_VALUE", 0))
+        elif tag == "ANNOTATION":
+            self._handle_annotation(element)
+        elif tag == "TIER":
+            self._handle_tier(element)
+        else:
+            return
+
+        self._release(element)
+
+    def _handle_annotation(self, element: ET._Element) -> None:
+        """Collect the alignable or reference annotation wrapped by ``element``."""
+        for child in element:
+            if child.tag == "ALIGNABLE_ANNOTATION":
+                add_alignable_annotation(self.eaf, child)
+            elif child.tag == "REF_ANNOTATION":
+                value = XmlAttributeExtractor.get_annotation_value(child)
+                if value is not None:
+                    self._reference.append((child.get("ANNOTATION_ID", None), value))
+
+    def _handle_tier(self, element: ET._Element) -> None:
+        """Close the current tier, keeping it only if it has annotations."""
+        # Same ordering as the tree parser: alignable first, then references
+        for annotation_id, value in self._reference:
+            self.eaf.add_annotation(annotation_id, value, 0, 0)
+        self._reference = []
+        self.eaf.close_tier(
+            element.get("TIER_ID", None),
+            element.get("PARENT_REF", None),
+            element.get("LINGUISTIC_TYPE_REF", None),
+        )
+
+    @staticmethod
+    def _release(element: ET._Element) -> None:
+        """Clear an element and drop already processed siblings."""
+        element.clear(keep_tail=False)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
+
+def add_alignable_annotation(eaf: ParsedEaf, annotation: ET._Element) -> None:
+    """Append an ALIGNABLE_ANNOTATION with its resolved times, if it has a value."""
+    value = XmlAttributeExtractor.get_annotation_value(annotation)
+    if value is None:
+        return
+    start_ref = annotation.get("TIME_SLOT_REF1", None)
+    end_ref = annotation.get("TIME_SLOT_REF2", None)
+    eaf.add_annotation(
+        annotation.get("ANNOTATION_ID", None),
+        value,
+        eaf.time_slots.get(start_ref, 0) if start_ref else 0,
+        eaf.time_slots.get(end_ref, 0) if end_ref else 0,
+    )
@@ -0,0 +1,33 @@
+"""Opaque cursors for keyset pagination."""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+
+class CursorUtils:
+    """Encode the sort key of the last row of a page as an opaque string."""
+
+    @staticmethod
+    def encode(*key: Any) -> str:
+        """Encode a sort key of JSON-serializable values."""
+        data = json.dumps(key, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str, size: int) -> list[Any]:
+        """Decode a cursor holding a sort key of the given number of values.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError) as e:
+            raise ValueError("Invalid pagination cursor") from e
+        if not isinstance(key, list) or len(key) != size:
+            raise ValueError("Invalid pagination cursor")
+        return key
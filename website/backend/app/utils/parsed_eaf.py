@@ -0,0 +1,106 @@
+"""Compact in-memory representation of a parsed ELAN file."""
+
+import operator
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedTier:
+    """One non-empty tier, owning the annotation rows ``start`` to ``stop``."""
+
+    tier_id: str
+    parent_tier_id: str | None
+    linguistic_type: str | None
+    start: int
+    stop: int
+
+    @property
+    def tier_name(self) -> str:
+        """Display name of the tier, which EAF files store as the tier id."""
+        return self.tier_id
+
+    def __len__(self) -> int:
+        """Return the number of annotations in the tier."""
+        return self.stop - self.start
+
+
+@dataclass(slots=True)
+class ParsedEaf:
+    """Time slots, tiers and annotations of an ELAN file in parallel columns.
+
+    Annotation row ``i`` is ``(annotation_ids[i], values[i], start_ms[i],
+    end_ms[i])``. Rows are grouped by tier, in document order, alignable
+    annotations before reference annotations, which have no time (0, 0).
+    Repeated ids and values share one string object while the file is parsed,
+    which pickling preserves when the result leaves a parse worker.
+    """
+
+    time_slots: dict[str, int] = field(default_factory=dict)
+    tiers: list[ParsedTier] = field(default_factory=list)
+    annotation_ids: list[str] = field(default_factory=list)
+    values: list[str] = field(default_factory=list)
+    start_ms: array = field(default_factory=lambda: array("q"))
+    end_ms: array = field(default_factory=lambda: array("q"))
+    # Per-document pool, unlike sys.intern which keeps strings alive for good
+    _strings: dict[str, str] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @property
+    def annotation_count(self) -> int:
+        """Total number of annotations over all tiers."""
+        return len(self.values)
+
+    def add_annotation(
+        self, annotation_id: str, value: str, start_ms: int, end_ms: int
+    ) -> None:
+        """Append an annotation to the tier currently being parsed."""
+        strings = self._strings
+        self.annotation_ids.append(strings.setdefault(annotation_id, annotation_id))
+        self.values.append(strings.setdefault(value, value))
+        self.start_ms.append(start_ms)
+        self.end_ms.append(end_ms)
+
+    def close_tier(
+        self, tier_id: str, parent_tier_id: str | None, linguistic_type: str | None
+    ) -> None:
+        """Close the current tier, keeping it only if it has annotations."""
+        start = self.tiers[-1].stop if self.tiers else 0
+        if self.annotation_count > start:
+            self.tiers.append(
+                ParsedTier(
+                    tier_id,
+                    parent_tier_id,
+                    linguistic_type,
+                    start,
+                    self.annotation_count,
+                )
+            )
+
+    def finish(self) -> "ParsedEaf":
+        """Drop the parse-time string pool and return self."""
+        self._strings = {}
+        return self
+
+    def annotations(self, tier: ParsedTier) -> Iterator[tuple[str, str, int, int]]:
+        """Yield (annotation_id, value, start_ms, end_ms) for a tier."""
+        return zip(
+            self.annotation_ids[tier.start : tier.stop],
+            self.values[tier.start : tier.stop],
+            self.start_ms[tier.start : tier.stop],
+            self.end_ms[tier.start : tier.stop],
+            strict=True,
+        )
+
+    def max_duration_ms(self, tier: ParsedTier) -> int:
+        """Return the length of the longest annotation of a tier."""
+        return max(
+            map(
+                operator.sub,
+                self.end_ms[tier.start : tier.stop],
+                self.start_ms[tier.start : tier.stop],
+            ),
+            default=0,
+        )
@@ -0,0 +1,111 @@
+"""Helpers turning user search input into index-friendly conditions."""
+
+import re
+
+# Characters with a meaning in regular expressions, outside of escapes
+_REGEX_SPECIAL = set(".^$*+?{}[]()|\\")
+# Quantifiers that make the preceding character optional
+_OPTIONAL_QUANTIFIERS = set("?*{")
+# Escapes that stand for one literal character
+_LITERAL_ESCAPES = set(".^$*+?{}[]()|\\/-")
+
+
+class SearchQueryUtils:
+    """Derive full-text prefilters and LIKE patterns from search text."""
+
+    @staticmethod
+    def escape_like(text: str) -> str:
+        """Escape LIKE wildcards so text only matches itself."""
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def required_literals(pattern: str) -> list[str]:
+        """Return literal substrings every match of a regular expression contains.
+
+        Conservative: alternation at the top level yields nothing, groups and
+        character classes end a literal without contributing to it, and a
+        character followed by ``?``, ``*`` or ``{`` is left out.
+
+        Raises:
+            ValueError: If the pattern is not a valid regular expression.
+
+        """
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression: {e}") from e
+
+        literals: list[str] = []
+        current: list[str] = []
+
+        def flush() -> None:
+            if current:
+                literals.append("".join(current))
+                current.clear()
+
+        i = 0
+        depth = 0
+        while i < len(pattern):
+            char = pattern[i]
+            if char == "\\" and i + 1 < len(pattern):
+                escaped = pattern[i + 1]
+                if escaped in _LITERAL_ESCAPES and not depth:
+                    current.append(escaped)
+                elif not depth:
+                    flush()
+                i += 2
+            elif char == "(":
+                depth += 1
+                flush()
+                i += 1
+            elif char == ")":
+                depth -= 1
+                i += 1
+            elif depth:
+                i += 1
+            elif char == "|":
+                return []
+            elif char == "[":
+                flush()
+                # Skip the class, a leading "]" or "^]" is part of it
+                i = pattern.find("]", i + 2 if pattern[i + 1 : i + 2] != "^" else i + 3)
+                i = len(pattern) if i < 0 else i + 1
+            elif char in _OPTIONAL_QUANTIFIERS:
+                if current:
+                    current.pop()
+                flush()
+                if char == "{":
+                    # Skip the repetition bounds
+                    i = pattern.find("}", i)
+                    i = len(pattern) if i < 0 else i
+                i += 1
+            elif char in _REGEX_SPECIAL:
+                flush()
+                i += 1
+            else:
+                current.append(char)
+                i += 1
+        flush()
+        return literals
+
+    @staticmethod
+    def fulltext_terms(literals: list[str], min_chars: int) -> str | None:
+        """Build a boolean-mode query requiring every usable piece of the literals.
+
+        Pieces are the whitespace-separated parts of at least min_chars
+        characters, the ngram parser indexes nothing shorter. Double quotes
+        cannot be escaped inside a phrase, so pieces are split on them too.
+
+        Returns:
+            The AGAINST string, or None if no piece is long enough.
+
+        """
+        pieces = [
+            piece
+            for literal in literals
+            for piece in re.split(r'[\s"]+', literal)
+            if len(piece) >= min_chars
+        ]
+        if not pieces:
+            return None
+        return " ".join(f'+"{piece}"' for piece in pieces)
@@ -0,0 +1,24 @@
+from app.crud.annotation_value import ValueIdCache
+
+
+def test_value_id_cache_evicts_least_recently_used():
+    """Lookups refresh recency, inserts beyond the bound evict the oldest value."""
+    cache = ValueIdCache(max_entries=2)
+    cache.put_many({"uh": 1, "NP": 2})
+
+    assert cache.get_many(["uh", "PAUSE"]) == ({"uh": 1}, ["PAUSE"])
+
+    cache.put_many({"PAUSE": 3})
+    assert cache.get_many(["uh", "NP", "PAUSE"]) == ({"uh": 1, "PAUSE": 3}, ["NP"])
+
+    cache.clear()
+    assert cache.get_many(["uh"]) == ({}, ["uh"])
+
+
+def test_value_id_cache_discards_swept_values():
+    """Discarded values become misses, unknown ones are ignored."""
+    cache = ValueIdCache(max_entries=3)
+    cache.put_many({"uh": 1, "NP": 2})
+
+    cache.discard(["uh", "PAUSE"])
+    assert cache.get_many(["uh", "NP"]) == ({"NP": 2}, ["uh"])
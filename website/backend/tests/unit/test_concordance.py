@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+from app.service.concordance import ConcordanceService, TierTimeline
+
+
+def test_timeline_neighbours_and_time_alignment():
+    """Neighbours are clipped at the tier edges; alignment uses half-open overlap."""
+    words = TierTimeline.from_columns(
+        ["w0", "w1", "w2", "w3"],
+        ["word0", "word1", "word2", "word3"],
+        [0, 400, 900, 5000],
+        [400, 900, 5000, 5200],
+    )
+
+    left, right = words.neighbours(1, 2)
+    assert [words.values[i] for i in left] == ["word0"]
+    assert [words.values[i] for i in right] == ["word2", "word3"]
+
+    assert list(words.overlapping(400, 900)) == [1]
+    assert list(words.overlapping(850, 1000)) == [1, 2]
+    assert list(words.overlapping(4000, 4000)) == [2]
+    assert list(words.overlapping(5200, 6000)) == []
+
+    children = {(1, "words"): ["gloss", "pos"], (1, "gloss"): ["morph", "words"]}
+    assert ConcordanceService._descendants((1, "words"), children) == [
+        "gloss",
+        "pos",
+        "morph",
+    ]
+
+
+def test_line_skips_hits_missing_from_timelines():
+    """Hits removed by a re-ingest after the search give no line."""
+    words = TierTimeline.from_columns(["w0"], ["word0"], [0], [400])
+    timelines = {(1, "words"): words}
+
+    def hit(tier_id, annotation_id):
+        return SimpleNamespace(
+            elan_id=1, filename="a.eaf", tier_id=tier_id, annotation_id=annotation_id
+        )
+
+    assert ConcordanceService._line(hit("words", "w0"), timelines, [], 1) is not None
+    assert ConcordanceService._line(hit("words", "w9"), timelines, [], 1) is None
+    assert ConcordanceService._line(hit("gloss", "w0"), timelines, [], 1) is None
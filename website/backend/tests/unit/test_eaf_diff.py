@@ -0,0 +1,49 @@
+from app.service.eaf_diff import diff_eaf_bytes
+
+
+def test_semantic_diff_matches_by_id_then_by_overlap(sample_eaf):
+    """Renumbered annotations pair by time overlap, unmatched ones are added/removed."""
+    changed = (
+        sample_eaf.replace('TIME_VALUE="1250"', 'TIME_VALUE="1300"')
+        .replace('ANNOTATION_ID="a2"', 'ANNOTATION_ID="a7"')
+        .replace("> world <", ">World<")
+        .replace(">INTJ<", ">INTERJ<")
+        .replace(
+            '<TIER LINGUISTIC_TYPE_REF="default-lt" TIER_ID="Empty"/>',
+            '<TIER LINGUISTIC_TYPE_REF="default-lt" TIER_ID="Empty"><ANNOTATION>'
+            '<ALIGNABLE_ANNOTATION ANNOTATION_ID="a8" TIME_SLOT_REF1="ts1" '
+            'TIME_SLOT_REF2="ts3"><ANNOTATION_VALUE>new</ANNOTATION_VALUE>'
+            "</ALIGNABLE_ANNOTATION></ANNOTATION></TIER>",
+        )
+    )
+
+    diff = diff_eaf_bytes(sample_eaf.encode(), changed.encode())
+    tiers = {tier["tier_id"]: tier for tier in diff["tiers"]}
+
+    speaker = tiers["Speaker1"]
+    assert [
+        (r["old_annotation_id"], r["annotation_id"]) for r in speaker["retimed"]
+    ] == [
+        ("a1", "a1"),
+        ("a2", "a7"),
+    ]
+    assert speaker["relabelled"][0]["old_value"] == "world"
+    assert speaker["relabelled"][0]["value"] == "World"
+    assert not speaker["added"] and not speaker["removed"]
+
+    assert tiers["Gloss1"]["relabelled"][0]["value"] == "INTERJ"
+    assert tiers["Empty"]["added"][0]["annotation_id"] == "a8"
+    assert (diff["total_added"], diff["total_removed"]) == (1, 0)
+    assert diff_eaf_bytes(sample_eaf.encode(), sample_eaf.encode())["tiers"] == []
+
+
+def test_semantic_diff_caps_changes_per_tier(sample_eaf):
+    """Lists beyond the per-tier cap are cut, totals still count every change."""
+    changed = sample_eaf.replace(">hello<", ">Hello<").replace("> world <", ">World<")
+
+    diff = diff_eaf_bytes(sample_eaf.encode(), changed.encode(), max_changes_per_tier=1)
+
+    speaker = diff["tiers"][0]
+    assert [r["value"] for r in speaker["relabelled"]] == ["Hello"]
+    assert speaker["truncated"] and diff["truncated"]
+    assert (diff["total_relabelled"], diff["total_retimed"]) == (2, 0)
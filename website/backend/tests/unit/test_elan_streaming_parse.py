@@ -0,0 +1,61 @@
+import pickle
+
+import pytest
+
+from app.service.elan import ElanService
+from app.utils.file_processing import StreamingElanValidator
+
+
+def test_streaming_parse_matches_tree_parse(tmp_path, sample_eaf):
+    """The iterparse mode must produce the same file_info as the tree parser."""
+    eaf_path = tmp_path / "sample.eaf"
+    eaf_path.write_text(sample_eaf, encoding="utf-8")
+
+    service = ElanService(db=None)
+    tree_info = service.parse_elan_file(str(eaf_path), streaming=False)
+    streaming_info = service.parse_elan_file(str(eaf_path), streaming=True)
+
+    assert streaming_info == tree_info
+    eaf = streaming_info["eaf"]
+    assert [t.tier_id for t in eaf.tiers] == ["Speaker1", "Gloss1"]
+    assert eaf.time_slots["ts4"] == 0
+    assert list(eaf.annotations(eaf.tiers[0])) == [
+        ("a1", "hello", 0, 1250),
+        ("a2", "world", 1250, 2500),
+    ]
+    assert list(eaf.annotations(eaf.tiers[1])) == [("a4", "INTJ", 0, 0)]
+    assert [eaf.max_duration_ms(t) for t in eaf.tiers] == [1250, 0]
+    # Results cross the process pool boundary
+    assert pickle.loads(pickle.dumps(eaf)) == eaf  # noqa: S301 - round-trip of local data
+
+
+def test_streaming_validator_accepts_chunked_eaf_and_rejects_other_xml(sample_eaf):
+    """Validation works on arbitrary chunk boundaries and checks the structure."""
+    validator = StreamingElanValidator()
+    data = sample_eaf.encode()
+    for i in range(0, len(data), 7):
+        validator.feed(data[i : i + 7])
+    validator.close()
+
+    validator = StreamingElanValidator()
+    validator.feed(b"<ANNOTATION_DOCUMENT><HEADER/></ANNOTATION_DOCUMENT>")
+    with pytest.raises(ValueError, match="TIME_ORDER"):
+        validator.close()
+
+    with pytest.raises(ValueError, match="root element"):
+        StreamingElanValidator().feed(b"<html><body/></html>")
+
+
+def test_collecting_validator_matches_ingest_parse(tmp_path, sample_eaf):
+    """Upload validation can hand ingest the same tiers as a parse from disk."""
+    eaf_path = tmp_path / "sample.eaf"
+    eaf_path.write_text(sample_eaf, encoding="utf-8")
+    file_info = ElanService(db=None).parse_elan_file(str(eaf_path))
+
+    validator = StreamingElanValidator(collect=True)
+    data = sample_eaf.encode()
+    for i in range(0, len(data), 7):
+        validator.feed(data[i : i + 7])
+    validator.close()
+
+    assert validator.parsed() == file_info["eaf"]
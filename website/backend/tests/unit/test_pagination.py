@@ -0,0 +1,15 @@
+import pytest
+
+from app.utils.pagination import CursorUtils
+
+
+def test_cursor_round_trips_and_rejects_tampering():
+    """Cursors are opaque strings decoding back to the same sort key."""
+    cursor = CursorUtils.encode("12.500", "a17")
+    assert "=" not in cursor
+    assert CursorUtils.decode(cursor, 2) == ["12.500", "a17"]
+
+    with pytest.raises(ValueError):
+        CursorUtils.decode(cursor, 1)
+    with pytest.raises(ValueError):
+        CursorUtils.decode("not a cursor!", 2)
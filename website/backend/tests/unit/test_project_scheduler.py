@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+from app.service.project_scheduler import ProjectOperationScheduler
+
+OPERATIONS_PER_PROJECT = 3
+
+
+@pytest.mark.asyncio
+async def test_same_project_is_serialized_and_other_projects_run_in_parallel():
+    """Operations on one project never overlap; different projects do."""
+    scheduler = ProjectOperationScheduler()
+    running: dict[str, int] = {"alpha": 0, "beta": 0}
+    peak: dict[str, int] = {"alpha": 0, "beta": 0}
+    overlap_between_projects = False
+
+    async def operation(project_name: str) -> None:
+        nonlocal overlap_between_projects
+        async with scheduler.acquire(project_name, "test"):
+            running[project_name] += 1
+            assert not scheduler.is_idle()
+            peak[project_name] = max(peak[project_name], running[project_name])
+            await asyncio.sleep(0.01)
+            if running["alpha"] and running["beta"]:
+                overlap_between_projects = True
+            running[project_name] -= 1
+
+    await asyncio.gather(
+        *(operation(name) for name in ["alpha", "beta"] * OPERATIONS_PER_PROJECT)
+    )
+
+    assert peak == {"alpha": 1, "beta": 1}
+    assert scheduler.is_idle()
+    assert overlap_between_projects
+    metrics = scheduler.get_metrics()
+    assert metrics["alpha"]["completed"] == OPERATIONS_PER_PROJECT
+    assert metrics["alpha"]["waiting"] == 0
+    assert metrics["alpha"]["max_wait_seconds"] > 0
+
+    scheduler.forget("alpha")
+    await operation("alpha")
+    assert "alpha" not in scheduler.get_metrics()
@@ -0,0 +1,19 @@
+import pytest
+
+from app.utils.search import SearchQueryUtils
+
+
+def test_required_literals_only_keeps_text_every_match_contains():
+    """Optional characters, groups and classes never end up in the prefilter."""
+    assert SearchQueryUtils.required_literals(r"^hel+o wor?ld$") == [
+        "hel",
+        "o wo",
+        "ld",
+    ]
+    assert SearchQueryUtils.required_literals(r"foo(bar)?baz\.") == ["foo", "baz."]
+    assert SearchQueryUtils.required_literals(r"a{2}b[cd]ef") == ["b", "ef"]
+    assert SearchQueryUtils.required_literals(r"cat|dog") == []
+    assert SearchQueryUtils.fulltext_terms(["o wo", "x"], 2) == '+"wo"'
+
+    with pytest.raises(ValueError):
+        SearchQueryUtils.required_literals("(unclosed")